@@ -5,50 +5,451 @@ import sys
 import re
 import json
 import logging
-import numpy as np
-from typing import Dict, List, Optional
-from bs4 import BeautifulSoup  # Move this import to the top level
-import re
-import json
-import logging
+import time
+import threading
 import numpy as np
 import spacy
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Tuple
+from spacy.tokens import Doc
 from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from typing import Dict, List, Optional
+from tech_matcher import TechMatcher
+from tech_registry import DEFAULT_TECH_PATTERNS_FILE, DEFAULT_TECH_SIGNALS_FILE, load_matcher, load_signal_detector
+from common_themes import KeywordThemeClassifier
+from theme_model import HashedThemeModel
+from analysis_cache import AnalysisCache, analysis_fingerprint, content_hash, model_version
+from keyword_model import CorpusKeywordModel
+from language_id import DEFAULT_LANGUAGES_FILE, LanguageIdentifier
+from near_duplicates import MirrorIndex
+from text_extraction import extract_metadata, get_text_extractor, truncate_text
+from vector_store import DocumentVectorStore, load_array, save_array, theme_matrix_path
 
 # Ensure the necessary models are downloaded
 # python -m spacy download en_core_web_md
 
+# Bump whenever a change to the analysis logic changes its results,
+# so cached analyses produced by older logic are not reused
+ANALYZER_VERSION = '9'
+
+DEFAULT_THEMES_FILE = 'common_themes.json'
+DEFAULT_SPACY_MODEL = 'en_core_web_sm'
+
+# Language of DEFAULT_SPACY_MODEL; pages whose language cannot be told are
+# treated as this language
+DEFAULT_LANGUAGE = 'en'
+
+# Entity labels kept as keywords: OntoNotes (English models) and the
+# person/organization/place labels of other languages' models
+KEYWORD_ENTITY_LABELS = frozenset(['ORG', 'PRODUCT', 'GPE', 'PERSON',
+                                   'PER', 'orgName', 'persName', 'placeName'])
+
+# Characters of page text sent to SpaCy at most
+DEFAULT_MAX_TEXT_CHARS = 20000
+
+# Per-page budgets, recorded in "budgets_exceeded" when they trip:
+#   html_bytes - page too large to parse: analyzed from its metadata only
+#   text_chars - extracted text cut to max_text_chars
+#   wall_time  - SpaCy stopped at the deadline: the text parsed so far is used
+BUDGETS = ('html_bytes', 'text_chars', 'wall_time')
+
+# With a wall-time budget, long texts are parsed in chunks of this many
+# characters and the deadline is checked between chunks, so a page
+# overruns its budget by at most one chunk
+BUDGET_CHUNK_CHARS = 2000
+
+# Analysis profiles:
+#   fast     - page metadata and technology matching only, SpaCy is never loaded
+#   standard - SpaCy without the pipeline components analysis does not use
+#   deep     - the full SpaCy pipeline
+PROFILES = ('fast', 'standard', 'deep')
+DEFAULT_PROFILE = 'deep'
+
+# Components the standard profile leaves out: the parser, and the lemmatizer
+# together with the tagger and attribute ruler that only feed it
+STANDARD_PROFILE_EXCLUDE = ['parser', 'lemmatizer', 'tagger', 'attribute_ruler']
+
+# Technology detectors:
+#   signals   - scoped patterns on script/link attributes, meta tags, inline
+#               scripts, response headers and cookies; body text is ignored
+#   substring - flat patterns anywhere in the page
+TECH_DETECTORS = ('signals', 'substring')
+DEFAULT_TECH_DETECTOR = 'signals'
+
+# Metadata fields the fast profile analyzes
+METADATA_TEXT_FIELDS = ('title', 'description', 'keywords', 'og:title', 'og:description', 'og:site_name')
+
+# Shared analyzers, keyed by model name and the files they load
+_analyzers: Dict[tuple, 'AdvancedContentAnalyzer'] = {}
+_analyzers_lock = threading.Lock()
+
+# Analyzer options naming files for state/artifacts; they do not change results
+_STATE_OPTIONS = frozenset(['keyword_model_file', 'artifact_dir', 'vector_store_dir'])
+
+
+class StageTimer:
+    """
+    Thread-safe accumulator of wall time spent in named analysis stages.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._totals: Dict[str, float] = {}
+        self._counts: Dict[str, int] = {}
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the body of a with-block under the given stage name."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, elapsed: float, calls: int = 1) -> None:
+        """Record time measured elsewhere, e.g. for a whole batch of calls."""
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0.0) + elapsed
+            self._counts[name] = self._counts.get(name, 0) + calls
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Summarize recorded stages.
+
+        Returns:
+            Dict of stage name to calls, total seconds and mean milliseconds
+        """
+        with self._lock:
+            return {
+                name: {
+                    "calls": self._counts[name],
+                    "total_s": round(total, 4),
+                    "mean_ms": round(total / self._counts[name] * 1000, 3)
+                }
+                for name, total in self._totals.items()
+            }
+
+    def reset(self) -> None:
+        """Forget all recorded timings."""
+        with self._lock:
+            self._totals.clear()
+            self._counts.clear()
+
+
 class AdvancedContentAnalyzer:
     def __init__(self,
-                 tech_patterns_file='tech_patterns.json',
-                 themes_file='common_themes.json',
-                 spacy_model='en_core_web_sm'):  # Change default to sm instead of md
+                 tech_patterns_file=DEFAULT_TECH_PATTERNS_FILE,
+                 themes_file=DEFAULT_THEMES_FILE,
+                 spacy_model=DEFAULT_SPACY_MODEL,  # Change default to sm instead of md
+                 keyword_model_file=None,
+                 text_extractor='auto',
+                 strip_boilerplate=True,
+                 max_text_chars=DEFAULT_MAX_TEXT_CHARS,
+                 profile=DEFAULT_PROFILE,
+                 artifact_dir=None,
+                 vector_store_dir=None,
+                 theme_model_file=None,
+                 tech_detector=DEFAULT_TECH_DETECTOR,
+                 tech_signals_file=DEFAULT_TECH_SIGNALS_FILE,
+                 max_html_bytes=None,
+                 max_analysis_seconds=None,
+                 languages_file=DEFAULT_LANGUAGES_FILE,
+                 language_models=None):
         """
         Advanced content analyzer using NLP techniques.
+
+        Args:
+            tech_patterns_file (str): Path to technology patterns JSON
+            themes_file (str): Path to themes JSON
+            spacy_model (str): SpaCy model for DEFAULT_LANGUAGE pages
+            keyword_model_file (str, optional): Corpus keyword model (.npz);
+                without it keywords are scored per page
+            text_extractor (str): HTML-to-text engine, see text_extraction.py
+            strip_boilerplate (bool): Drop navigation, banners, footers and
+                link lists and keep the main content before analysis
+            max_text_chars (int, optional): Character budget for the text
+                sent to SpaCy; None disables the cap
+            profile (str): Analysis profile, one of PROFILES
+            artifact_dir (str, optional): Directory for compiled artifacts
+                (memory-mapped theme matrix, pickled technology matcher);
+                without it both are rebuilt by every analyzer
+            vector_store_dir (str, optional): Directory of the per-site
+                document vector store used for re-theming without parsing
+            theme_model_file (str, optional): Trained HashedThemeModel (.npz);
+                when it exists, themes are predicted by it instead of
+                vector similarity
+            tech_detector (str): Technology detector, one of TECH_DETECTORS
+            tech_signals_file (str): Header/cookie patterns for the signals detector
+            max_html_bytes (int, optional): Larger pages are analyzed from
+                their metadata only
+            max_analysis_seconds (float, optional): Wall-time budget per
+                page; SpaCy stops parsing when it runs out
+            languages_file (str, optional): Language profiles and stop words
+                for language identification; None treats every page as
+                DEFAULT_LANGUAGE
+            language_models (dict, optional): Language code to SpaCy model
+                for pages in other languages. Models are only used when
+                installed; pages without one skip NER and get keywords with
+                their language's stop words
+        """
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown analysis profile: {profile}. Expected one of {PROFILES}")
+        if tech_detector not in TECH_DETECTORS:
+            raise ValueError(f"Unknown technology detector: {tech_detector}. Expected one of {TECH_DETECTORS}")
+
+        self.spacy_model = spacy_model
+        self.profile = profile
+        self.themes_file = themes_file
+        self.artifact_dir = artifact_dir
+        self.max_text_chars = max_text_chars
+        self.max_html_bytes = max_html_bytes
+        self.max_analysis_seconds = max_analysis_seconds
+        self.default_language = DEFAULT_LANGUAGE
+        self.language_models = dict(language_models or {})
+
+        # SpaCy pipelines are not guaranteed to be thread-safe, so calls into
+        # self.nlp are serialized when the analyzer is shared between threads
+        self._nlp_lock = threading.RLock()
+
+        # Per-stage wall time of everything this analyzer does, and the
+        # time spent on the pages of every language
+        self.timings = StageTimer()
+        self.language_timings = StageTimer()
+
+        # Characters per second analyze_many() gets through, per language;
+        # texts that would take longer than the wall-time budget are
+        # parsed chunk by chunk instead of streamed
+        self._stream_rates: Dict[str, float] = {}
+
+        # SpaCy and the theme embeddings are loaded on first use, so cached
+        # and pattern-only work never pays for them
+        self._nlp = None
+        self._pipelines: Dict[str, object] = {}
+        self._theme_names = None
+        self._theme_matrix = None
+        self._theme_embeddings = None
+
+        # Event-based HTML-to-text engine that skips non-visible content;
+        # the text is capped here, so the analyzer knows when the cap trips
+        self.text_extractor = get_text_extractor(text_extractor, strip_boilerplate=strip_boilerplate)
+
+        # Character n-gram language identifier routing pages to pipelines
+        self.language_identifier = LanguageIdentifier.load(languages_file) if languages_file else None
+
+        # Load theme patterns
+        self.themes = self._load_json(themes_file)
+
+        # Keyword-frequency theme engine for when word vectors are not available
+        self.term_classifier = KeywordThemeClassifier(self.themes)
+
+        # Trained theme classifier, preferred over both when configured
+        self.theme_model = HashedThemeModel.load(theme_model_file) if theme_model_file else None
+
+        # Technology patterns compiled into single-pass matchers, loaded
+        # from the registry's artifact when it is up to date
+        if tech_detector == 'signals':
+            self.tech_matcher = load_signal_detector(tech_patterns_file, tech_signals_file, cache_dir=artifact_dir)
+        else:
+            self.tech_matcher = load_matcher(tech_patterns_file, cache_dir=artifact_dir)
+        self.tech_patterns = self.tech_matcher.tech_patterns
+
+        # Corpus-level keyword statistics, learned from every analyzed page
+        self.keyword_model_file = keyword_model_file
+        self.keyword_model = CorpusKeywordModel.load(keyword_model_file) if keyword_model_file else None
+
+        # Document vector of every analyzed site, keyed by domain
+        self.vector_store = DocumentVectorStore(vector_store_dir, spacy_model) if vector_store_dir else None
+
+    @staticmethod
+    def _load_spacy(spacy_model: str, exclude: Iterable[str] = ()):
+        """
+        Load a SpaCy model, downloading it if needed.
+
+        Args:
+            spacy_model (str): SpaCy model name
+            exclude (iterable): Pipeline components not to load
+
+        Returns:
+            spacy.language.Language: Loaded pipeline, or a blank English one
         """
-        # Load SpaCy model
+        exclude = list(exclude)
         try:
-            self.nlp = spacy.load(spacy_model)
+            return spacy.load(spacy_model, exclude=exclude)
         except OSError:
             logging.warning(f"SpaCy model {spacy_model} not found. Downloading it...")
             try:
                 # Try to download the model
                 import subprocess
                 subprocess.call([sys.executable, "-m", "spacy", "download", spacy_model])
-                self.nlp = spacy.load(spacy_model)
+                return spacy.load(spacy_model, exclude=exclude)
             except Exception as e:
                 logging.error(f"Failed to download model: {e}")
                 # Create a simple fallback model
-                self.nlp = spacy.blank("en")
+                return spacy.blank("en")
 
-        # Load technology and theme patterns
-        self.tech_patterns = self._load_json(tech_patterns_file)
-        self.themes = self._load_json(themes_file)
+    @property
+    def nlp(self):
+        """SpaCy pipeline, loaded on first access."""
+        if self._nlp is None:
+            with self._nlp_lock:
+                if self._nlp is None:
+                    if self.profile == 'fast':
+                        logging.warning("SpaCy requested by an analyzer with the fast profile")
+                    exclude = STANDARD_PROFILE_EXCLUDE if self.profile == 'standard' else ()
+                    self._nlp = self._load_spacy(self.spacy_model, exclude)
+        return self._nlp
+
+    def pipeline(self, language: str):
+        """
+        SpaCy pipeline for pages in a language, loaded on first use.
+
+        Args:
+            language (str): Language code
+
+        Returns:
+            spacy.language.Language or None: The main pipeline for
+            DEFAULT_LANGUAGE; for other languages their configured model,
+            or None if there is none or it is not installed
+        """
+        if language == self.default_language:
+            return self.nlp
+        if language not in self._pipelines:
+            with self._nlp_lock:
+                if language not in self._pipelines:
+                    self._pipelines[language] = self._load_language_model(language)
+        return self._pipelines[language]
+
+    def _load_language_model(self, language: str):
+        """Load the configured model of a language without downloading it; None if unavailable."""
+        spacy_model = self.language_models.get(language)
+        if not spacy_model:
+            return None
+        exclude = STANDARD_PROFILE_EXCLUDE if self.profile == 'standard' else []
+        try:
+            return spacy.load(spacy_model, exclude=exclude)
+        except OSError:
+            logging.warning(f"SpaCy model {spacy_model} for {language!r} pages is not installed; "
+                            f"they are analyzed without NER")
+            return None
+
+    def detect_language(self, text: str) -> str:
+        """
+        Language of a text.
+
+        Args:
+            text (str): Normalized text
+
+        Returns:
+            str: Language code; DEFAULT_LANGUAGE if it cannot be told
+        """
+        if self.language_identifier is None:
+            return self.default_language
+        with self.timings.stage('language'):
+            return self.language_identifier.detect(text) or self.default_language
+
+    def _stop_words(self, language: str):
+        """Stop words for keyword extraction from pages in a language."""
+        if language == 'en':
+            return 'english'
+        if self.language_identifier is None:
+            return []
+        return self.language_identifier.stop_words.get(language, [])
+
+    def _ensure_themes(self) -> None:
+        """
+        Load or build the normalized theme matrix on first use.
+
+        With a theme cache directory the matrix is memory-mapped from a .npy
+        artifact keyed by the themes file and SpaCy model, and only built
+        (and stored) when no matching artifact exists.
+        """
+        if self._theme_matrix is not None:
+            return
+        with self._nlp_lock:
+            if self._theme_matrix is not None:
+                return
 
-        # Predefined theme embeddings
-        self.theme_embeddings = self._create_theme_embeddings()
+            artifact = None
+            if self.artifact_dir:
+                artifact = theme_matrix_path(self.artifact_dir, self.themes_file, self.spacy_model)
+                matrix = load_array(artifact)
+                if matrix is not None and matrix.shape[0] == len(self.themes):
+                    self._theme_names, self._theme_matrix = list(self.themes), matrix
+                    return
+
+            # Predefined theme embeddings
+            self._theme_embeddings = self._create_theme_embeddings()
+
+            # Row-normalized theme matrix, so scoring is a single matrix product
+            self._theme_names, self._theme_matrix = self._build_theme_matrix(self._theme_embeddings)
+
+            # A pipeline without vectors (blank fallback model) is not worth storing
+            if artifact and self._theme_matrix.size:
+                try:
+                    save_array(artifact, self._theme_matrix)
+                    logging.info(f"Stored theme matrix in {artifact}")
+                except OSError as e:
+                    logging.error(f"Error storing theme matrix {artifact}: {e}")
+
+    @property
+    def theme_embeddings(self) -> Dict[str, np.ndarray]:
+        """Theme names to their embeddings (normalized if loaded from the artifact)."""
+        self._ensure_themes()
+        if self._theme_embeddings is None:
+            self._theme_embeddings = dict(zip(self._theme_names, self._theme_matrix))
+        return self._theme_embeddings
+
+    @property
+    def theme_names(self) -> List[str]:
+        """Theme names, in theme_matrix row order."""
+        self._ensure_themes()
+        return self._theme_names
+
+    @property
+    def theme_matrix(self) -> np.ndarray:
+        """Row-normalized (themes x dimensions) theme embedding matrix."""
+        self._ensure_themes()
+        return self._theme_matrix
+
+    @property
+    def uses_vectors(self) -> bool:
+        """
+        Whether themes are scored by vector similarity. False with a trained
+        theme model, and for the fast profile and pipelines without vectors
+        (the blank fallback model), where the keyword-frequency classifier
+        is used instead.
+        """
+        if self.profile == 'fast' or self.theme_model is not None:
+            return False
+        matrix = self.theme_matrix
+        return bool(matrix.size) and bool(np.any(matrix))
+
+    def save_keyword_model(self) -> None:
+        """Persist the corpus keyword model, if one is configured."""
+        if self.keyword_model is not None and self.keyword_model_file:
+            self.keyword_model.save(self.keyword_model_file)
+
+    def save_state(self) -> None:
+        """Persist learned state: the keyword model and the document vectors."""
+        self.save_keyword_model()
+        if self.vector_store is not None:
+            self.vector_store.save()
+
+    def has_vector(self, domain: Optional[str], html_content: str) -> bool:
+        """
+        Whether the vector store is up to date for a page: it holds the
+        page's vector, or records that the page has none.
+
+        True when there is nothing to store (no store, no domain, or the
+        fast profile), so callers may answer from the analysis cache.
+        """
+        if self.vector_store is None or not domain or self.profile == 'fast':
+            return True
+        return self.vector_store.content_hash(domain) == content_hash(html_content)
+
+    def _store_vector(self, domain: Optional[str], html_content: str, vector: Optional[np.ndarray]) -> None:
+        """Record the document vector of a site in the vector store; None if its page has none."""
+        if self.vector_store is not None and domain:
+            self.vector_store.put(domain, content_hash(html_content), vector)
 
     def _load_json(self, filename: str) -> Dict:
         """
@@ -78,53 +479,197 @@ class AdvancedContentAnalyzer:
         for theme, keywords in self.themes.items():
             # Combine theme keywords into a single text
             theme_text = ' '.join(keywords)
-            theme_embeddings[theme] = self.nlp(theme_text).vector
+            theme_embeddings[theme] = self._parse(theme_text).vector
         return theme_embeddings
 
-    def extract_keywords(self, text: str, top_k: int = 10) -> List[str]:
+    @staticmethod
+    def _build_theme_matrix(theme_embeddings: Dict[str, np.ndarray]) -> Tuple[List[str], np.ndarray]:
+        """
+        Stack theme embeddings into one L2-normalized float32 matrix.
+
+        Args:
+            theme_embeddings (dict): Theme names to their embeddings
+
+        Returns:
+            Tuple of theme names and a (themes x dimensions) matrix
+        """
+        theme_names = list(theme_embeddings)
+        if not theme_names:
+            return theme_names, np.zeros((0, 0), dtype=np.float32)
+
+        matrix = np.vstack([theme_embeddings[name] for name in theme_names]).astype(np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return theme_names, matrix / norms
+
+    def _parse(self, text: str, nlp=None):
+        """
+        Run a SpaCy pipeline on text while holding the analyzer lock.
+
+        Args:
+            text (str): Input text
+            nlp (spacy.language.Language, optional): Pipeline; the main one if not given
+
+        Returns:
+            spacy.tokens.Doc: Parsed document
+        """
+        with self._nlp_lock:
+            return (self.nlp if nlp is None else nlp)(text)
+
+    def _extract_text(self, html_content: str) -> str:
+        """
+        Extract visible text from HTML.
+
+        Args:
+            html_content (str): Website HTML content
+
+        Returns:
+            str: Text content of the page, at most max_text_chars long
+        """
+        return self._extract_text_within_budget(html_content)[0]
+
+    def _extract_text_within_budget(self, html_content: str) -> Tuple[str, bool]:
+        """Extract text and cap it at max_text_chars; True if the cap tripped."""
+        text = self.text_extractor.extract(html_content)
+        if self.max_text_chars and len(text) > self.max_text_chars:
+            return truncate_text(text, self.max_text_chars), True
+        return text, False
+
+    def extract_page_text(self, html_content: str) -> Optional[Tuple[str, bool]]:
+        """
+        Text an analysis of the page parses, for callers that need it first.
+
+        Args:
+            html_content (str): Website HTML content
+
+        Returns:
+            Tuple of the text and whether max_text_chars cut it, to hand
+            back to analyze(); None for pages analyzed from their metadata
+        """
+        if self.profile == 'fast' or self._exceeds_html_budget(html_content):
+            return None
+        with self.timings.stage('extract'):
+            return self._extract_text_within_budget(html_content)
+
+    def theme_text(self, html_content: str) -> str:
+        """
+        Text the theme of a page is ranked from when vectors are not used
+        (trained theme model, keyword frequency), for training on the
+        same input as prediction.
+
+        Args:
+            html_content (str): Website HTML content
+
+        Returns:
+            str: Normalized page text, or metadata text for pages analyzed
+            from their metadata
+        """
+        extracted = self.extract_page_text(html_content)
+        if extracted is None:
+            return self._metadata_text(html_content)
+        return self._normalize_text(extracted[0])
+
+    def _exceeds_html_budget(self, html_content: str) -> bool:
+        """Whether a page is larger than max_html_bytes."""
+        if not self.max_html_bytes or len(html_content) * 4 <= self.max_html_bytes:
+            return False
+        return len(html_content.encode('utf-8', errors='ignore')) > self.max_html_bytes
+
+    def _parse_within(self, text: str, deadline: Optional[float], nlp=None) -> Tuple[object, bool]:
+        """
+        Parse normalized text, stopping at a deadline.
+
+        Texts longer than BUDGET_CHUNK_CHARS are parsed chunk by chunk and
+        the chunks parsed before the deadline are merged into one Doc.
+
+        Args:
+            text (str): Normalized text
+            deadline (float, optional): time.perf_counter() value to stop at
+            nlp (spacy.language.Language, optional): Pipeline; the main one if not given
+
+        Returns:
+            Tuple of the parsed Doc and whether the deadline tripped
+        """
+        with self.timings.stage('parse'):
+            if deadline is None or len(text) <= BUDGET_CHUNK_CHARS:
+                return self._parse(text, nlp), False
+
+            chunks = _chunk_text(text, BUDGET_CHUNK_CHARS)
+            docs = []
+            with self._nlp_lock:
+                nlp = self.nlp if nlp is None else nlp
+                for chunk in chunks:
+                    docs.append(nlp(chunk))
+                    if time.perf_counter() > deadline:
+                        break
+            return Doc.from_docs(docs), len(docs) < len(chunks)
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        """Collapse whitespace before NLP processing."""
+        return re.sub(r'\s+', ' ', text).strip()
+
+    def preprocess(self, text: str, language: Optional[str] = None) -> Tuple[str, object]:
+        """
+        Normalize text and parse it once, so every stage shares one Doc.
+
+        The text keeps its original case: NER needs capitalization, and the
+        TF-IDF vectorizer lowercases on its own.
+
+        Args:
+            text (str): Input text
+            language (str, optional): Language of the text; DEFAULT_LANGUAGE if not given
+
+        Returns:
+            Tuple of normalized text and its spacy.tokens.Doc, or None if
+            there is no pipeline for the language
+        """
+        text = self._normalize_text(text)
+        nlp = self.pipeline(language or self.default_language)
+        if nlp is None:
+            return text, None
+        with self.timings.stage('parse'):
+            doc = self._parse(text, nlp)
+        return text, doc
+
+    def extract_keywords(self, text: str, top_k: int = 10, doc=None,
+                         keyword_scores: Optional[List[Tuple[str, float]]] = None,
+                         language: Optional[str] = None, learn: bool = True) -> List[str]:
         """
         Extract top keywords using TF-IDF and Named Entity Recognition.
 
         Args:
             text (str): Input text
             top_k (int): Number of top keywords to return
+            doc (spacy.tokens.Doc, optional): Document already parsed by
+                preprocess(); text is parsed if not given
+            keyword_scores (list, optional): (keyword, score) pairs already
+                computed by the corpus keyword model for this text
+            language (str, optional): Language of the text; DEFAULT_LANGUAGE if not given
+            learn (bool): Add the text to the corpus keyword model
 
         Returns:
             List of top keywords
         """
-        # Preprocess text
-        text = re.sub(r'\s+', ' ', text).lower().strip()
+        language = language or self.default_language
 
-        # SpaCy named entity extraction
-        doc = self.nlp(text)
+        # Preprocess text
+        if doc is None:
+            text, doc = self.preprocess(text, language)
 
-        # Extract named entities
+        # Extract named entities; languages without a pipeline have none
         entities = [ent.text.lower() for ent in doc.ents
-                    if ent.label_ in ['ORG', 'PRODUCT', 'GPE', 'PERSON']]
+                    if ent.label_ in KEYWORD_ENTITY_LABELS] if doc is not None else []
 
         # TF-IDF for additional keywords
         try:
-            vectorizer = TfidfVectorizer(
-                max_features=100,
-                stop_words='english',
-                ngram_range=(1, 2)
-            )
-
-            # Combine text processing
-            tfidf_matrix = vectorizer.fit_transform([text])
-            feature_names = vectorizer.get_feature_names_out()
-
-            # Combine TF-IDF keywords with named entities
-            tfidf_scores = tfidf_matrix.toarray()[0]
-            keyword_scores = list(zip(feature_names, tfidf_scores))
-
-            # Sort and filter keywords
-            sorted_keywords = sorted(keyword_scores, key=lambda x: x[1], reverse=True)
+            if keyword_scores is None:
+                keyword_scores = self._score_keywords([text], top_k, learn=learn, language=language)[0]
 
             # Combine and deduplicate keywords
             keywords = []
             seen = set()
-            for word, score in sorted_keywords + [(e, 1.0) for e in entities]:
+            for word, score in keyword_scores + [(e, 1.0) for e in entities]:
                 if word not in seen and score > 0:
                     keywords.append(word)
                     seen.add(word)
@@ -137,104 +682,978 @@ class AdvancedContentAnalyzer:
             logging.error(f"Keyword extraction error: {e}")
             return entities[:top_k]
 
-    def detect_theme(self, text: str) -> str:
+    def _score_keywords(self, texts: List[str], top_k: int = 10, learn: bool = True,
+                        language: Optional[str] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Score keyword candidates for a batch of texts.
+
+        With a corpus keyword model the whole batch is first added to the
+        corpus statistics and then scored in one sparse pass; without one,
+        each text gets its own single-document TF-IDF. Blank texts and
+        texts of stop words only get no keywords.
+
+        Args:
+            texts (list): Normalized page texts
+            top_k (int): Number of keywords per text
+            learn (bool): Add the texts to the corpus keyword model
+            language (str, optional): Language of all texts, selecting the
+                stop words; DEFAULT_LANGUAGE if not given
+
+        Returns:
+            For every text, a list of (keyword, score) pairs, best first
+        """
+        stop_words = self._stop_words(language or self.default_language)
+        scored = [[] for _ in texts]
+        positions = [p for p, text in enumerate(texts) if text and text.strip()]
+        if not positions:
+            return scored
+
+        if self.keyword_model is not None:
+            texts = [texts[p] for p in positions]
+            if learn:
+                self.keyword_model.partial_fit(texts, stop_words)
+            for p, keyword_scores in zip(positions, self.keyword_model.top_keywords(texts, top_k, stop_words)):
+                scored[p] = keyword_scores
+            return scored
+
+        for p in positions:
+            vectorizer = TfidfVectorizer(
+                max_features=100,
+                stop_words=stop_words,
+                ngram_range=(1, 2)
+            )
+
+            # Combine text processing
+            try:
+                tfidf_matrix = vectorizer.fit_transform([texts[p]])
+            except ValueError:
+                # Empty vocabulary: only stop words
+                continue
+            feature_names = vectorizer.get_feature_names_out()
+
+            # Sort and filter keywords
+            tfidf_scores = tfidf_matrix.toarray()[0]
+            keyword_scores = list(zip(feature_names, tfidf_scores))
+            scored[p] = sorted(keyword_scores, key=lambda x: x[1], reverse=True)
+        return scored
+
+    def _score_text_keywords(self, text: str, learn: bool = True,
+                                language: Optional[str] = None) -> List[Tuple[str, float]]:
+        """Keyword scores of a single text, no keywords if scoring fails."""
+        try:
+            return self._score_keywords([text], learn=learn, language=language)[0]
+        except Exception as e:
+            logging.error(f"Keyword extraction error: {e}")
+            return []
+
+    def learn_keywords(self, html_documents: List[str],
+                       extracted: Optional[List[Optional[Tuple[str, bool]]]] = None) -> None:
+        """
+        Add pages answered from the analysis cache to the corpus keyword
+        model, as analyzing them would have, so the statistics of unchanged
+        pages are renewed every run instead of fading with the model's decay.
+
+        Args:
+            html_documents (list): HTML documents
+            extracted (list, optional): Output of extract_page_text() for
+                every document, None where it is to be extracted here
+        """
+        if self.keyword_model is None or self.profile == 'fast':
+            return
+        texts = []
+        for i, html_content in enumerate(html_documents):
+            page = extracted[i] if extracted else None
+            if page is None:
+                # Pages analyzed from their metadata are not learned either
+                page = self.extract_page_text(html_content)
+            if page is not None:
+                texts.append(self._normalize_text(page[0]))
+
+        languages = [self.detect_language(text) for text in texts]
+        with self.timings.stage('keywords'):
+            for language, positions in _group_positions(languages).items():
+                try:
+                    self.keyword_model.partial_fit([texts[p] for p in positions], self._stop_words(language))
+                except Exception as e:
+                    logging.error(f"Keyword model update error: {e}")
+
+    def detect_theme(self, text: str, doc=None) -> str:
         """
         Detect website theme using semantic similarity.
 
         Args:
             text (str): Input text
+            doc (spacy.tokens.Doc, optional): Document already parsed by
+                preprocess(); text is parsed if not given
 
         Returns:
             str: Detected theme
         """
-        # Preprocess text
-        text = re.sub(r'\s+', ' ', text).lower().strip()
+        ranked = self.rank_themes(text, doc=doc)
+        return ranked[0][0] if ranked else "General"
+
+    def rank_themes(self, text: str, doc=None) -> List[Tuple[str, float]]:
+        """
+        Rank all themes by cosine similarity to the text, or by keyword
+        frequency when vectors are not available.
+
+        Args:
+            text (str): Input text
+            doc (spacy.tokens.Doc, optional): Document already parsed by
+                preprocess(); text is parsed if not given
 
+        Returns:
+            List of (theme, similarity) pairs, best first; empty on failure
+        """
         try:
+            if not self.uses_vectors:
+                return self._rank_texts([text])[0]
+
             # Create text embedding
-            text_embedding = self.nlp(text).vector
-
-            # Compute cosine similarities with theme embeddings
-            theme_similarities = {}
-            for theme, theme_embedding in self.theme_embeddings.items():
-                similarity = cosine_similarity(
-                    text_embedding.reshape(1, -1),
-                    theme_embedding.reshape(1, -1)
-                )[0][0]
-                theme_similarities[theme] = similarity
-
-            # Return theme with highest similarity
-            if theme_similarities:
-                return max(theme_similarities, key=theme_similarities.get)
+            if doc is None:
+                _, doc = self.preprocess(text)
+            return self._rank_scores(self.score_themes(doc.vector)[0])
         except Exception as e:
             logging.error(f"Theme detection error: {e}")
+            return []
+
+    def score_themes(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Cosine similarity of document vectors to every theme.
+
+        Args:
+            vectors (np.ndarray): One vector or an (N x dimensions) matrix
+
+        Returns:
+            np.ndarray: (N x themes) similarity matrix, rows in theme_names order
+        """
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return (vectors / norms) @ self.theme_matrix.T
+
+    def _rank_scores(self, scores: np.ndarray) -> List[Tuple[str, float]]:
+        """Turn one row of score_themes() into (theme, similarity) pairs, best first."""
+        order = np.argsort(-scores, kind='stable')
+        return [(self.theme_names[j], float(scores[j])) for j in order]
+
+    @staticmethod
+    def _theme_fields(ranked: List[Tuple[str, float]]) -> Dict:
+        """
+        Best theme, runner-up and the similarity margin between them.
+
+        Args:
+            ranked (list): Output of rank_themes()
+
+        Returns:
+            Dict with theme, secondary_theme and theme_margin
+        """
+        if not ranked:
+            return {"theme": "General", "secondary_theme": None, "theme_margin": 0.0}
+
+        theme, best = ranked[0]
+        secondary_theme, second = ranked[1] if len(ranked) > 1 else (None, best)
+        return {
+            "theme": theme,
+            "secondary_theme": secondary_theme,
+            "theme_margin": round(best - second, 4)
+        }
+
+    def theme_fields_for_vectors(self, vectors: np.ndarray) -> List[Dict]:
+        """
+        Theme fields for many document vectors, scored with one matrix product.
+
+        Args:
+            vectors (np.ndarray): (N x dimensions) document vector matrix
 
-        return "General"
+        Returns:
+            List of dicts with theme, secondary_theme and theme_margin, one per row
+        """
+        if not len(vectors) or not self.theme_names:
+            return [self._theme_fields([]) for _ in range(len(vectors))]
+        return [self._theme_fields(self._rank_scores(row)) for row in self.score_themes(vectors)]
+
+    def theme_fields_for_texts(self, texts: List[str]) -> List[Dict]:
+        """
+        Theme fields for many texts from the trained theme model or by
+        keyword frequency, scored with one sparse matrix product.
 
-    def detect_technologies(self, html_content: str) -> List[str]:
+        Args:
+            texts (list): Normalized texts
+
+        Returns:
+            List of dicts with theme, secondary_theme and theme_margin, one per text
+        """
+        return [self._theme_fields(ranked) for ranked in self._rank_texts(texts)]
+
+    def _rank_texts(self, texts: List[str]) -> List[List[Tuple[str, float]]]:
+        """Rank themes of texts without vectors: trained model if loaded, else keywords."""
+        if self.theme_model is not None:
+            return self.theme_model.rank(texts)
+        return self.term_classifier.rank(texts)
+
+    def detect_technologies(self, html_content: str, response: Optional[Dict] = None) -> List[str]:
         """
         Detect technologies used in the website.
 
         Args:
             html_content (str): Website HTML content
+            response (dict, optional): Response "headers" (dict) and
+                "cookies" (names), used by the signals detector
 
         Returns:
             List of detected technologies
         """
-        html_str = html_content.lower()
-        detected_techs = []
+        if isinstance(self.tech_matcher, TechMatcher):
+            return self.tech_matcher.match(html_content)
+        response = response or {}
+        return self.tech_matcher.match(html_content, response.get('headers'), response.get('cookies'))
+
+    def analyze(self, html_content: Optional[str], domain: Optional[str] = None,
+                response: Optional[Dict] = None,
+                extracted: Optional[Tuple[str, bool]] = None,
+                learn: bool = True) -> Dict:
+        """
+        Analyze a single HTML page with this analyzer.
+
+        Args:
+            html_content (str): HTML content of the website
+            domain (str, optional): Site domain; its document vector is
+                recorded in the vector store
+            response (dict, optional): Response headers and cookie names,
+                see detect_technologies()
+            extracted (tuple, optional): Output of extract_page_text() for
+                the page; the text is extracted here if not given
+            learn (bool): Add the page to the corpus keyword model
+
+        Returns:
+            Dict containing theme, keywords, and technologies
+        """
+        if not html_content:
+            return _empty_analysis()
+
+        start = time.perf_counter()
+        if self._exceeds_html_budget(html_content):
+            result = self.analyze_metadata(html_content, response)
+            result["budgets_exceeded"] = ['html_bytes']
+            self._store_vector(domain, html_content, None)
+            return result
+
+        if self.profile == 'fast':
+            return self.analyze_metadata(html_content, response)
+
+        # Extract text from HTML
+        if extracted is None:
+            with self.timings.stage('extract'):
+                extracted = self._extract_text_within_budget(html_content)
+        text_content, truncated = extracted
+        budgets_exceeded = ['text_chars'] if truncated else []
+
+        # Route the page to the pipeline of its language; without one it is
+        # not parsed at all
+        text = self._normalize_text(text_content)
+        language = self.detect_language(text)
+        nlp = self.pipeline(language)
+
+        # Parse once and share the Doc between stages
+        doc, late = None, False
+        if nlp is not None:
+            deadline = start + self.max_analysis_seconds if self.max_analysis_seconds else None
+            doc, late = self._parse_within(text, deadline, nlp)
+        if late:
+            budgets_exceeded.append('wall_time')
+        # Vectors of other languages' models live in other spaces
+        vector = doc.vector if doc is not None and language == self.default_language else None
+        self._store_vector(domain, html_content, vector)
+
+        # Analyze content
+        result = self._analyze_doc(html_content, text, doc, response=response, language=language, learn=learn)
+        result["budgets_exceeded"] = budgets_exceeded
+        self.language_timings.add(language, time.perf_counter() - start)
+        return result
+
+    def with_technologies(self, analysis: Dict, html_content: str, response: Optional[Dict] = None) -> Dict:
+        """
+        A reused analysis (cache hit or mirror) with the technologies of
+        this page and response: header and cookie signals are not part of
+        the cache key, and a mirror is served by its own host.
+
+        Args:
+            analysis (dict): Analysis reused for the page
+            html_content (str): HTML content of the website
+            response (dict, optional): Response headers and cookie names
+
+        Returns:
+            Dict: Copy of the analysis with technologies detected again
+        """
+        with self.timings.stage('technologies'):
+            return dict(analysis, technologies=self.detect_technologies(html_content, response))
+
+    def analyze_metadata(self, html_content: str, response: Optional[Dict] = None) -> Dict:
+        """
+        Analyze a page from its metadata only (fast profile).
+
+        Uses the <title>, meta description/keywords and og:* tags plus the
+        technology matcher; SpaCy is not used.
+
+        Args:
+            html_content (str): HTML content of the website
+            response (dict, optional): Response headers and cookie names
+
+        Returns:
+            Dict containing theme fields, keywords, and technologies
+        """
+        text = self._metadata_text(html_content)
+        with self.timings.stage('theme'):
+            theme_fields = self._theme_fields(self._rank_texts([text])[0])
+        return self._analyze_metadata_text(html_content, text, theme_fields, response)
+
+    def _metadata_text(self, html_content: str) -> str:
+        """Normalized text of the metadata fields the fast profile analyzes."""
+        with self.timings.stage('extract'):
+            metadata = extract_metadata(html_content)
+            return self._normalize_text(' '.join(
+                metadata[field] for field in METADATA_TEXT_FIELDS if field in metadata
+            ))
+
+    def _analyze_metadata_text(self, html_content: str, text: str, theme_fields: Dict,
+                               response: Optional[Dict] = None) -> Dict:
+        """
+        Keyword and technology detection for a page analyzed from its metadata.
+
+        Args:
+            html_content (str): HTML content of the website
+            text (str): Normalized metadata text
+            theme_fields (dict): Theme fields already computed for the page
+            response (dict, optional): Response headers and cookie names
+
+        Returns:
+            Dict containing theme fields, keywords, and technologies
+        """
+        language = self.detect_language(text)
+        result = dict(theme_fields, language=language, budgets_exceeded=[])
+        with self.timings.stage('keywords'):
+            try:
+                keyword_scores = self._score_keywords([text], learn=False, language=language)[0] if text else []
+            except Exception as e:
+                logging.error(f"Keyword extraction error: {e}")
+                keyword_scores = []
+            result["keywords"] = [word for word, score in keyword_scores if score > 0][:10]
+        with self.timings.stage('technologies'):
+            result["technologies"] = self.detect_technologies(html_content, response)
+
+        return result
+
+    def rank_themes_by_terms(self, text: str) -> List[Tuple[str, float]]:
+        """
+        Rank themes by how often their keywords occur in the text.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            List of (theme, score) pairs, best first; empty if no theme
+            keyword occurs at all
+        """
+        return self.term_classifier.rank([text])[0]
+
+    def _analyze_doc(self, html_content: str, text: str, doc, with_theme: bool = True,
+                     keyword_scores: Optional[List[Tuple[str, float]]] = None,
+                     response: Optional[Dict] = None,
+                     language: Optional[str] = None, learn: bool = True) -> Dict:
+        """
+        Run theme, keyword and technology detection for a parsed page.
+
+        Args:
+            html_content (str): Website HTML content
+            text (str): Normalized page text
+            doc (spacy.tokens.Doc): Parsed page text; None for languages
+                without a pipeline
+            with_theme (bool): Rank themes here; batch callers score
+                themes for all pages at once instead
+            keyword_scores (list, optional): Precomputed keyword scores
+            response (dict, optional): Response headers and cookie names
+            language (str, optional): Language of the page; DEFAULT_LANGUAGE if not given
+            learn (bool): Add the page to the corpus keyword model, when
+                keyword_scores are not given
+
+        Returns:
+            Dict containing theme fields, language, keywords, and technologies
+        """
+        language = language or self.default_language
+        result = {"language": language}
+        if with_theme:
+            with self.timings.stage('theme'):
+                if language == self.default_language:
+                    ranked = self.rank_themes(text, doc=doc)
+                else:
+                    # Theme vectors come from the main pipeline: rank by text
+                    ranked = self._rank_texts([text])[0]
+                result.update(self._theme_fields(ranked))
+        with self.timings.stage('keywords'):
+            result["keywords"] = self.extract_keywords(text, doc=doc, keyword_scores=keyword_scores,
+                                                       language=language, learn=learn)
+        with self.timings.stage('technologies'):
+            result["technologies"] = self.detect_technologies(html_content, response)
 
-        for tech, patterns in self.tech_patterns.items():
-            for pattern in patterns:
-                if pattern.lower() in html_str:
-                    detected_techs.append(tech)
-                    break
+        return result
+
+    def analyze_many(self,
+                     html_documents: Iterable[Optional[str]],
+                     batch_size: int = 32,
+                     n_process: int = 1,
+                     domains: Optional[List[Optional[str]]] = None,
+                     responses: Optional[List[Optional[Dict]]] = None,
+                     extracted: Optional[List[Optional[Tuple[str, bool]]]] = None,
+                     learn: bool = True) -> List[Dict]:
+        """
+        Analyze many HTML pages in one pass through the SpaCy pipeline.
+
+        Text is extracted for all pages up front and streamed through
+        nlp.pipe, so each page is parsed once and the per-call pipeline
+        overhead is shared across the batch.
+
+        Args:
+            html_documents (iterable): HTML documents; empty entries are allowed
+            batch_size (int): Number of documents SpaCy processes per batch
+            n_process (int): Number of SpaCy worker processes
+            domains (list, optional): Domain of every document, for the
+                vector store
+            responses (list, optional): Response headers and cookie names
+                of every document, see detect_technologies()
+            extracted (list, optional): Output of extract_page_text() for
+                every document, None where it is to be extracted here
+            learn (bool): Add the pages to the corpus keyword model
 
-        return list(set(detected_techs))
+        Returns:
+            List of analysis dicts, in the same order as html_documents
+        """
+        html_documents = list(html_documents)
+        if domains is None:
+            domains = [None] * len(html_documents)
+        if responses is None:
+            responses = [None] * len(html_documents)
+        if extracted is None:
+            extracted = [None] * len(html_documents)
+        if self.profile == 'fast':
+            return self._analyze_many_metadata(html_documents, responses)
+
+        results = [_empty_analysis() for _ in html_documents]
+
+        # Extract and normalize text for every non-empty document; pages
+        # over the HTML budget are analyzed from their metadata only
+        indexes = []
+        texts = []
+        budgets_exceeded = {}
+        for i, html_content in enumerate(html_documents):
+            if not html_content:
+                continue
+            try:
+                if self._exceeds_html_budget(html_content):
+                    results[i] = self.analyze_metadata(html_content, responses[i])
+                    results[i]["budgets_exceeded"] = ['html_bytes']
+                    self._store_vector(domains[i], html_content, None)
+                    continue
+                if extracted[i] is None:
+                    with self.timings.stage('extract'):
+                        extracted[i] = self._extract_text_within_budget(html_content)
+                text, truncated = extracted[i]
+                texts.append(self._normalize_text(text))
+                indexes.append(i)
+                budgets_exceeded[i] = ['text_chars'] if truncated else []
+            except Exception as e:
+                logging.error(f"Text extraction error: {e}")
 
+        # Identify the language of every text
+        languages = [self.detect_language(text) for text in texts]
+        by_language = _group_positions(languages)
 
-def analyze_content(html_content: Optional[str]) -> Dict[str, List[str]]:
+        # Score keyword candidates of the whole batch at once, per language
+        batch_keyword_scores = [[] for _ in texts]
+        with self.timings.stage('keywords'):
+            for language, positions in by_language.items():
+                try:
+                    scores = self._score_keywords([texts[p] for p in positions], learn=learn, language=language)
+                except Exception as e:
+                    # Score the pages one by one, so a bad page loses only its own keywords
+                    logging.error(f"Keyword extraction error, scoring pages one by one: {e}")
+                    scores = [self._score_text_keywords(texts[p], learn, language) for p in positions]
+                for p, keyword_scores in zip(positions, scores):
+                    batch_keyword_scores[p] = keyword_scores
+
+        analyzed = []
+        vectors = []
+
+        def finish(i, text, doc, keyword_scores, language):
+            try:
+                results[i] = self._analyze_doc(html_documents[i], text, doc, with_theme=False,
+                                               keyword_scores=keyword_scores, response=responses[i],
+                                               language=language)
+                results[i]["budgets_exceeded"] = budgets_exceeded[i]
+                analyzed.append(i)
+                vector = doc.vector if doc is not None and language == self.default_language else None
+                vectors.append(vector)
+                self._store_vector(domains[i], html_documents[i], vector)
+            except Exception as e:
+                logging.error(f"Comprehensive content analysis error: {e}")
+
+        # Every language goes through its own pipeline, and languages without
+        # one are not parsed. Texts are streamed through nlp.pipe, and with a
+        # wall-time budget the stream gets the budget of all its pages: once
+        # it runs out, the remaining pages are parsed chunk by chunk against
+        # the passed deadline. Only texts expected to take longer than the
+        # budget on their own, at the rate of earlier streams, are chunked
+        # from the start
+        for language, positions in by_language.items():
+            start = time.perf_counter()
+            nlp = self.pipeline(language)
+            rate = self._stream_rates.get(language)
+            piped, budgeted = [], []
+            for p in positions:
+                page = (indexes[p], texts[p], batch_keyword_scores[p])
+                if nlp is None:
+                    finish(*page, None, language)
+                elif self.max_analysis_seconds and rate and len(texts[p]) > rate * self.max_analysis_seconds:
+                    budgeted.append(page)
+                else:
+                    piped.append(page)
+
+            streamed = 0
+            if piped:
+                deadline = start + self.max_analysis_seconds * len(piped) if self.max_analysis_seconds else None
+                with self._nlp_lock:
+                    stream_start = time.perf_counter()
+                    # nlp.pipe yields documents in input order, also with n_process > 1
+                    docs = nlp.pipe([text for _, text, _ in piped], batch_size=batch_size, n_process=n_process)
+                    for (i, text, keyword_scores), doc in zip(piped, docs):
+                        finish(i, text, doc, keyword_scores, language)
+                        streamed += 1
+                        if deadline is not None and streamed < len(piped) and time.perf_counter() > deadline:
+                            break
+                    elapsed = time.perf_counter() - stream_start
+                if elapsed > 0:
+                    self._stream_rates[language] = sum(len(text) for _, text, _ in piped[:streamed]) / elapsed
+
+            for i, text, keyword_scores in budgeted:
+                doc, late = self._parse_within(text, time.perf_counter() + self.max_analysis_seconds, nlp)
+                if late:
+                    budgets_exceeded[i].append('wall_time')
+                finish(i, text, doc, keyword_scores, language)
+
+            for i, text, keyword_scores in piped[streamed:]:
+                doc, late = self._parse_within(text, time.perf_counter(), nlp)
+                if late:
+                    budgets_exceeded[i].append('wall_time')
+                finish(i, text, doc, keyword_scores, language)
+
+            self.language_timings.add(language, time.perf_counter() - start, calls=len(positions))
+
+        # Score every document against every theme with one matrix product;
+        # pages without a main-pipeline vector are ranked by their text
+        with self.timings.stage('theme'):
+            by_vector = [(i, vector) for i, vector in zip(analyzed, vectors) if vector is not None]
+            if by_vector and not self.uses_vectors:
+                by_vector = []
+            if by_vector:
+                theme_fields = self.theme_fields_for_vectors(np.vstack([vector for _, vector in by_vector]))
+                for (i, _), fields in zip(by_vector, theme_fields):
+                    results[i].update(fields)
+
+            vector_indexes = {i for i, _ in by_vector}
+            by_text = [i for i in analyzed if i not in vector_indexes]
+            if by_text:
+                text_of = dict(zip(indexes, texts))
+                for i, fields in zip(by_text, self.theme_fields_for_texts([text_of[i] for i in by_text])):
+                    results[i].update(fields)
+
+        return results
+
+    def _analyze_many_metadata(self, html_documents: List[Optional[str]],
+                               responses: List[Optional[Dict]]) -> List[Dict]:
+        """
+        Fast-profile analyze_many(): metadata of every page, themes of the
+        whole batch scored by keyword frequency at once.
+        """
+        results = [_empty_analysis() for _ in html_documents]
+        indexes = [i for i, html_content in enumerate(html_documents) if html_content]
+        texts = [self._metadata_text(html_documents[i]) for i in indexes]
+
+        with self.timings.stage('theme'):
+            theme_fields = self.theme_fields_for_texts(texts)
+
+        for i, text, fields in zip(indexes, texts, theme_fields):
+            try:
+                results[i] = self._analyze_metadata_text(html_documents[i], text, fields, responses[i])
+            except Exception as e:
+                logging.error(f"Comprehensive content analysis error: {e}")
+        return results
+
+    def warmup(self) -> 'AdvancedContentAnalyzer':
+        """
+        Push a tiny document through the pipeline so lazily initialized
+        SpaCy and scikit-learn internals are ready before real work starts.
+
+        Returns:
+            AdvancedContentAnalyzer: self, for chaining
+        """
+        self.analyze("<html><body><p>warmup</p></body></html>", learn=False)
+        return self
+
+
+def _chunk_text(text: str, size: int) -> List[str]:
+    """Split text into pieces of at most size characters, at spaces where possible."""
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = start + size
+        if end < len(text):
+            space = text.rfind(' ', start, end)
+            if space > start:
+                end = space
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        start = end
+    return chunks
+
+
+def _group_positions(keys: List[str]) -> Dict[str, List[int]]:
+    """Positions of every distinct key, in order of first occurrence."""
+    groups: Dict[str, List[int]] = {}
+    for position, key in enumerate(keys):
+        groups.setdefault(key, []).append(position)
+    return groups
+
+
+def _cacheable(analysis: Dict) -> bool:
+    """Whether an analysis may be cached: failed or time-limited results are not reproducible."""
+    return analysis["theme"] != "Unknown" and 'wall_time' not in analysis.get("budgets_exceeded", [])
+
+
+def _empty_analysis() -> Dict:
+    """Analysis result used when a page has no content or analysis fails."""
+    return {
+        "theme": "Unknown",
+        "secondary_theme": None,
+        "theme_margin": 0.0,
+        "language": None,
+        "keywords": [],
+        "technologies": [],
+        "budgets_exceeded": []
+    }
+
+
+def get_analyzer(tech_patterns_file: str = DEFAULT_TECH_PATTERNS_FILE,
+                 themes_file: str = DEFAULT_THEMES_FILE,
+                 spacy_model: str = DEFAULT_SPACY_MODEL,
+                 **options) -> AdvancedContentAnalyzer:
+    """
+    Return the process-wide analyzer for the given model and pattern files.
+
+    The analyzer is built lazily on first use and then shared, so SpaCy,
+    the pattern files and the theme embeddings are loaded once per process
+    instead of once per page.
+
+    Args:
+        tech_patterns_file (str): Path to technology patterns JSON
+        themes_file (str): Path to themes JSON
+        spacy_model (str): SpaCy model name
+        **options: Further AdvancedContentAnalyzer keyword arguments
+            (keyword_model_file, text_extractor, ...); part of the key
+
+    Returns:
+        AdvancedContentAnalyzer: Shared analyzer instance
+    """
+    key = (spacy_model, os.path.abspath(tech_patterns_file), os.path.abspath(themes_file),
+           repr(sorted(options.items())))
+
+    analyzer = _analyzers.get(key)
+    if analyzer is not None:
+        return analyzer
+
+    with _analyzers_lock:
+        # Another thread may have built it while we were waiting
+        analyzer = _analyzers.get(key)
+        if analyzer is None:
+            logging.info(f"Loading content analyzer (model={spacy_model})")
+            analyzer = AdvancedContentAnalyzer(
+                tech_patterns_file=tech_patterns_file,
+                themes_file=themes_file,
+                spacy_model=spacy_model,
+                **options
+            )
+            _analyzers[key] = analyzer
+        return analyzer
+
+
+def warmup(**kwargs) -> AdvancedContentAnalyzer:
+    """
+    Build (if needed) and warm up the shared analyzer.
+
+    Args:
+        **kwargs: Passed through to get_analyzer()
+
+    Returns:
+        AdvancedContentAnalyzer: Shared, warmed-up analyzer instance
+    """
+    return get_analyzer(**kwargs).warmup()
+
+
+def loaded_analyzers() -> List[AdvancedContentAnalyzer]:
+    """Shared analyzers that have been built so far in this process."""
+    with _analyzers_lock:
+        return list(_analyzers.values())
+
+
+def cache_fingerprint(tech_patterns_file: str = DEFAULT_TECH_PATTERNS_FILE,
+                      themes_file: str = DEFAULT_THEMES_FILE,
+                      spacy_model: str = DEFAULT_SPACY_MODEL,
+                      **options) -> str:
+    """
+    Fingerprint of an analyzer configuration for the analysis cache.
+
+    Computed from the analyzer version and options, the SpaCy model name
+    and installed version, the installed versions of the per-language
+    models (installing one changes that language's results), and the
+    pattern/theme (and theme model) file contents, without loading SpaCy.
+
+    Args:
+        tech_patterns_file (str): Path to technology patterns JSON
+        themes_file (str): Path to themes JSON
+        spacy_model (str): SpaCy model name
+        **options: The analyzer options passed to get_analyzer()
+
+    Returns:
+        str: Cache fingerprint
+    """
+    files = [tech_patterns_file, themes_file,
+             options.get('tech_signals_file', DEFAULT_TECH_SIGNALS_FILE)]
+    if options.get('languages_file', DEFAULT_LANGUAGES_FILE):
+        files.append(options.get('languages_file', DEFAULT_LANGUAGES_FILE))
+    if options.get('theme_model_file'):
+        # Retraining the theme model changes results
+        files.append(options['theme_model_file'])
+
+    # Learned state and artifact locations are not configuration
+    options = {name: value for name, value in options.items() if name not in _STATE_OPTIONS}
+    language_models = sorted((options.get('language_models') or {}).items())
+    models = [f"{language}={model}@{model_version(model)}" for language, model in language_models]
+    version = f"{ANALYZER_VERSION}:{sorted(options.items())}:{models}"
+    return analysis_fingerprint(version, spacy_model, files)
+
+
+def clear_analyzers() -> None:
+    """Drop all shared analyzers, e.g. after editing the pattern files."""
+    with _analyzers_lock:
+        _analyzers.clear()
+
+
+def analyze_content(html_content: Optional[str],
+                    analyzer: Optional[AdvancedContentAnalyzer] = None,
+                    cache: Optional[AnalysisCache] = None,
+                    domain: Optional[str] = None,
+                    response: Optional[Dict] = None,
+                    mirrors: Optional[MirrorIndex] = None,
+                    learn: bool = True) -> Dict:
     """
     Analyze website content using advanced NLP techniques.
 
     Args:
         html_content (str): HTML content of the website
+        analyzer (AdvancedContentAnalyzer, optional): Analyzer to use,
+            defaults to the shared instance from get_analyzer()
+        cache (AnalysisCache, optional): Cache consulted before analyzing;
+            on a hit SpaCy is not loaded and only the technologies are
+            detected again, from this page's response
+        domain (str, optional): Site domain, for the analyzer's vector store;
+            pages without a stored vector bypass the cache once
+        response (dict, optional): Response headers and cookie names, for
+            technology detection
+        mirrors (MirrorIndex, optional): Sites analyzed earlier in the run;
+            a near-duplicate of one of them reuses its analysis, with
+            "mirror_of" set to its domain
+        learn (bool): Add the page to the analyzer's corpus keyword model;
+            False scores keywords against the model as it is
 
     Returns:
         Dict containing theme, keywords, and technologies
     """
     # Default return if no content
     if not html_content:
-        return {
-            "theme": "Unknown",
-            "keywords": [],
-            "technologies": []
-        }
+        return _empty_analysis()
 
     try:
-        # Extract text from HTML
-        from bs4 import BeautifulSoup
-        soup = BeautifulSoup(html_content, 'html.parser')
-        text_content = soup.get_text(separator=' ', strip=True)
+        if analyzer is None:
+            analyzer = get_analyzer()
+    except Exception as e:
+        logging.error(f"Error loading content analyzer: {e}")
+        return _empty_analysis()
 
-        # Initialize analyzer
-        analyzer = AdvancedContentAnalyzer()
+    signed = mirrors is not None and domain
+    if cache is not None and analyzer.has_vector(domain, html_content):
+        cached = cache.get(html_content)
+        if cached is not None:
+            cached = analyzer.with_technologies(cached, html_content, response)
+            extracted = None
+            if signed:
+                # Indexed for later mirrors; a hit is not a mirror itself
+                signature, extracted = _mirror_signature(mirrors, analyzer, html_content)
+                mirrors.add(domain, signature)
+                mirrors.record(domain, cached)
+            if learn:
+                analyzer.learn_keywords([html_content], [extracted])
+            return cached
 
-        # Analyze content
-        theme = analyzer.detect_theme(text_content)
-        keywords = analyzer.extract_keywords(text_content)
-        technologies = analyzer.detect_technologies(html_content)
+    start = time.perf_counter()
+    try:
+        # The page is signed from the text the analyzer goes on to parse
+        extracted = None
+        if signed:
+            signature, extracted = _mirror_signature(mirrors, analyzer, html_content)
+            original = mirrors.find(signature)
+            mirrored = mirrors.mirror_analysis(original) if original else None
+            if mirrored is not None:
+                return analyzer.with_technologies(mirrored, html_content, response)
+            mirrors.add(domain, signature)
 
-        return {
-            "theme": theme,
-            "keywords": keywords,
-            "technologies": technologies
-        }
+        analysis = analyzer.analyze(html_content, domain=domain, response=response, extracted=extracted,
+                                    learn=learn)
 
     except Exception as e:
         logging.error(f"Comprehensive content analysis error: {e}")
-        return {
-            "theme": "Unknown",
-            "keywords": [],
-            "technologies": []
-        }
\ No newline at end of file
+        return _empty_analysis()
+
+    if cache is not None and _cacheable(analysis):
+        cache.put(html_content, analysis)
+    if signed:
+        mirrors.record(domain, analysis, time.perf_counter() - start)
+    return analysis
+
+
+def _mirror_signature(mirrors: MirrorIndex, analyzer: AdvancedContentAnalyzer,
+                      html_content: str) -> Tuple[Optional[np.ndarray], Optional[Tuple[str, bool]]]:
+    """
+    MinHash signature of a page, from the analyzer's extracted text where
+    it has one, and that text for analyze().
+    """
+    extracted = analyzer.extract_page_text(html_content)
+    if extracted is None:
+        return mirrors.signature(html_content), None
+    return mirrors.signature_text(extracted[0]), extracted
+
+
+def analyze_content_batch(html_documents: Iterable[Optional[str]],
+                          analyzer: Optional[AdvancedContentAnalyzer] = None,
+                          cache: Optional[AnalysisCache] = None,
+                          batch_size: int = 32,
+                          n_process: int = 1,
+                          domains: Optional[List[Optional[str]]] = None,
+                          responses: Optional[List[Optional[Dict]]] = None,
+                          mirrors: Optional[MirrorIndex] = None,
+                          learn: bool = True) -> List[Dict]:
+    """
+    Analyze many pages, answering from the cache where possible and sending
+    only the misses through AdvancedContentAnalyzer.analyze_many().
+
+    Args:
+        html_documents (iterable): HTML documents; empty entries are allowed
+        analyzer (AdvancedContentAnalyzer, optional): Analyzer to use,
+            defaults to the shared instance from get_analyzer()
+        cache (AnalysisCache, optional): Analysis cache
+        batch_size (int): Number of documents SpaCy processes per batch
+        n_process (int): Number of SpaCy worker processes
+        domains (list, optional): Domain of every document, for the
+            analyzer's vector store
+        responses (list, optional): Response headers and cookie names of
+            every document, for technology detection
+        mirrors (MirrorIndex, optional): Sites analyzed earlier in the run,
+            see analyze_content(); mirrors within the batch are found too
+        learn (bool): Add the pages to the analyzer's corpus keyword model;
+            False scores keywords against the model as it is
+
+    Returns:
+        List of analysis dicts, in the same order as html_documents
+    """
+    html_documents = list(html_documents)
+    if domains is None:
+        domains = [None] * len(html_documents)
+    if responses is None:
+        responses = [None] * len(html_documents)
+    results = [None if html_content else _empty_analysis() for html_content in html_documents]
+    if analyzer is None and any(html_documents):
+        analyzer = get_analyzer()
+
+    # Header and cookie signals are not part of the cache key
+    if cache is not None:
+        for i, html_content in enumerate(html_documents):
+            if html_content and analyzer.has_vector(domains[i], html_content):
+                results[i] = cache.get(html_content)
+                if results[i] is not None:
+                    results[i] = analyzer.with_technologies(results[i], html_content, responses[i])
+
+    # Near-duplicates of earlier sites, or of earlier pages of this batch,
+    # are not analyzed. Pages are signed in order, cache hits included, so
+    # later pages find them; misses are signed from the text the analyzer
+    # goes on to parse
+    misses = [i for i, result in enumerate(results) if result is None]
+    originals = {}
+    extracted = [None] * len(html_documents)
+    if mirrors is not None:
+        for i, html_content in enumerate(html_documents):
+            if not (html_content and domains[i]):
+                continue
+            signature, extracted[i] = _mirror_signature(mirrors, analyzer, html_content)
+            original = None if results[i] is not None else mirrors.find(signature)
+            if original:
+                originals[i] = original
+                continue
+            mirrors.add(domains[i], signature)
+            if results[i] is not None:
+                mirrors.record(domains[i], results[i])
+    misses = [i for i in misses if i not in originals]
+
+    hits = [i for i, html_content in enumerate(html_documents) if html_content and results[i] is not None]
+    if hits and learn:
+        analyzer.learn_keywords([html_documents[i] for i in hits], [extracted[i] for i in hits])
+
+    if not misses:
+        return _resolve_mirrors(results, originals, html_documents, analyzer, cache, domains, responses, mirrors,
+                                learn)
+
+    start = time.perf_counter()
+    try:
+        analyses = analyzer.analyze_many([html_documents[i] for i in misses],
+                                         batch_size=batch_size, n_process=n_process,
+                                         domains=[domains[i] for i in misses],
+                                         responses=[responses[i] for i in misses],
+                                         extracted=[extracted[i] for i in misses],
+                                         learn=learn)
+    except Exception as e:
+        logging.error(f"Comprehensive content analysis error: {e}")
+        analyses = [_empty_analysis() for _ in misses]
+
+    seconds = (time.perf_counter() - start) / len(misses)
+    for i, analysis in zip(misses, analyses):
+        results[i] = analysis
+        if cache is not None and _cacheable(analysis):
+            cache.put(html_documents[i], analysis)
+        if mirrors is not None and domains[i]:
+            mirrors.record(domains[i], analysis, seconds)
+
+    return _resolve_mirrors(results, originals, html_documents, analyzer, cache, domains, responses, mirrors,
+                            learn)
+
+
+def _resolve_mirrors(results: List[Optional[Dict]], originals: Dict[int, str],
+                     html_documents: List[Optional[str]], analyzer, cache,
+                     domains: List[Optional[str]], responses: List[Optional[Dict]],
+                     mirrors: Optional[MirrorIndex], learn: bool = True) -> List[Dict]:
+    """Fill in the mirrors of analyze_content_batch(); those whose original failed are analyzed."""
+    for i, original in originals.items():
+        results[i] = mirrors.mirror_analysis(original)
+        if results[i] is not None:
+            results[i] = analyzer.with_technologies(results[i], html_documents[i], responses[i])
+        else:
+            results[i] = analyze_content(html_documents[i], analyzer=analyzer, cache=cache,
+                                         domain=domains[i], response=responses[i], learn=learn)
+    return results
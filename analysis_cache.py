@@ -0,0 +1,196 @@
+#!/bin/python
+# analysis_cache.py
+"""
+Persistent cache of content analysis results.
+
+Entries are keyed by a hash of the fetched HTML together with a fingerprint
+of everything that influences the result: analyzer version, SpaCy model
+name and version, and hashes of the pattern/theme files. A hit returns the
+stored analysis without touching SpaCy; changing any input invalidates the
+old entries, which then age out through eviction.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from typing import Dict, Iterable, Optional
+
+try:
+    from importlib.metadata import version as package_version, PackageNotFoundError
+except ImportError:  # Python < 3.8
+    package_version = None
+    PackageNotFoundError = Exception
+
+
+def content_hash(content) -> str:
+    """SHA-256 hex digest of a str or bytes object."""
+    if isinstance(content, str):
+        content = content.encode('utf-8', errors='surrogatepass')
+    return hashlib.sha256(content).hexdigest()
+
+
+def file_hash(filename: str) -> str:
+    """SHA-256 hex digest of a file's bytes, or 'missing' if it cannot be read."""
+    try:
+        with open(filename, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return 'missing'
+
+
+def model_version(model_name: str) -> str:
+    """Installed version of a SpaCy model package, read without loading it."""
+    if package_version is None:
+        return 'unknown'
+    try:
+        return package_version(model_name)
+    except PackageNotFoundError:
+        return 'missing'
+
+
+def analysis_fingerprint(analyzer_version: str, spacy_model: str, files: Iterable[str]) -> str:
+    """
+    Fingerprint of the analyzer configuration an analysis was produced with.
+
+    Args:
+        analyzer_version (str): Version of the analysis logic
+        spacy_model (str): SpaCy model name
+        files (iterable): Pattern/theme files the analyzer loads
+
+    Returns:
+        str: Hex digest identifying the configuration
+    """
+    parts = [analyzer_version, spacy_model, model_version(spacy_model)]
+    parts.extend(file_hash(filename) for filename in files)
+    return content_hash('\0'.join(parts))
+
+
+class AnalysisCache:
+    """
+    SQLite-backed analysis cache with size- and age-based eviction.
+    """
+
+    def __init__(self,
+                 path: str,
+                 fingerprint: str,
+                 max_entries: int = 10000,
+                 max_age_days: float = 30):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): SQLite database file
+            fingerprint (str): Analyzer fingerprint from analysis_fingerprint()
+            max_entries (int): Entries kept after eviction
+            max_age_days (float): Entries not used for longer are evicted
+        """
+        self.path = path
+        self.fingerprint = fingerprint
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.hits = 0
+        self.misses = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS analyses ("
+            " content_hash TEXT NOT NULL,"
+            " fingerprint TEXT NOT NULL,"
+            " analysis TEXT NOT NULL,"
+            " created REAL NOT NULL,"
+            " accessed REAL NOT NULL,"
+            " PRIMARY KEY (content_hash, fingerprint))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS analyses_accessed ON analyses (accessed)")
+        self._conn.commit()
+
+    def get(self, html_content: str) -> Optional[Dict]:
+        """
+        Look up the analysis of a page.
+
+        Args:
+            html_content (str): HTML content of the website
+
+        Returns:
+            Dict or None: Cached analysis, None on a miss
+        """
+        key = content_hash(html_content)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT analysis FROM analyses WHERE content_hash = ? AND fingerprint = ?",
+                (key, self.fingerprint)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE analyses SET accessed = ? WHERE content_hash = ? AND fingerprint = ?",
+                (time.time(), key, self.fingerprint)
+            )
+            self._conn.commit()
+        return json.loads(row[0])
+
+    def put(self, html_content: str, analysis: Dict) -> None:
+        """
+        Store the analysis of a page.
+
+        Args:
+            html_content (str): HTML content of the website
+            analysis (dict): Analysis result
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO analyses VALUES (?, ?, ?, ?, ?)",
+                (content_hash(html_content), self.fingerprint, json.dumps(analysis), now, now)
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """
+        Drop entries that are too old or beyond max_entries (least recently used first).
+
+        Returns:
+            int: Number of evicted entries
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM analyses WHERE accessed < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM analyses WHERE rowid NOT IN "
+                "(SELECT rowid FROM analyses ORDER BY accessed DESC LIMIT ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this session and the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        return {"hits": self.hits, "misses": self.misses, "entries": entries}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def log_stats(self, logger: Optional[logging.Logger] = None) -> None:
+        """Write hit/miss counters to the log."""
+        stats = self.stats()
+        total = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / total * 100 if total else 0.0
+        (logger or logging).info(
+            f"Analysis cache: {stats['hits']} hits, {stats['misses']} misses "
+            f"({hit_rate:.0f}% hit rate), {stats['entries']} entries"
+        )
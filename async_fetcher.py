@@ -0,0 +1,230 @@
+#!/bin/python
+# async_fetcher.py
+"""
+Asyncio page fetcher with pooled keep-alive connections.
+
+All pages of a run are fetched over one aiohttp session: connections are
+kept alive and reused, at most `concurrency` requests are in flight and at
+most `per_host` of them to the same host, and the connect, read and total
+timeouts are separate. Requests wait for one of the `concurrency` slots
+before they are sent, so the total timeout only counts time on the wire.
+A 304 whose cache entry was evicted meanwhile is fetched again in full.
+Every page resolves to the same contract as
+portfolio_generator.get_domain_page(): the HTML, or None, and a dict with
+the response "headers", the names of the "cookies" it sets, whether it
+was "not_modified" (served from an HttpCache, fresh or after a 304), and
+the "bytes" read and whether the body was "truncated" at the byte cap.
+Bodies are streamed in chunks and decoded once (see html_download).
+"""
+import asyncio
+import logging
+import queue
+import threading
+from typing import Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from html_download import DEFAULT_CHUNK_BYTES, DEFAULT_MAX_BYTES, BodyReader, decode_html, is_html
+from http_cache import HttpCache
+from politeness import PolitenessScheduler
+
+try:
+    import aiohttp
+except ImportError:  # optional: callers fall back to blocking requests
+    aiohttp = None
+
+DEFAULT_CONCURRENCY = 32
+DEFAULT_PER_HOST = 2
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 10.0
+DEFAULT_TOTAL_TIMEOUT = 20.0
+
+Page = Tuple[Optional[str], Dict]
+
+
+class AsyncFetcher:
+    """
+    Concurrent HTTP GET of many URLs over one pooled aiohttp session.
+    """
+
+    def __init__(self,
+                 concurrency: int = DEFAULT_CONCURRENCY,
+                 per_host: int = DEFAULT_PER_HOST,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 total_timeout: float = DEFAULT_TOTAL_TIMEOUT,
+                 headers: Optional[Mapping[str, str]] = None,
+                 http_cache: Optional[HttpCache] = None,
+                 max_bytes: Optional[int] = DEFAULT_MAX_BYTES,
+                 chunk_bytes: int = DEFAULT_CHUNK_BYTES,
+                 scheduler: Optional[PolitenessScheduler] = None):
+        """
+        Configure the fetcher; sessions are opened per fetch_all()/iter_pages() call.
+
+        Args:
+            concurrency (int): Requests in flight at most
+            per_host (int): Requests in flight to one host at most
+            connect_timeout (float): Seconds to establish a connection
+            read_timeout (float): Seconds between two reads of the body
+            total_timeout (float): Seconds for the whole request, redirects included
+            headers (mapping, optional): Headers sent with every request
+            http_cache (HttpCache, optional): Cache for conditional requests
+            max_bytes (int, optional): Body bytes read at most; None for no cap
+            chunk_bytes (int): Bytes read at once
+            scheduler (PolitenessScheduler, optional): Per-IP rate limits;
+                a request waits for its IP's token, others go ahead
+        """
+        if aiohttp is None:
+            raise ImportError("AsyncFetcher requires aiohttp: pip install aiohttp")
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.total_timeout = total_timeout
+        self.headers = dict(headers or {})
+        self.http_cache = http_cache
+        self.max_bytes = max_bytes
+        self.chunk_bytes = chunk_bytes
+        self.scheduler = scheduler
+
+    def _session(self) -> 'aiohttp.ClientSession':
+        """Session whose connector pools keep-alive connections within the limits."""
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.per_host,
+                                         ttl_dns_cache=300)
+        timeout = aiohttp.ClientTimeout(total=self.total_timeout, sock_connect=self.connect_timeout,
+                                        sock_read=self.read_timeout)
+        return aiohttp.ClientSession(connector=connector, timeout=timeout, headers=self.headers)
+
+    async def fetch(self, session: 'aiohttp.ClientSession', url: str,
+                    slots: Optional[asyncio.Semaphore] = None) -> Page:
+        """
+        Fetch one page, conditionally if it is in the HTTP cache.
+
+        Args:
+            session (aiohttp.ClientSession): Session from _session()
+            url (str): Page URL
+            slots (asyncio.Semaphore, optional): Held while a request is in
+                flight; with at most `concurrency` slots, requests queue
+                here rather than in the connector, where the wait would
+                count against the total timeout; unlimited if not given
+
+        Returns:
+            Tuple of the HTML (None on any error, error status or non-HTML
+            content type) and the response signals
+        """
+        conditional = {}
+        if self.http_cache is not None:
+            cached, conditional = self.http_cache.lookup(url)
+            if cached is not None:
+                return cached
+        if slots is None:
+            slots = asyncio.Semaphore(1)
+        try:
+            page = await self._get(session, url, conditional, slots)
+            if page is None:
+                # The entry was evicted meanwhile; fetch the page in full
+                page = await self._get(session, url, {}, slots)
+            if page[0] is not None and not page[1]["not_modified"] and self.http_cache is not None:
+                self.http_cache.store(url, *page)
+            return page
+        except (aiohttp.ClientError, asyncio.TimeoutError, LookupError, ValueError) as e:
+            logging.error(f"Error fetching {url}: {e or type(e).__name__}")
+            return None, {}
+
+    async def _get(self, session: 'aiohttp.ClientSession', url: str, conditional: Dict[str, str],
+                   slots: asyncio.Semaphore) -> Optional[Page]:
+        """
+        One GET of a page, after its IP's token and a free slot.
+
+        Returns:
+            The page; the cached page on a 304; None on a 304 whose cache
+            entry is gone
+        """
+        if self.scheduler is not None:
+            await self.scheduler.acquire_async(url)
+        async with slots:
+            async with session.get(url, headers=conditional) as response:
+                if response.status == 304 and conditional:
+                    return self.http_cache.not_modified(url, dict(response.headers))
+                response.raise_for_status()
+                content_type = response.headers.get('Content-Type')
+                if not is_html(content_type):
+                    logging.warning(f"Skipping {url}: not HTML ({content_type})")
+                    return None, {}
+
+                reader = BodyReader(self.max_bytes)
+                async for chunk in response.content.iter_chunked(self.chunk_bytes):
+                    if not reader.feed(chunk):
+                        logging.warning(f"Truncated {url} at {self.max_bytes} bytes")
+                        break
+                return decode_html(reader.body, content_type, reader.truncated), {
+                    "headers": dict(response.headers),
+                    "cookies": list(response.cookies.keys()),
+                    "not_modified": False,
+                    "bytes": reader.size,
+                    "truncated": reader.truncated
+                }
+
+    async def _fetch_each(self, urls: Sequence[str], emit: Callable[[int, Optional[str], Dict], None]) -> None:
+        """Fetch every URL and call emit(index, html, response) as each completes."""
+        slots = asyncio.Semaphore(self.concurrency)
+        async with self._session() as session:
+            async def fetch_one(index: int, url: str) -> None:
+                try:
+                    page = await self.fetch(session, url, slots)
+                except Exception as e:
+                    # Whatever fetch() does not handle fails this URL only
+                    logging.error(f"Error fetching {url}: {e or type(e).__name__}")
+                    page = (None, {})
+                emit(index, *page)
+
+            await asyncio.gather(*(fetch_one(index, url) for index, url in enumerate(urls)))
+
+    def fetch_all(self, urls: Sequence[str]) -> List[Page]:
+        """
+        Fetch many pages concurrently.
+
+        Args:
+            urls (sequence): Page URLs
+
+        Returns:
+            list: (HTML or None, response) for every URL, in input order
+        """
+        pages: List[Page] = [(None, {}) for _ in urls]
+
+        def emit(index: int, html: Optional[str], response: Dict) -> None:
+            pages[index] = (html, response)
+
+        asyncio.run(self._fetch_each(urls, emit))
+        return pages
+
+    def iter_pages(self, urls: Sequence[str]) -> Iterator[Tuple[int, Optional[str], Dict]]:
+        """
+        Fetch many pages concurrently and yield each as soon as it arrives.
+
+        The event loop runs in a background thread, so the caller can
+        process one page while the others are still downloading.
+
+        Args:
+            urls (sequence): Page URLs
+
+        Yields:
+            (index into urls, HTML or None, response), in completion order
+        """
+        arrived: queue.Queue = queue.Queue()
+        finished = object()
+
+        def run() -> None:
+            try:
+                asyncio.run(self._fetch_each(urls, lambda *page: arrived.put(page)))
+            except Exception as e:
+                logging.error(f"Error in fetch loop: {e}")
+            finally:
+                arrived.put(finished)
+
+        thread = threading.Thread(target=run, name='async-fetcher', daemon=True)
+        thread.start()
+        while True:
+            page = arrived.get()
+            if page is finished:
+                break
+            yield page
+        thread.join()
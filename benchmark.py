@@ -0,0 +1,522 @@
+#!/usr/bin/env python3
+# benchmark.py
+"""
+Benchmarks for the portfolio analysis pipeline.
+
+Pages are read from a directory of saved .html files (--pages), fetched
+live from the domains list (--fetch N) or, if neither is given, generated
+synthetically so the script always has something to measure.
+
+Usage:
+    python benchmark.py --pages saved_pages/ analyzer
+    python benchmark.py --fetch 20 analyzer
+"""
+import argparse
+import glob
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Callable, List, Optional
+
+
+def _synthetic_page(index: int) -> str:
+    """Generate a mid-sized HTML page resembling a small business homepage."""
+    paragraph = (
+        "We build software solutions and digital products for our clients. "
+        "Our team works on web development, cloud services and data projects. "
+        "Read the latest news on our blog or browse the portfolio of our work. "
+    )
+    return (
+        "<html><head><title>Example site {0}</title>"
+        "<meta name=\"description\" content=\"Example company {0}\">"
+        "<link rel=\"stylesheet\" href=\"/static/bootstrap.min.css\">"
+        "<script src=\"/static/jquery.min.js\"></script></head>"
+        "<body><nav><a href=\"/\">Home</a><a href=\"/blog\">Blog</a></nav>"
+        "<main><h1>Example {0}</h1>{1}</main>"
+        "<footer>Copyright {0}</footer></body></html>"
+    ).format(index, "<p>" + paragraph * 20 + "</p>")
+
+
+def load_pages(pages_dir: Optional[str] = None, fetch: int = 0, synthetic: int = 20) -> List[str]:
+    """
+    Load HTML pages to benchmark against.
+
+    Args:
+        pages_dir (str, optional): Directory with saved .html/.htm files
+        fetch (int): Number of domains to fetch live from the domains list
+        synthetic (int): Number of synthetic pages used as a fallback
+
+    Returns:
+        List of HTML documents
+    """
+    pages = []
+
+    if pages_dir:
+        for path in sorted(glob.glob(os.path.join(pages_dir, '*.htm*'))):
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                pages.append(f.read())
+
+    if fetch:
+        from portfolio_generator import get_domain_content, load_domain_urls
+        for url_info in load_domain_urls()[:fetch]:
+            html_content = get_domain_content(url_info['url'])
+            if html_content:
+                pages.append(html_content)
+
+    if not pages:
+        pages = [_synthetic_page(i) for i in range(synthetic)]
+
+    return pages
+
+
+def time_per_call(fn: Callable, items: List, repeat: int = 1) -> List[float]:
+    """
+    Time fn(item) for every item.
+
+    Args:
+        fn (callable): Function to time
+        items (list): Arguments, one call per item
+        repeat (int): Number of passes over items
+
+    Returns:
+        List of per-call durations in seconds
+    """
+    durations = []
+    for _ in range(repeat):
+        for item in items:
+            start = time.perf_counter()
+            fn(item)
+            durations.append(time.perf_counter() - start)
+    return durations
+
+
+def report(name: str, durations: List[float]) -> None:
+    """Print a one-line summary of per-call durations."""
+    if not durations:
+        print(f"{name:<32} no samples")
+        return
+    mean_ms = statistics.mean(durations) * 1000
+    median_ms = statistics.median(durations) * 1000
+    print(f"{name:<32} n={len(durations):<5} mean={mean_ms:9.2f} ms  median={median_ms:9.2f} ms")
+
+
+def bench_analyzer(pages: List[str], args) -> None:
+    """Compare a fresh analyzer per domain (cold) with the shared analyzer (warm)."""
+    from AdvancedContentAnalyzer import AdvancedContentAnalyzer, clear_analyzers, get_analyzer, warmup
+
+    cold_pages = pages[:args.cold_limit]
+    report("cold (analyzer per domain)",
+           time_per_call(lambda html: AdvancedContentAnalyzer().analyze(html), cold_pages))
+
+    clear_analyzers()
+    start = time.perf_counter()
+    warmup()
+    print(f"{'shared analyzer warmup':<32} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+    report("warm (shared analyzer)",
+           time_per_call(lambda html: get_analyzer().analyze(html), pages, repeat=args.repeat))
+
+
+def bench_batch(pages: List[str], args) -> None:
+    """
+    Compare page-by-page analysis with analyze_many() over the whole list.
+
+    With --portfolio the analyzer has the generator's options, budgets
+    included, and the pages that ran out of wall time are counted.
+    """
+    from AdvancedContentAnalyzer import AdvancedContentAnalyzer, warmup
+
+    if args.portfolio:
+        from portfolio_generator import analyzer_options
+        analyzer = AdvancedContentAnalyzer(**analyzer_options()).warmup()
+    else:
+        analyzer = warmup()
+
+    def late(results):
+        return sum('wall_time' in result["budgets_exceeded"] for result in results)
+
+    start = time.perf_counter()
+    results = [analyzer.analyze(html) for html in pages]
+    single = time.perf_counter() - start
+    print(f"{'analyze() per page':<32} {len(pages) / single:9.1f} pages/s  ({late(results)} out of time)")
+
+    for n_process in sorted(set([1, args.n_process])):
+        start = time.perf_counter()
+        results = analyzer.analyze_many(pages, batch_size=args.batch_size, n_process=n_process)
+        elapsed = time.perf_counter() - start
+        print(f"{'analyze_many() n_process=' + str(n_process):<32} {len(pages) / elapsed:9.1f} pages/s"
+              f"  ({late(results)} out of time)")
+
+
+def bench_stages(pages: List[str], args) -> None:
+    """Compare separate theme/keyword parses with one shared Doc per page."""
+    from AdvancedContentAnalyzer import warmup
+
+    analyzer = warmup()
+    texts = [analyzer._extract_text(html) for html in pages]
+
+    def two_pass(text):
+        analyzer.detect_theme(text)
+        analyzer.extract_keywords(text)
+
+    def one_pass(text):
+        text, doc = analyzer.preprocess(text)
+        analyzer.detect_theme(text, doc=doc)
+        analyzer.extract_keywords(text, doc=doc)
+
+    report("theme + keywords, two parses", time_per_call(two_pass, texts, repeat=args.repeat))
+    report("theme + keywords, shared Doc", time_per_call(one_pass, texts, repeat=args.repeat))
+
+    analyzer.timings.reset()
+    time_per_call(analyzer.analyze, pages, repeat=args.repeat)
+    for stage, stats in analyzer.timings.summary().items():
+        print(f"  {stage:<30} {stats['mean_ms']:9.2f} ms/call")
+
+
+def bench_technologies(pages: List[str], args) -> None:
+    """Compare the per-pattern substring loop with the compiled TechMatcher."""
+    import tempfile
+    from tech_matcher import TechMatcher, detect_technologies_loop
+    from tech_registry import load_matcher, load_patterns
+
+    tech_patterns = load_patterns(args.patterns)
+
+    start = time.perf_counter()
+    matcher = TechMatcher(tech_patterns, word_boundary_max_len=0)
+    print(f"{'compile (' + matcher.engine + ')':<32} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        load_matcher(args.patterns, cache_dir=cache_dir)
+        start = time.perf_counter()
+        load_matcher(args.patterns, cache_dir=cache_dir)
+        print(f"{'load compiled artifact':<32} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+    report("substring loop", time_per_call(lambda html: detect_technologies_loop(tech_patterns, html),
+                                            pages, repeat=args.repeat))
+    report("TechMatcher", time_per_call(matcher.match, pages, repeat=args.repeat))
+
+    # Without word boundaries both must agree exactly; with them, report what changes
+    bounded = TechMatcher(tech_patterns)
+    mismatches = sum(detect_technologies_loop(tech_patterns, html) != matcher.match(html) for html in pages)
+    dropped = sum(len(set(matcher.match(html)) - set(bounded.match(html))) for html in pages)
+    print(f"pages differing from loop: {mismatches}; detections removed by word boundaries: {dropped}")
+
+
+def bench_signals(pages: List[str], args) -> None:
+    """Compare the whole-page substring scan with DOM-signal technology detection."""
+    from collections import Counter
+    from tech_registry import load_patterns, load_signal_patterns
+    from tech_matcher import TechMatcher
+    from tech_signals import SignalTechDetector, collect_signals
+
+    tech_patterns = load_patterns(args.patterns)
+    substring = TechMatcher(tech_patterns)
+    signals = SignalTechDetector(tech_patterns, load_signal_patterns(args.signals))
+
+    report("substring scan", time_per_call(substring.match, pages, repeat=args.repeat))
+    report("signals", time_per_call(signals.match, pages, repeat=args.repeat))
+
+    page_chars = sum(len(html) for html in pages)
+    signal_chars = sum(len(text) for html in pages for text in collect_signals(html).values())
+    print(f"characters matched: {signal_chars} of {page_chars} ({signal_chars / max(page_chars, 1):.0%})")
+
+    # Detections only the substring scan makes are mostly mentions in body text
+    only_substring, only_signals = Counter(), Counter()
+    for html in pages:
+        by_substring, by_signals = set(substring.match(html)), set(signals.match(html))
+        only_substring.update(by_substring - by_signals)
+        only_signals.update(by_signals - by_substring)
+    print(f"detections only by substring scan: {sum(only_substring.values())}, "
+          f"only by signals: {sum(only_signals.values())}")
+    for tech, count in only_substring.most_common(10):
+        print(f"  substring only: {tech:<24} {count} pages")
+
+
+def bench_extract(pages: List[str], args) -> None:
+    """Compare HTML-to-text engines by time, peak memory and output size."""
+    import tracemalloc
+    from text_extraction import EXTRACTORS
+
+    for name, extractor_class in EXTRACTORS.items():
+        try:
+            extractor = extractor_class()
+        except ImportError as e:
+            print(f"{name:<32} skipped ({e})")
+            continue
+
+        report(name, time_per_call(extractor.extract, pages, repeat=args.repeat))
+
+        peaks = []
+        chars = 0
+        for html in pages:
+            tracemalloc.start()
+            chars += len(extractor.extract(html))
+            peaks.append(tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+        print(f"  peak memory max={max(peaks) / 1024:9.1f} KiB  text chars={chars}")
+
+
+def bench_boilerplate(pages: List[str], args) -> None:
+    """Compare text size and analysis time with and without boilerplate stripping."""
+    from AdvancedContentAnalyzer import AdvancedContentAnalyzer
+
+    for strip in (False, True):
+        analyzer = AdvancedContentAnalyzer(strip_boilerplate=strip, max_text_chars=args.max_chars)
+        analyzer.warmup()
+        chars = sum(len(analyzer._extract_text(html)) for html in pages)
+        label = 'stripped' if strip else 'full text'
+        report(f"{label} ({chars // max(len(pages), 1)} chars/page)",
+               time_per_call(analyzer.analyze, pages, repeat=args.repeat))
+
+
+def bench_profiles(pages: List[str], args) -> None:
+    """Per-page latency of each analysis profile."""
+    from AdvancedContentAnalyzer import PROFILES, AdvancedContentAnalyzer
+
+    for profile in PROFILES:
+        start = time.perf_counter()
+        analyzer = AdvancedContentAnalyzer(profile=profile).warmup()
+        print(f"{'load ' + profile:<32} {(time.perf_counter() - start) * 1000:9.2f} ms")
+        report(f"analyze ({profile})", time_per_call(analyzer.analyze, pages, repeat=args.repeat))
+
+
+def _theme_agreement(name: str, ranked: List, vector_ranked: List) -> None:
+    """Print how often a text-based theme engine agrees with the vector path."""
+    from collections import Counter
+
+    # Agreement on pages the engine has an opinion about
+    scored = [(own, vectors) for own, vectors in zip(ranked, vector_ranked) if own]
+    print(f"{name}: pages without a theme: {len(ranked) - len(scored)} of {len(ranked)}")
+    if not scored:
+        return
+    top1 = sum(own[0][0] == vectors[0][0] for own, vectors in scored)
+    top2 = sum(own[0][0] in (theme for theme, _ in vectors[:2]) for own, vectors in scored)
+    print(f"  top-1 agreement: {top1 / len(scored):.0%}  theme in vector top-2: {top2 / len(scored):.0%}")
+    disagreements = Counter((own[0][0], vectors[0][0]) for own, vectors in scored if own[0][0] != vectors[0][0])
+    for (own_theme, vector_theme), count in disagreements.most_common(5):
+        print(f"  {name}={own_theme:<16} vectors={vector_theme:<16} {count} pages")
+
+
+def _time_batch(name: str, rank: Callable, texts: List[str], repeat: int) -> List:
+    """Time one batch call of a theme engine and return its rankings."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        ranked = rank(texts)
+    elapsed = time.perf_counter() - start
+    print(f"{name:<32} {len(texts) * repeat / elapsed:9.1f} pages/s")
+    return ranked
+
+
+def bench_themes(pages: List[str], args) -> None:
+    """Compare text-based theme engines with the SpaCy vector path and report agreement."""
+    import numpy as np
+    from AdvancedContentAnalyzer import AdvancedContentAnalyzer
+    from theme_model import HashedThemeModel
+
+    # Analyzer without a trained model, so the vector path is available
+    analyzer = AdvancedContentAnalyzer().warmup()
+    texts = [analyzer._normalize_text(analyzer._extract_text(html)) for html in pages]
+
+    engines = {"keywords": analyzer.term_classifier.rank}
+    if args.theme_model:
+        theme_model = HashedThemeModel.load(args.theme_model)
+        if theme_model is None:
+            print(f"No theme model in {args.theme_model}")
+        else:
+            engines["model"] = theme_model.rank
+
+    results = {}
+    for name, rank in engines.items():
+        report(f"{name}, per page", time_per_call(lambda text: rank([text]), texts, repeat=args.repeat))
+        results[name] = _time_batch(f"{name}, one batch", rank, texts, args.repeat)
+
+    if not analyzer.uses_vectors:
+        print("SpaCy pipeline has no vectors; no agreement report")
+        return
+
+    docs = list(analyzer.nlp.pipe(texts))
+    vector_ranked = _time_batch("vectors, one batch (no parsing)",
+                                lambda texts: [analyzer._rank_scores(row) for row in
+                                               analyzer.score_themes(np.vstack([doc.vector for doc in docs]))],
+                                texts, 1)
+    for name, ranked in results.items():
+        _theme_agreement(name, ranked, vector_ranked)
+
+
+def bench_related(pages: List[str], args) -> None:
+    """Related-site index on random vectors: full build, incremental insert, naive loop."""
+    import numpy as np
+    from similarity_index import SimilarityIndex
+
+    generator = np.random.default_rng(0)
+    vectors = generator.standard_normal((args.sites + args.new, args.dim)).astype(np.float32)
+    domains = [f"site{i}.example" for i in range(len(vectors))]
+
+    index = SimilarityIndex()
+    start = time.perf_counter()
+    index.add(domains[:args.sites], vectors[:args.sites])
+    related = index.query(domains[:args.sites], args.k)
+    print(f"{'full index, ' + str(args.sites) + ' sites':<32} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+    start = time.perf_counter()
+    index.add(domains[args.sites:], vectors[args.sites:])
+    index.update_related(related, domains[args.sites:], args.k)
+    print(f"{'insert ' + str(args.new) + ' sites':<32} {(time.perf_counter() - start) * 1000:9.2f} ms")
+
+    # Pairwise Python loop on a sample, extrapolated to all sites
+    sample = min(args.sites, 200)
+    start = time.perf_counter()
+    for i in range(sample):
+        scores = [float(np.dot(vectors[i], vectors[j]) /
+                        (np.linalg.norm(vectors[i]) * np.linalg.norm(vectors[j])))
+                  for j in range(sample) if j != i]
+        sorted(scores, reverse=True)[:args.k]
+    elapsed = (time.perf_counter() - start) * (args.sites / sample) ** 2
+    print(f"{'pairwise loop (extrapolated)':<32} {elapsed * 1000:9.2f} ms")
+
+
+def _serve_pages(pages: List[str], delay: float):
+    """
+    Serve pages from a local keep-alive HTTP server at /0, /1, ...
+
+    Args:
+        pages (list): HTML pages; paths past the end wrap around
+        delay (float): Seconds every response is held back, as a stand-in for network latency
+
+    Returns:
+        Tuple of the running server and its base URL
+    """
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    bodies = [page.encode('utf-8') for page in pages]
+
+    class PageHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            time.sleep(delay)
+            try:
+                body = bodies[int(self.path.strip('/')) % len(bodies)]
+            except ValueError:
+                body = bodies[0]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), PageHandler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def bench_fetch(pages: List[str], args) -> None:
+    """Pages per second of blocking requests vs the async fetcher at several concurrency levels."""
+    import requests
+    from async_fetcher import AsyncFetcher, aiohttp
+
+    server, base_url = _serve_pages(pages, args.delay)
+    urls = [f"{base_url}/{i}" for i in range(args.requests)]
+    try:
+        sample = urls[:min(len(urls), 50)]
+        start = time.perf_counter()
+        for url in sample:
+            requests.get(url, timeout=10)
+        print(f"{'requests.get, sequential':<32} {len(sample) / (time.perf_counter() - start):9.1f} pages/s")
+
+        if aiohttp is None:
+            print("aiohttp is not installed; no async measurements")
+            return
+
+        for concurrency in args.concurrency:
+            # Every request goes to the one local host, so the per-host limit is the global one
+            fetcher = AsyncFetcher(concurrency=concurrency, per_host=concurrency)
+            start = time.perf_counter()
+            fetched = fetcher.fetch_all(urls)
+            elapsed = time.perf_counter() - start
+            failed = sum(1 for html, _ in fetched if html is None)
+            print(f"{'async, concurrency=' + str(concurrency):<32} {len(urls) / elapsed:9.1f} pages/s"
+                  f"  ({failed} failed)")
+    finally:
+        server.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks for the portfolio analysis pipeline')
+    parser.add_argument('--pages', help='Directory with saved .html pages')
+    parser.add_argument('--fetch', type=int, default=0, help='Fetch N domains live from the domains list')
+    parser.add_argument('--synthetic', type=int, default=20, help='Number of synthetic pages if no others are loaded')
+    parser.add_argument('--repeat', type=int, default=1, help='Passes over the pages for warm measurements')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    analyzer_parser = subparsers.add_parser('analyzer', help='Cold vs warm per-domain analysis time')
+    analyzer_parser.add_argument('--cold-limit', type=int, default=5,
+                                 help='Number of pages analyzed with a fresh analyzer each')
+    analyzer_parser.set_defaults(func=bench_analyzer)
+
+    batch_parser = subparsers.add_parser('batch', help='Per-page analyze() vs batched analyze_many()')
+    batch_parser.add_argument('--batch-size', type=int, default=32, help='SpaCy nlp.pipe batch size')
+    batch_parser.add_argument('--n-process', type=int, default=1, help='SpaCy worker processes')
+    batch_parser.add_argument('--portfolio', action='store_true',
+                              help="Use the generator's analyzer options, budgets included")
+    batch_parser.set_defaults(func=bench_batch)
+
+    stages_parser = subparsers.add_parser('stages', help='Per-stage analysis time, one vs two SpaCy parses')
+    stages_parser.set_defaults(func=bench_stages)
+
+    technologies_parser = subparsers.add_parser('technologies', help='Substring loop vs compiled TechMatcher')
+    technologies_parser.add_argument('--patterns', default='tech_patterns.json', help='Technology patterns JSON')
+    technologies_parser.set_defaults(func=bench_technologies)
+
+    signals_parser = subparsers.add_parser('signals', help='Substring scan vs DOM-signal technology detection')
+    signals_parser.add_argument('--patterns', default='tech_patterns.json', help='Technology patterns JSON')
+    signals_parser.add_argument('--signals', default='tech_signals.json', help='Scoped header/cookie patterns JSON')
+    signals_parser.set_defaults(func=bench_signals)
+
+    extract_parser = subparsers.add_parser('extract', help='HTML-to-text engines: time, peak memory, text size')
+    extract_parser.set_defaults(func=bench_extract)
+
+    boilerplate_parser = subparsers.add_parser('boilerplate', help='Analysis with and without boilerplate stripping')
+    boilerplate_parser.add_argument('--max-chars', type=int, default=None, help='Character budget for SpaCy')
+    boilerplate_parser.set_defaults(func=bench_boilerplate)
+
+    profiles_parser = subparsers.add_parser('profiles', help='Per-page latency of the fast/standard/deep profiles')
+    profiles_parser.set_defaults(func=bench_profiles)
+
+    themes_parser = subparsers.add_parser('themes', help='Keyword, trained-model and vector theme scoring, '
+                                                         'with agreement')
+    themes_parser.add_argument('--theme-model', help='Trained theme model (.npz) to include')
+    themes_parser.set_defaults(func=bench_themes)
+
+    related_parser = subparsers.add_parser('related', help='Related-site similarity index on random vectors')
+    related_parser.add_argument('--sites', type=int, default=20000, help='Sites in the index')
+    related_parser.add_argument('--new', type=int, default=100, help='Sites inserted incrementally')
+    related_parser.add_argument('--dim', type=int, default=96, help='Vector dimensions')
+    related_parser.add_argument('-k', type=int, default=5, help='Related sites per site')
+    related_parser.set_defaults(func=bench_related)
+
+    fetch_parser = subparsers.add_parser('fetch', help='Blocking vs async fetching from a local HTTP server')
+    fetch_parser.add_argument('--requests', type=int, default=200, help='Pages fetched per measurement')
+    fetch_parser.add_argument('--delay', type=float, default=0.05, help='Simulated latency per response (s)')
+    fetch_parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 4, 16, 64],
+                              help='Concurrency levels of the async fetcher')
+    fetch_parser.set_defaults(func=bench_fetch)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    pages = load_pages(args.pages, args.fetch, args.synthetic)
+    print(f"Benchmarking on {len(pages)} pages")
+    args.func(pages, args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
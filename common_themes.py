@@ -1,4 +1,10 @@
 # Simple theme identification based on keyword frequency
+import re
+import numpy as np
+import scipy.sparse as sp
+from typing import Dict, List, Sequence, Tuple
+from sklearn.feature_extraction.text import CountVectorizer
+
 common_themes = {
     "ecommerce": ["shop", "cart", "product", "buy", "price", "store", "shipping"],
     "blog": ["blog", "post", "article", "author", "comment", "read"],
@@ -18,4 +24,85 @@ common_themes = {
     "entertainment": ["entertainment", "movie", "music", "game", "show", "event"],
     "sports": ["sport", "team", "player", "game", "match", "league"],
     "art": ["art", "artist", "gallery", "exhibition", "creative", "design"]
-}
\ No newline at end of file
+}
+
+
+_TOKEN_PATTERN = r'(?u)\b\w+\b'
+
+
+def _normalize_term(term: str) -> str:
+    """Lowercase a theme keyword and join its words the way CountVectorizer does."""
+    return ' '.join(re.findall(r'\w+', term.lower()))
+
+
+class KeywordThemeClassifier:
+    """
+    Theme scoring by keyword frequency, without word vectors.
+
+    The theme dictionaries are compiled into a sparse (themes x terms)
+    matrix; a batch of documents is counted against the theme vocabulary
+    and scored with one sparse matrix product. A theme's score is the
+    number of occurrences of its keywords in the document.
+    """
+
+    def __init__(self, themes: Dict[str, List[str]] = common_themes):
+        """
+        Compile theme dictionaries.
+
+        Args:
+            themes (dict): Theme names to lists of keywords (single words or phrases)
+        """
+        self.theme_names = list(themes)
+        terms = sorted({_normalize_term(keyword) for keywords in themes.values()
+                        for keyword in keywords} - {''})
+        self.terms = terms
+
+        self._vectorizer = None
+        if terms:
+            max_words = max(len(term.split()) for term in terms)
+            self._vectorizer = CountVectorizer(vocabulary=terms, ngram_range=(1, max_words),
+                                               token_pattern=_TOKEN_PATTERN)
+
+        term_index = {term: j for j, term in enumerate(terms)}
+        rows, columns = [], []
+        for i, keywords in enumerate(themes.values()):
+            for term in {_normalize_term(keyword) for keyword in keywords} - {''}:
+                rows.append(i)
+                columns.append(term_index[term])
+        self.theme_terms = sp.csr_matrix((np.ones(len(rows), dtype=np.float32), (rows, columns)),
+                                         shape=(len(self.theme_names), len(terms)))
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Keyword counts of every theme in every document.
+
+        Args:
+            texts (sequence): Document texts
+
+        Returns:
+            np.ndarray: (documents x themes) float32 score matrix
+        """
+        if self._vectorizer is None or not len(texts):
+            return np.zeros((len(texts), len(self.theme_names)), dtype=np.float32)
+        counts = self._vectorizer.transform(texts).astype(np.float32)
+        return (counts @ self.theme_terms.T).toarray()
+
+    def rank(self, texts: Sequence[str]) -> List[List[Tuple[str, float]]]:
+        """
+        Rank themes for a batch of documents.
+
+        Args:
+            texts (sequence): Document texts
+
+        Returns:
+            For every text, (theme, score) pairs best first; empty if no
+            theme keyword occurs at all
+        """
+        ranked = []
+        for row in self.score(texts):
+            if not row.any():
+                ranked.append([])
+                continue
+            order = np.argsort(-row, kind='stable')
+            ranked.append([(self.theme_names[j], float(row[j])) for j in order])
+        return ranked
@@ -0,0 +1,217 @@
+#!/bin/python
+# html_archive.py
+"""
+Compressed, content-addressed archive of fetched HTML.
+
+Every fetched body is stored once under the SHA-256 of its text (the same
+key as the analysis cache), compressed with zstd when the `zstandard`
+package is installed and gzip otherwise, in objects/<2 hex>/<hash>.html.zst
+(or .gz). A SQLite index records which body every domain served on every
+date, with the response headers and cookie names technology detection
+needs, so any day's pages can be analyzed again offline and identically.
+"""
+import os
+import gzip
+import json
+import sqlite3
+import logging
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from analysis_cache import content_hash
+
+try:
+    import zstandard
+except ImportError:  # optional: gzip is used instead
+    zstandard = None
+
+DEFAULT_ZSTD_LEVEL = 10
+DEFAULT_GZIP_LEVEL = 6
+
+
+class HtmlArchive:
+    """
+    Deduplicated blob store of page bodies with a (domain, date) index.
+    """
+
+    def __init__(self, directory: str, compression: Optional[str] = None):
+        """
+        Open (or create) the archive.
+
+        Args:
+            directory (str): Archive directory
+            compression (str, optional): 'zstd' or 'gzip' for new blobs;
+                defaults to zstd if available. Blobs of either kind are read.
+        """
+        if compression is None:
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression not in ('zstd', 'gzip'):
+            raise ValueError(f"Unknown compression {compression!r}, expected 'zstd' or 'gzip'")
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError("zstd compression requires zstandard: pip install zstandard")
+
+        self.directory = directory
+        self.compression = compression
+        self.objects_dir = os.path.join(directory, 'objects')
+        os.makedirs(self.objects_dir, exist_ok=True)
+
+        # Bodies written and bodies already present in this session
+        self.stored = 0
+        self.deduplicated = 0
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(directory, 'index.sqlite'), check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            " domain TEXT NOT NULL,"
+            " date TEXT NOT NULL,"
+            " url TEXT NOT NULL,"
+            " content_hash TEXT NOT NULL,"
+            " response TEXT NOT NULL,"
+            " fetched REAL NOT NULL,"
+            " PRIMARY KEY (domain, date))"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS pages_date ON pages (date)")
+        self._conn.commit()
+
+    def _path(self, key: str, compression: str) -> str:
+        """Blob file of a content hash."""
+        extension = 'zst' if compression == 'zstd' else 'gz'
+        return os.path.join(self.objects_dir, key[:2], f"{key}.html.{extension}")
+
+    def _compress(self, data: bytes) -> bytes:
+        """Compress a blob with the archive's compression."""
+        if self.compression == 'zstd':
+            return zstandard.ZstdCompressor(level=DEFAULT_ZSTD_LEVEL).compress(data)
+        return gzip.compress(data, compresslevel=DEFAULT_GZIP_LEVEL, mtime=0)
+
+    def put_blob(self, html_content: str) -> str:
+        """
+        Store a body unless an identical one is archived already.
+
+        Args:
+            html_content (str): HTML content
+
+        Returns:
+            str: Content hash of the body
+        """
+        key = content_hash(html_content)
+        if any(os.path.exists(self._path(key, compression)) for compression in ('zstd', 'gzip')):
+            with self._lock:
+                self.deduplicated += 1
+            return key
+
+        path = self._path(key, self.compression)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(self._compress(html_content.encode('utf-8', errors='surrogatepass')))
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        with self._lock:
+            self.stored += 1
+        return key
+
+    def get_blob(self, key: str) -> Optional[str]:
+        """
+        Read an archived body.
+
+        Args:
+            key (str): Content hash
+
+        Returns:
+            str or None: HTML content, None if it is not archived or cannot
+            be read
+        """
+        for compression in ('zstd', 'gzip'):
+            path = self._path(key, compression)
+            if not os.path.exists(path):
+                continue
+            try:
+                with open(path, 'rb') as f:
+                    data = f.read()
+                if compression == 'zstd':
+                    if zstandard is None:
+                        logging.error(f"Cannot read {path}: zstandard is not installed")
+                        return None
+                    data = zstandard.ZstdDecompressor().decompress(data)
+                else:
+                    data = gzip.decompress(data)
+                return data.decode('utf-8', errors='surrogatepass')
+            except (OSError, EOFError, ValueError) as e:
+                logging.error(f"Error reading {path}: {e}")
+                return None
+        return None
+
+    def put(self, domain: str, url: str, html_content: str, response: Optional[Dict] = None,
+            date: Optional[str] = None) -> str:
+        """
+        Archive the page a domain served.
+
+        Args:
+            domain (str): Site domain
+            url (str): Fetched URL
+            html_content (str): HTML content
+            response (dict, optional): Response "headers" and "cookies"
+            date (str, optional): YYYY-MM-DD, defaults to today; a later
+                page of the same domain and date replaces the earlier one
+
+        Returns:
+            str: Content hash of the body
+        """
+        key = self.put_blob(html_content)
+        response = response or {}
+        signals = {"headers": response.get("headers", {}), "cookies": response.get("cookies", [])}
+        now = datetime.now()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?)",
+                (domain, date or now.strftime("%Y-%m-%d"), url, key, json.dumps(signals), now.timestamp())
+            )
+            self._conn.commit()
+        return key
+
+    def dates(self) -> List[str]:
+        """Dates with archived pages, oldest first."""
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT DISTINCT date FROM pages ORDER BY date")]
+
+    def snapshot(self, date: Optional[str] = None) -> List[Dict]:
+        """
+        The latest archived page of every domain as of a date.
+
+        Args:
+            date (str, optional): YYYY-MM-DD; defaults to the latest date
+
+        Returns:
+            List of {"domain", "url", "date", "content_hash", "response"}
+            entries, ordered by domain
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT domain, url, date, content_hash, response FROM pages AS p "
+                "WHERE date = (SELECT MAX(date) FROM pages WHERE domain = p.domain AND date <= ?) "
+                "ORDER BY domain",
+                (date or '9999-12-31',)
+            ).fetchall()
+        return [
+            {"domain": domain, "url": url, "date": page_date, "content_hash": key,
+             "response": json.loads(response)}
+            for domain, url, page_date, key, response in rows
+        ]
+
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            self._conn.close()
+
+    def log_stats(self, logger: Optional[logging.Logger] = None) -> None:
+        """Write the stored/deduplicated counters to the log."""
+        (logger or logging).info(
+            f"HTML archive: {self.stored} bodies stored, {self.deduplicated} already archived"
+        )
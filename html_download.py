@@ -0,0 +1,162 @@
+#!/bin/python
+# html_download.py
+"""
+Size-capped streaming of HTML bodies and single-pass decoding.
+
+Fetchers read the body in chunks and stop at `max_bytes`, so a misconfigured
+site serving a huge file costs at most that much memory; responses whose
+Content-Type is not HTML are dropped before the body is read. The bytes are
+decoded once, with the charset from a byte-order mark, the Content-Type
+header or a <meta> tag in the first kilobyte, in that order - no
+chardet-style guessing over the whole payload.
+"""
+import re
+import codecs
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_CHUNK_BYTES = 64 * 1024
+
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Bytes scanned for a <meta> charset, as in the HTML prescan
+META_SCAN_BYTES = 1024
+
+_BOMS = (
+    (codecs.BOM_UTF8, 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16-be'),
+)
+_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]*?charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+
+
+def is_html(content_type: Optional[str]) -> bool:
+    """
+    Whether a Content-Type header announces HTML.
+
+    Args:
+        content_type (str, optional): Content-Type header value
+
+    Returns:
+        bool: True for HTML types and for a missing header
+    """
+    if not content_type:
+        return True
+    return content_type.split(';', 1)[0].strip().lower() in HTML_CONTENT_TYPES
+
+
+def _codec(name: Optional[str]) -> Optional[str]:
+    """Python codec name of a charset label, None if unknown."""
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name.strip().lower()).name
+    except LookupError:
+        return None
+
+
+def detect_charset(body: bytes, content_type: Optional[str] = None) -> Tuple[str, bool]:
+    """
+    Charset of an HTML body.
+
+    Args:
+        body (bytes): Body, or its beginning
+        content_type (str, optional): Content-Type header value
+
+    Returns:
+        Tuple of the codec name and whether it was declared (False when
+        defaulting to UTF-8)
+    """
+    for bom, charset in _BOMS:
+        if body.startswith(bom):
+            return charset, True
+
+    match = _CHARSET_RE.search(content_type or '')
+    charset = _codec(match.group(1)) if match else None
+    if charset:
+        return charset, True
+
+    match = _META_CHARSET_RE.search(body[:META_SCAN_BYTES])
+    charset = _codec(match.group(1).decode('ascii', errors='ignore')) if match else None
+    # A <meta> tag read as ASCII cannot truthfully declare UTF-16
+    if charset and not charset.startswith('utf-16'):
+        return charset, True
+    return 'utf-8', False
+
+
+def decode_html(body: bytes, content_type: Optional[str] = None, truncated: bool = False) -> str:
+    """
+    Decode an HTML body in one pass.
+
+    Undeclared bodies that are not valid UTF-8 are read as windows-1252,
+    the web's legacy default. A truncated body may end mid-character; the
+    incomplete sequence is dropped instead of failing the decode.
+
+    Args:
+        body (bytes): Body
+        content_type (str, optional): Content-Type header value
+        truncated (bool): Whether the body was cut at the byte cap
+
+    Returns:
+        str: Decoded HTML
+    """
+    charset, declared = detect_charset(body, content_type)
+    if charset.startswith('utf-8') and body.startswith(codecs.BOM_UTF8):
+        charset = 'utf-8-sig'
+    try:
+        return codecs.getincrementaldecoder(charset)('strict').decode(body, final=not truncated)
+    except UnicodeDecodeError:
+        if not declared:
+            charset = 'cp1252'
+        return codecs.getincrementaldecoder(charset)('replace').decode(body, final=not truncated)
+
+
+class BodyReader:
+    """
+    Collects body chunks up to a byte cap.
+    """
+
+    def __init__(self, max_bytes: Optional[int] = DEFAULT_MAX_BYTES):
+        """
+        Start an empty body.
+
+        Args:
+            max_bytes (int, optional): Bytes kept at most; None for no cap
+        """
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.truncated = False
+        self._chunks: List[bytes] = []
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Add a chunk.
+
+        Args:
+            chunk (bytes): Next chunk of the body
+
+        Returns:
+            bool: False once the cap is reached and reading should stop
+        """
+        if self.max_bytes is not None and self.size + len(chunk) > self.max_bytes:
+            chunk = chunk[:self.max_bytes - self.size]
+            self._chunks.append(chunk)
+            self.size += len(chunk)
+            self.truncated = True
+            return False
+        self._chunks.append(chunk)
+        self.size += len(chunk)
+        return True
+
+    def read(self, chunks: Iterable[bytes]) -> 'BodyReader':
+        """Feed chunks until they run out or the cap is reached."""
+        for chunk in chunks:
+            if chunk and not self.feed(chunk):
+                break
+        return self
+
+    @property
+    def body(self) -> bytes:
+        """The bytes collected so far."""
+        return b''.join(self._chunks)
@@ -0,0 +1,284 @@
+#!/bin/python
+# http_cache.py
+"""
+Persistent HTTP cache for conditional re-fetches.
+
+Daily runs fetch the same homepages again and most of them have not changed.
+Every stored response keeps its body, headers, cookie names and validators
+(ETag, Last-Modified). While an entry is fresh by Cache-Control max-age (or
+Expires), the page is served without touching the network; once stale, the
+next request carries If-None-Match/If-Modified-Since and a 304 answer
+serves the stored body. Pages served from the cache are flagged
+"not_modified", so later stages can skip work for them.
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import logging
+import threading
+from email.utils import parsedate_to_datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+Page = Tuple[Optional[str], Dict]
+
+
+def header(headers: Mapping[str, str], name: str) -> Optional[str]:
+    """Value of a header, looked up case-insensitively."""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def cache_control(headers: Mapping[str, str]) -> Dict[str, str]:
+    """Cache-Control directives of a response, lowercased, to their values ('' if none)."""
+    directives = {}
+    for part in (header(headers, 'Cache-Control') or '').split(','):
+        name, _, value = part.strip().partition('=')
+        if name:
+            directives[name.strip().lower()] = value.strip().strip('"')
+    return directives
+
+
+def _http_date(value: Optional[str]) -> Optional[float]:
+    """Timestamp of an HTTP date header, None if missing or malformed."""
+    if not value:
+        return None
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+
+
+def freshness_lifetime(headers: Mapping[str, str]) -> float:
+    """
+    Seconds a response stays fresh after it was received.
+
+    Args:
+        headers (mapping): Response headers
+
+    Returns:
+        float: max-age less the Age header, else Expires less Date, else 0
+        (revalidate every time); 0 for no-cache
+    """
+    directives = cache_control(headers)
+    if 'no-cache' in directives:
+        return 0.0
+    if 'max-age' in directives:
+        try:
+            max_age = float(directives['max-age'])
+        except ValueError:
+            return 0.0
+        try:
+            age = float(header(headers, 'Age') or 0)
+        except ValueError:
+            age = 0.0
+        return max(0.0, max_age - age)
+
+    expires = _http_date(header(headers, 'Expires'))
+    if expires is None:
+        return 0.0
+    date = _http_date(header(headers, 'Date')) or time.time()
+    return max(0.0, expires - date)
+
+
+class HttpCache:
+    """
+    SQLite-backed store of fetched pages and their validators.
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_entries: int = 10000,
+                 max_age_days: float = 30):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path (str): SQLite database file
+            max_entries (int): Entries kept after eviction
+            max_age_days (float): Entries not used for longer are evicted
+        """
+        self.path = path
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+
+        # Pages served fresh from the cache, revalidated by a 304, and downloaded
+        self.fresh = 0
+        self.revalidated = 0
+        self.downloaded = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            " url TEXT PRIMARY KEY,"
+            " body BLOB NOT NULL,"
+            " headers TEXT NOT NULL,"
+            " cookies TEXT NOT NULL,"
+            " etag TEXT,"
+            " last_modified TEXT,"
+            " expires REAL NOT NULL,"
+            " accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        self._conn.commit()
+
+    def _page(self, body: bytes, headers: str, cookies: str) -> Page:
+        """Cached page from its stored columns, flagged not modified."""
+        return zlib.decompress(body).decode('utf-8'), {
+            "headers": json.loads(headers),
+            "cookies": json.loads(cookies),
+            "not_modified": True,
+            "bytes": 0,
+            "truncated": False
+        }
+
+    def lookup(self, url: str) -> Tuple[Optional[Page], Dict[str, str]]:
+        """
+        Look up a page before requesting it.
+
+        Args:
+            url (str): Page URL
+
+        Returns:
+            Tuple of the cached page, if it is still fresh (the request can
+            be skipped), and the conditional request headers otherwise
+            (empty if the URL is not cached)
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, cookies, etag, last_modified, expires FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                return None, {}
+
+            body, headers, cookies, etag, last_modified, expires = row
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE url = ?", (now, url))
+            self._conn.commit()
+            if expires > now:
+                self.fresh += 1
+                return self._page(body, headers, cookies), {}
+
+        conditional = {}
+        if etag:
+            conditional['If-None-Match'] = etag
+        if last_modified:
+            conditional['If-Modified-Since'] = last_modified
+        return None, conditional
+
+    def not_modified(self, url: str, headers: Mapping[str, str]) -> Optional[Page]:
+        """
+        Serve the cached page after a 304 answer to a conditional request.
+
+        Headers sent with the 304 (new validators, Cache-Control, Date)
+        replace the stored ones and restart the freshness lifetime.
+
+        Args:
+            url (str): Page URL
+            headers (mapping): Headers of the 304 response
+
+        Returns:
+            tuple or None: Cached page, None if the entry is gone
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, headers, cookies FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            body, stored, cookies = row
+            # Header names differ in case between requests and aiohttp; keep the stored spelling
+            merged = json.loads(stored)
+            names = {name.lower(): name for name in merged}
+            for name, value in headers.items():
+                merged[names.get(name.lower(), name)] = value
+
+            self._conn.execute(
+                "UPDATE responses SET headers = ?, etag = ?, last_modified = ?, expires = ?, accessed = ? "
+                "WHERE url = ?",
+                (json.dumps(merged), header(merged, 'ETag'), header(merged, 'Last-Modified'),
+                 now + freshness_lifetime(merged), now, url)
+            )
+            self._conn.commit()
+            self.revalidated += 1
+        return self._page(body, json.dumps(merged), cookies)
+
+    def store(self, url: str, html_content: str, response: Dict) -> None:
+        """
+        Store a downloaded page.
+
+        Responses marked no-store, and responses that neither stay fresh
+        nor carry a validator, are not stored: they could never be reused.
+        Nor are bodies truncated at the download cap.
+
+        Args:
+            url (str): Page URL
+            html_content (str): HTML content
+            response (dict): Response "headers", "cookies" and "truncated" flag
+        """
+        headers = response.get("headers", {})
+        now = time.time()
+        with self._lock:
+            self.downloaded += 1
+            lifetime = freshness_lifetime(headers)
+            etag, last_modified = header(headers, 'ETag'), header(headers, 'Last-Modified')
+            if (response.get("truncated") or 'no-store' in cache_control(headers)
+                    or not (lifetime or etag or last_modified)):
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (url, zlib.compress(html_content.encode('utf-8', errors='replace')), json.dumps(headers),
+                     json.dumps(response.get("cookies", [])), etag, last_modified, now + lifetime, now)
+                )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """
+        Drop entries that are too old or beyond max_entries (least recently used first).
+
+        Returns:
+            int: Number of evicted entries
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self._lock:
+            removed = self._conn.execute("DELETE FROM responses WHERE accessed < ?", (cutoff,)).rowcount
+            removed += self._conn.execute(
+                "DELETE FROM responses WHERE rowid NOT IN "
+                "(SELECT rowid FROM responses ORDER BY accessed DESC LIMIT ?)",
+                (self.max_entries,)
+            ).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        """Fresh/revalidated/downloaded counters for this session and the current number of entries."""
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+        return {"fresh": self.fresh, "revalidated": self.revalidated,
+                "downloaded": self.downloaded, "entries": entries}
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def log_stats(self, logger: Optional[logging.Logger] = None) -> None:
+        """Write the counters to the log."""
+        stats = self.stats()
+        (logger or logging).info(
+            f"HTTP cache: {stats['fresh']} fresh, {stats['revalidated']} not modified (304), "
+            f"{stats['downloaded']} downloaded, {stats['entries']} entries"
+        )
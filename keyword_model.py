@@ -0,0 +1,191 @@
+#!/bin/python
+# keyword_model.py
+"""
+Corpus-level TF-IDF keyword model.
+
+Document frequencies are collected across all portfolio pages instead of
+fitting a vectorizer on a single page (where IDF is constant and TF-IDF
+degenerates to raw term frequency). Term document frequencies live in a
+fixed-size hashed array, so memory stays bounded no matter how many pages
+or distinct terms are seen, and the model can be updated incrementally and
+persisted between runs.
+"""
+import os
+import logging
+import threading
+import numpy as np
+from typing import List, Optional, Sequence, Tuple, Union
+from sklearn.feature_extraction.text import CountVectorizer
+from sklearn.utils import murmurhash3_32
+
+DEFAULT_N_FEATURES = 2 ** 20
+
+
+class CorpusKeywordModel:
+    """
+    Incrementally fitted, hashed document-frequency model for keyword scoring.
+    """
+
+    def __init__(self,
+                 n_features: int = DEFAULT_N_FEATURES,
+                 ngram_range: Tuple[int, int] = (1, 2),
+                 stop_words: Optional[str] = 'english'):
+        """
+        Create an empty model.
+
+        Args:
+            n_features (int): Number of hash buckets for document frequencies
+            ngram_range (tuple): N-gram range of keyword candidates
+            stop_words (str, optional): Stop word list passed to CountVectorizer
+        """
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.stop_words = stop_words
+        self.doc_freq = np.zeros(n_features, dtype=np.float32)
+        self.n_docs = 0.0
+        self._lock = threading.Lock()
+
+    def _vectorizer(self, stop_words: Optional[Union[str, List[str]]] = None) -> CountVectorizer:
+        """Term counter with the model's tokenization settings, or other stop words."""
+        return CountVectorizer(stop_words=self.stop_words if stop_words is None else stop_words,
+                               ngram_range=self.ngram_range)
+
+    def _buckets(self, terms: Sequence[str]) -> np.ndarray:
+        """Hash bucket of every term."""
+        return np.fromiter((murmurhash3_32(term, positive=True) % self.n_features for term in terms),
+                           dtype=np.int64, count=len(terms))
+
+    def _count(self, texts: Sequence[str], stop_words: Optional[Union[str, List[str]]] = None):
+        """
+        Count terms of a batch of texts in one sparse pass.
+
+        Returns:
+            Tuple of (documents x batch terms) CSR count matrix and term names,
+            or (None, []) if the batch has no usable terms
+        """
+        vectorizer = self._vectorizer(stop_words)
+        try:
+            counts = vectorizer.fit_transform(texts)
+        except ValueError:
+            # Empty vocabulary: only stop words or no text at all
+            return None, []
+        return counts.tocsr(), vectorizer.get_feature_names_out()
+
+    def partial_fit(self, texts: Sequence[str],
+                    stop_words: Optional[Union[str, List[str]]] = None) -> 'CorpusKeywordModel':
+        """
+        Add documents to the corpus statistics.
+
+        Args:
+            texts (sequence): Page texts
+            stop_words (str or list, optional): Stop words of the texts'
+                language, instead of the model's
+
+        Returns:
+            CorpusKeywordModel: self
+        """
+        texts = [text for text in texts if text]
+        counts, terms = self._count(texts, stop_words)
+        if counts is None:
+            return self
+
+        doc_freq = np.asarray((counts > 0).sum(axis=0)).ravel().astype(np.float32)
+        buckets = self._buckets(terms)
+        with self._lock:
+            np.add.at(self.doc_freq, buckets, doc_freq)
+            self.n_docs += len(texts)
+        return self
+
+    def decay(self, factor: float) -> None:
+        """
+        Scale down existing statistics, so pages that changed or disappeared
+        fade out over subsequent runs.
+
+        Args:
+            factor (float): Multiplier between 0 and 1
+        """
+        with self._lock:
+            self.doc_freq *= factor
+            self.n_docs *= factor
+
+    def top_keywords(self, texts: Sequence[str], top_k: int = 10,
+                     stop_words: Optional[Union[str, List[str]]] = None) -> List[List[Tuple[str, float]]]:
+        """
+        Score keywords of a batch of pages in one sparse-matrix pass.
+
+        Args:
+            texts (sequence): Page texts
+            top_k (int): Number of keywords per page
+            stop_words (str or list, optional): Stop words of the texts'
+                language, instead of the model's
+
+        Returns:
+            For every text, a list of (keyword, tf-idf score) pairs, best first
+        """
+        results = [[] for _ in texts]
+        counts, terms = self._count(texts, stop_words)
+        if counts is None:
+            return results
+
+        # Smoothed IDF, as in sklearn's TfidfTransformer
+        with self._lock:
+            doc_freq = self.doc_freq[self._buckets(terms)]
+            n_docs = self.n_docs
+        idf = np.log((1.0 + n_docs) / (1.0 + doc_freq)) + 1.0
+
+        tfidf = counts.multiply(idf).tocsr()
+        for row, (start, end) in enumerate(zip(tfidf.indptr[:-1], tfidf.indptr[1:])):
+            scores = tfidf.data[start:end]
+            if not len(scores):
+                continue
+            columns = tfidf.indices[start:end]
+            k = min(top_k, len(scores))
+            best = np.argpartition(-scores, k - 1)[:k]
+            best = best[np.argsort(-scores[best], kind='stable')]
+            results[row] = [(terms[columns[j]], float(scores[j])) for j in best]
+
+        return results
+
+    def save(self, path: str) -> None:
+        """
+        Persist the model.
+
+        Args:
+            path (str): Target .npz file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            np.savez_compressed(
+                path,
+                doc_freq=self.doc_freq,
+                n_docs=np.array(self.n_docs),
+                ngram_range=np.array(self.ngram_range),
+                stop_words=np.array(self.stop_words or '')
+            )
+
+    @classmethod
+    def load(cls, path: str) -> 'CorpusKeywordModel':
+        """
+        Load a persisted model, or start an empty one if it does not exist.
+
+        Args:
+            path (str): .npz file written by save()
+
+        Returns:
+            CorpusKeywordModel: Loaded or new model
+        """
+        try:
+            with np.load(path) as data:
+                model = cls(n_features=len(data['doc_freq']),
+                            ngram_range=tuple(int(n) for n in data['ngram_range']),
+                            stop_words=str(data['stop_words']) or None)
+                model.doc_freq = data['doc_freq'].astype(np.float32)
+                model.n_docs = float(data['n_docs'])
+            return model
+        except FileNotFoundError:
+            return cls()
+        except Exception as e:
+            logging.error(f"Error loading keyword model {path}: {e}")
+            return cls()
@@ -0,0 +1,316 @@
+#!/bin/python
+# near_duplicates.py
+"""
+Near-duplicate site detection with MinHash and locality-sensitive hashing.
+
+Sibling domains often serve the same site. The extracted text of every page
+is cut into word shingles, summarized by a MinHash signature, and indexed
+in LSH bands; a page whose signature agrees with an already-analyzed site
+in at least `threshold` of its positions (the estimated Jaccard similarity
+of their shingle sets) is a mirror of it and reuses its analysis, and
+optionally its thumbnail, instead of being analyzed again.
+"""
+import re
+import zlib
+import logging
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from text_extraction import get_text_extractor
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_NUM_PERM = 128
+DEFAULT_SHINGLE_SIZE = 5
+
+# Characters of page text shingled at most
+DEFAULT_MAX_CHARS = 20000
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_WORD_RE = re.compile(r'\w+')
+
+
+def shingle_hashes(text: str, shingle_size: int = DEFAULT_SHINGLE_SIZE) -> np.ndarray:
+    """
+    32-bit hashes of the distinct word shingles of a text.
+
+    Args:
+        text (str): Input text
+        shingle_size (int): Words per shingle
+
+    Returns:
+        np.ndarray: uint64 array of shingle hashes; texts shorter than one
+        shingle are a single shingle, texts without words have none
+    """
+    words = _WORD_RE.findall(text.lower())
+    if not words:
+        return np.zeros(0, dtype=np.uint64)
+    shingles = {' '.join(words[i:i + shingle_size])
+                for i in range(max(1, len(words) - shingle_size + 1))}
+    return np.fromiter((zlib.crc32(shingle.encode('utf-8')) for shingle in shingles),
+                       dtype=np.uint64, count=len(shingles))
+
+
+class MinHasher:
+    """
+    MinHash signatures over word shingles, from num_perm random linear
+    hash permutations.
+    """
+
+    def __init__(self, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 seed: int = 1):
+        """
+        Draw the permutations.
+
+        Args:
+            num_perm (int): Signature length
+            shingle_size (int): Words per shingle
+            seed (int): Random seed; signatures are only comparable with the same seed
+        """
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        generator = np.random.RandomState(seed)
+        self._a = generator.randint(1, 1 << 61, num_perm, dtype=np.uint64)
+        self._b = generator.randint(0, 1 << 61, num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of a text.
+
+        Args:
+            text (str): Input text
+
+        Returns:
+            np.ndarray or None: uint32 signature of num_perm values, None
+            for texts without words
+        """
+        hashes = shingle_hashes(text, self.shingle_size)
+        if not len(hashes):
+            return None
+        # (shingles x permutations) permuted hashes; uint64 products wrap, as in datasketch
+        permuted = ((hashes[:, None] * self._a + self._b) % _MERSENNE_PRIME) & _MAX_HASH
+        return permuted.min(axis=0).astype(np.uint32)
+
+
+def lsh_bands(threshold: float, num_perm: int, recall: float = 0.99) -> Tuple[int, int]:
+    """
+    Number of bands and rows per band for a similarity threshold.
+
+    Picks the most rows per band (fewest candidates) for which a pair at
+    the threshold still shares at least one band with probability
+    `recall`; candidates are verified against the full signature anyway,
+    so false positives only cost a comparison.
+
+    Args:
+        threshold (float): Jaccard similarity threshold
+        num_perm (int): Signature length
+        recall (float): Probability that a pair at the threshold becomes a candidate
+
+    Returns:
+        Tuple of (bands, rows per band)
+    """
+    best = (num_perm, 1)
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        if 1.0 - (1.0 - threshold ** rows) ** bands >= recall:
+            best = (bands, rows)
+    return best
+
+
+class MirrorIndex:
+    """
+    Per-run index of analyzed sites for finding mirrors among later ones.
+    """
+
+    def __init__(self,
+                 threshold: float = DEFAULT_THRESHOLD,
+                 num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE,
+                 max_chars: Optional[int] = DEFAULT_MAX_CHARS):
+        """
+        Create an empty index.
+
+        Args:
+            threshold (float): Estimated Jaccard similarity of the shingle
+                sets at which a site is a mirror
+            num_perm (int): MinHash signature length
+            shingle_size (int): Words per shingle
+            max_chars (int, optional): Characters of page text shingled
+        """
+        self.threshold = threshold
+        self.max_chars = max_chars
+        self.hasher = MinHasher(num_perm, shingle_size)
+        self.bands, self.rows = lsh_bands(threshold, num_perm)
+        self._text_extractor = get_text_extractor('auto', strip_boilerplate=True)
+        self._lock = threading.Lock()
+
+        self._buckets: List[Dict[bytes, List[str]]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[str, np.ndarray] = {}
+        self._analyses: Dict[str, Dict] = {}
+        self._thumbnails: Dict[str, str] = {}
+
+        # Work skipped thanks to mirrors
+        self._pages = 0
+        self._mirrors = 0
+        self._analysis_seconds = 0.0
+        self._analyzed = 0
+        self._thumbnails_reused = 0
+
+    def signature(self, html_content: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of the main text of a page.
+
+        Args:
+            html_content (str): Website HTML content
+
+        Returns:
+            np.ndarray or None: Signature, None for pages without text
+        """
+        return self.signature_text(self._text_extractor.extract(html_content))
+
+    def signature_text(self, text: str) -> Optional[np.ndarray]:
+        """
+        MinHash signature of text already extracted from a page, e.g. by
+        the content analyzer.
+
+        Args:
+            text (str): Main text of the page
+
+        Returns:
+            np.ndarray or None: Signature, None for texts without words
+        """
+        if self.max_chars:
+            text = text[:self.max_chars]
+        with self._lock:
+            self._pages += 1
+        return self.hasher.signature(text)
+
+    def _band_keys(self, signature: np.ndarray) -> List[bytes]:
+        """Bucket key of every band of a signature."""
+        return [signature[band * self.rows:(band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def find(self, signature: Optional[np.ndarray]) -> Optional[str]:
+        """
+        The indexed site a signature is a mirror of.
+
+        Args:
+            signature (np.ndarray, optional): Signature from signature()
+
+        Returns:
+            str or None: Domain of the most similar indexed site at or
+            above the threshold
+        """
+        if signature is None:
+            return None
+        with self._lock:
+            candidates = set()
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                candidates.update(bucket.get(key, ()))
+
+            best, best_similarity = None, self.threshold
+            for domain in candidates:
+                similarity = float(np.mean(self._signatures[domain] == signature))
+                if similarity >= best_similarity:
+                    best, best_similarity = domain, similarity
+            return best
+
+    def add(self, domain: str, signature: Optional[np.ndarray]) -> None:
+        """
+        Index a site that is analyzed rather than reused.
+
+        Args:
+            domain (str): Site domain
+            signature (np.ndarray, optional): Signature from signature()
+        """
+        if signature is None:
+            return
+        with self._lock:
+            if domain in self._signatures:
+                return
+            self._signatures[domain] = signature
+            for bucket, key in zip(self._buckets, self._band_keys(signature)):
+                bucket.setdefault(key, []).append(domain)
+
+    def record(self, domain: str, analysis: Dict, seconds: Optional[float] = None) -> None:
+        """
+        Store the analysis of an indexed site for its mirrors.
+
+        Args:
+            domain (str): Site domain
+            analysis (dict): Its analysis
+            seconds (float, optional): Time the analysis took, for the
+                report; None for analyses answered from the cache
+        """
+        with self._lock:
+            self._analyses[domain] = analysis
+            if seconds is not None:
+                self._analysis_seconds += seconds
+                self._analyzed += 1
+
+    def mirror_analysis(self, original: str) -> Optional[Dict]:
+        """
+        Analysis for a mirror of a site.
+
+        Args:
+            original (str): Domain returned by find()
+
+        Returns:
+            dict or None: Copy of the original's analysis with "mirror_of"
+            set, None if the original has no recorded analysis
+        """
+        with self._lock:
+            analysis = self._analyses.get(original)
+            if analysis is None:
+                return None
+            self._mirrors += 1
+        return dict(analysis, mirror_of=original)
+
+    def set_thumbnail(self, domain: str, thumbnail_path: Optional[str]) -> None:
+        """Remember the thumbnail captured for a site, for its mirrors."""
+        if thumbnail_path:
+            with self._lock:
+                self._thumbnails[domain] = thumbnail_path
+
+    def thumbnail(self, original: str) -> Optional[str]:
+        """
+        Thumbnail of a site, for reuse by its mirror.
+
+        Args:
+            original (str): Domain of the mirrored site
+
+        Returns:
+            str or None: Thumbnail path, None if none was captured
+        """
+        with self._lock:
+            thumbnail_path = self._thumbnails.get(original)
+            if thumbnail_path:
+                self._thumbnails_reused += 1
+            return thumbnail_path
+
+    def report(self) -> Dict:
+        """
+        Work skipped by reusing mirrors.
+
+        Returns:
+            Dict with pages signed, mirrors found, estimated analysis
+            seconds saved and thumbnails reused
+        """
+        with self._lock:
+            mean_seconds = self._analysis_seconds / self._analyzed if self._analyzed else 0.0
+            return {
+                "pages": self._pages,
+                "mirrors": self._mirrors,
+                "analysis_seconds_saved": round(self._mirrors * mean_seconds, 2),
+                "thumbnails_reused": self._thumbnails_reused
+            }
+
+    def log_stats(self, logger: Optional[logging.Logger] = None) -> None:
+        """Write the skipped-work report to the log."""
+        report = self.report()
+        share = report["mirrors"] / report["pages"] * 100 if report["pages"] else 0.0
+        (logger or logging).info(
+            f"Mirrors: {report['mirrors']} of {report['pages']} pages ({share:.0f}%) reused an "
+            f"analysis, ~{report['analysis_seconds_saved']:.1f}s of analysis and "
+            f"{report['thumbnails_reused']} screenshots skipped"
+        )
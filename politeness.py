@@ -0,0 +1,194 @@
+#!/bin/python
+# politeness.py
+"""
+Per-IP request rate limiting with token buckets.
+
+Several of the portfolio's domains are often served by the same machine, so
+limits are applied per resolved IP address rather than per domain: every IP
+has a bucket refilling at `rate` requests per second and holding up to
+`burst` of them. A request takes a token, waiting only as long as its own
+IP's bucket requires; requests to other IPs are not held back. The time
+spent waiting is collected for the run log.
+"""
+import socket
+import asyncio
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+from typing import Dict, Optional, Set, Tuple
+
+DEFAULT_RATE = 1.0
+DEFAULT_BURST = 2
+
+
+class TokenBucket:
+    """
+    Token bucket handing out reservations: a request takes a token now and
+    is told how long to wait until that token exists.
+    """
+
+    def __init__(self, rate: float, burst: float):
+        """
+        Create a full bucket.
+
+        Args:
+            rate (float): Tokens added per second
+            burst (float): Tokens held at most
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated: Optional[float] = None
+
+    def reserve(self, now: float) -> float:
+        """
+        Take one token.
+
+        Args:
+            now (float): Current monotonic time
+
+        Returns:
+            float: Seconds to wait before using the token; tokens may be
+            reserved ahead, so waits of queued requests add up
+        """
+        if self.updated is not None:
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        return max(0.0, -self.tokens / self.rate)
+
+
+class PolitenessScheduler:
+    """
+    Token bucket per resolved IP address, shared by all fetches of a run.
+    """
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: float = DEFAULT_BURST, resolve: bool = True):
+        """
+        Create the scheduler.
+
+        Args:
+            rate (float): Requests per second to one IP, sustained
+            burst (float): Requests to one IP allowed back to back
+            resolve (bool): Group hosts by IP address; if False, or if a
+                host cannot be resolved, by host name
+        """
+        if rate <= 0 or burst < 1:
+            raise ValueError(f"Need rate > 0 and burst >= 1, got rate={rate}, burst={burst}")
+        self.rate = rate
+        self.burst = burst
+        self.resolve = resolve
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._addresses: Dict[str, str] = {}
+        self._hosts: Dict[str, Set[str]] = {}
+
+        # Requests scheduled, requests that had to wait, and the waits
+        self.requests = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @staticmethod
+    def _host_port(url: str) -> Tuple[str, int]:
+        """Host name and port of a URL."""
+        parsed = urlparse(url if '://' in url else f'http://{url}')
+        return (parsed.hostname or '').lower(), parsed.port or (443 if parsed.scheme == 'https' else 80)
+
+    def _resolve(self, host: str, port: int) -> str:
+        """IP address of a host, blocking; the host name itself if it cannot be resolved."""
+        try:
+            return socket.getaddrinfo(host, port, proto=socket.IPPROTO_TCP)[0][4][0]
+        except (OSError, UnicodeError, IndexError):
+            return host
+
+    async def _resolve_async(self, host: str, port: int) -> str:
+        """IP address of a host, from the event loop's resolver."""
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, proto=socket.IPPROTO_TCP)
+            return infos[0][4][0]
+        except (OSError, UnicodeError, IndexError):
+            return host
+
+    def _reserve(self, host: str, address: str) -> float:
+        """Take a token from the bucket of an address and record the wait."""
+        with self._lock:
+            self._addresses[host] = address
+            self._hosts.setdefault(address, set()).add(host)
+            bucket = self._buckets.get(address)
+            if bucket is None:
+                bucket = self._buckets[address] = TokenBucket(self.rate, self.burst)
+            wait = bucket.reserve(time.monotonic())
+            self.requests += 1
+            if wait > 0:
+                self.delayed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+        return wait
+
+    def acquire(self, url: str) -> float:
+        """
+        Wait until a request to a URL's IP may be sent.
+
+        Args:
+            url (str): URL about to be requested
+
+        Returns:
+            float: Seconds waited
+        """
+        host, port = self._host_port(url)
+        address = self._addresses.get(host)
+        if address is None:
+            address = self._resolve(host, port) if self.resolve and host else host
+        wait = self._reserve(host, address)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, url: str) -> float:
+        """
+        Wait, without blocking the event loop, until a request to a URL's
+        IP may be sent.
+
+        Args:
+            url (str): URL about to be requested
+
+        Returns:
+            float: Seconds waited
+        """
+        host, port = self._host_port(url)
+        address = self._addresses.get(host)
+        if address is None:
+            address = await self._resolve_async(host, port) if self.resolve and host else host
+        wait = self._reserve(host, address)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def report(self) -> Dict:
+        """
+        Scheduling statistics of the run.
+
+        Returns:
+            Dict with requests, requests delayed, total and longest wait in
+            seconds, distinct IPs and IPs shared by several hosts
+        """
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "delayed": self.delayed,
+                "total_wait_s": round(self.total_wait, 2),
+                "max_wait_s": round(self.max_wait, 2),
+                "ips": len(self._buckets),
+                "shared_ips": sum(1 for hosts in self._hosts.values() if len(hosts) > 1)
+            }
+
+    def log_stats(self, logger: Optional[logging.Logger] = None) -> None:
+        """Write the scheduling statistics to the log."""
+        report = self.report()
+        (logger or logging).info(
+            f"Politeness: {report['requests']} requests to {report['ips']} IPs "
+            f"({report['shared_ips']} shared by several hosts), {report['delayed']} delayed, "
+            f"{report['total_wait_s']:.1f}s waited in total, longest wait {report['max_wait_s']:.1f}s"
+        )
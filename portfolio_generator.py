@@ -4,20 +4,30 @@ import git
 import json
 import time
 import hashlib
+import argparse
 import logging
 import requests
 import schedule
 from PIL import Image
 from io import BytesIO
 from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse
 from bs4 import BeautifulSoup
 from sklearn.feature_extraction.text import TfidfVectorizer
-# Detect technologies
-from tech_patterns import tech_patterns
 from common_themes import common_themes
 
-from AdvancedContentAnalyzer import AdvancedContentAnalyzer, analyze_content
+from AdvancedContentAnalyzer import (PROFILES, AdvancedContentAnalyzer, analyze_content, analyze_content_batch,
+                                     cache_fingerprint, get_analyzer, loaded_analyzers)
+from analysis_cache import AnalysisCache
+from async_fetcher import AsyncFetcher, aiohttp
+from html_archive import HtmlArchive
+from html_download import BodyReader, decode_html, is_html
+from http_cache import HttpCache
+from near_duplicates import MirrorIndex
+from politeness import PolitenessScheduler
+from similarity_index import SimilarityIndex
+from theme_model import HashedThemeModel, load_labelled, theme_counts
 
 
 # Configuration
@@ -29,6 +39,77 @@ GIT_REPO_PATH = OUTPUT_DIR
 GIT_REMOTE = "origin"
 GIT_BRANCH = "main"
 HTTP_TIMEOUT = 10
+FETCH_WORKERS = 8
+# Async fetcher (used when aiohttp is installed): requests in flight overall
+# and per host, and connect/total timeouts next to the HTTP_TIMEOUT read timeout
+FETCH_CONCURRENCY = 32
+FETCH_PER_HOST = 2
+HTTP_CONNECT_TIMEOUT = 5
+HTTP_TOTAL_TIMEOUT = 20
+# Bodies are streamed in chunks and cut at this size; None for no cap
+MAX_DOWNLOAD_BYTES = 5 * 1024 * 1024
+DOWNLOAD_CHUNK_BYTES = 64 * 1024
+# Token bucket per resolved IP: sustained requests per second and back-to-back burst; None disables it
+POLITENESS_RATE = 1.0
+POLITENESS_BURST = 2
+ANALYSIS_BATCH_SIZE = 32
+ANALYSIS_PROCESSES = 1
+CACHE_DIR = "cache"
+ANALYSIS_CACHE_FILE = os.path.join(CACHE_DIR, "analysis_cache.sqlite")
+ANALYSIS_CACHE_MAX_ENTRIES = 10000
+ANALYSIS_CACHE_MAX_AGE_DAYS = 30
+# Conditional re-fetches (ETag/Last-Modified); None disables the HTTP cache
+HTTP_CACHE_FILE = os.path.join(CACHE_DIR, "http_cache.sqlite")
+HTTP_CACHE_MAX_ENTRIES = 10000
+HTTP_CACHE_MAX_AGE_DAYS = 30
+# Every fetched body, deduplicated and compressed, for offline reanalysis; None disables it
+ARCHIVE_DIR = os.path.join(CACHE_DIR, "html_archive")
+ARCHIVE_COMPRESSION = None  # 'zstd' or 'gzip'; None picks zstd if zstandard is installed
+REANALYSIS_FILE = os.path.join(CACHE_DIR, "reanalysis.json")
+REANALYSIS_PROCESSES = os.cpu_count() or 1
+KEYWORD_MODEL_FILE = os.path.join(CACHE_DIR, "keyword_model.npz")
+KEYWORD_MODEL_DECAY = 0.9
+THEME_MODEL_FILE = os.path.join(CACHE_DIR, "theme_model.npz")
+TEXT_EXTRACTOR = "auto"
+ANALYSIS_PROFILE = "deep"
+TECH_DETECTOR = "signals"
+# Per-page budgets: larger pages get the fast profile, slower ones stop parsing
+MAX_HTML_BYTES = 2 * 1024 * 1024
+MAX_TEXT_CHARS = 20000
+MAX_ANALYSIS_SECONDS = 5.0
+# SpaCy model per page language; models that are not installed are skipped
+# (no NER, keywords with the language's stop words)
+LANGUAGE_MODELS = {
+    "pl": "pl_core_news_sm",
+    "de": "de_core_news_sm",
+    "fr": "fr_core_news_sm",
+    "es": "es_core_news_sm",
+    "it": "it_core_news_sm"
+}
+# Estimated text similarity (0-1) at which a site is a mirror of one analyzed
+# earlier in the run and reuses its analysis; None analyzes every site
+MIRROR_THRESHOLD = 0.9
+REUSE_MIRROR_THUMBNAILS = True
+# Most similar sites listed in every site's "related" field; 0 disables
+RELATED_SITES = 5
+
+
+def analyzer_options():
+    """Keyword arguments for the shared content analyzer and its cache fingerprint."""
+    return {
+        "keyword_model_file": KEYWORD_MODEL_FILE,
+        "text_extractor": TEXT_EXTRACTOR,
+        "profile": ANALYSIS_PROFILE,
+        "artifact_dir": CACHE_DIR,
+        "vector_store_dir": CACHE_DIR,
+        "theme_model_file": THEME_MODEL_FILE,
+        "tech_detector": TECH_DETECTOR,
+        "max_html_bytes": MAX_HTML_BYTES,
+        "max_text_chars": MAX_TEXT_CHARS,
+        "max_analysis_seconds": MAX_ANALYSIS_SECONDS,
+        "language_models": LANGUAGE_MODELS
+    }
+
 USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
 # Setup logging
@@ -63,18 +144,187 @@ def normalize_url(url):
     return f"{parsed.scheme}://{hostname}"
 
 
-def get_domain_content(url):
-    """Fetch website content."""
+def get_domain_page(url, http_cache=None, scheduler=None):
+    """
+    Fetch website content together with the response signals used for
+    technology detection.
+
+    Args:
+        url (str): Page URL
+        http_cache (HttpCache, optional): Cache of earlier responses; fresh
+            entries are served without a request, stale ones revalidated
+            with If-None-Match/If-Modified-Since
+        scheduler (PolitenessScheduler, optional): Per-IP rate limits every
+            request waits for
+
+    The body is streamed and cut at MAX_DOWNLOAD_BYTES; responses that are
+    not HTML are dropped before it is read.
+
+    Returns:
+        tuple: HTML content (or None) and a dict with the response
+        "headers", the names of "cookies" it sets, "not_modified", True if
+        the page was served from the HTTP cache, the "bytes" downloaded and
+        whether the body was "truncated"
+    """
     try:
         headers = {
             'User-Agent': USER_AGENT
         }
-        response = requests.get(url, headers=headers, timeout=HTTP_TIMEOUT)
-        response.raise_for_status()
-        return response.text
+        if http_cache is not None:
+            cached, conditional = http_cache.lookup(url)
+            if cached is not None:
+                return cached
+            headers.update(conditional)
+
+        if scheduler is not None:
+            scheduler.acquire(url)
+        response = requests.get(url, headers=headers, timeout=HTTP_TIMEOUT, stream=True)
+        if response.status_code == 304 and http_cache is not None:
+            response.close()
+            cached = http_cache.not_modified(url, response.headers)
+            if cached is not None:
+                return cached
+            # The entry was evicted meanwhile; fetch the page in full
+            if scheduler is not None:
+                scheduler.acquire(url)
+            response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=HTTP_TIMEOUT, stream=True)
+
+        with response:
+            response.raise_for_status()
+            content_type = response.headers.get('Content-Type')
+            if not is_html(content_type):
+                logger.warning(f"Skipping {url}: not HTML ({content_type})")
+                return None, {}
+            reader = BodyReader(MAX_DOWNLOAD_BYTES).read(response.iter_content(DOWNLOAD_CHUNK_BYTES))
+
+        if reader.truncated:
+            logger.warning(f"Truncated {url} at {MAX_DOWNLOAD_BYTES} bytes")
+        page = decode_html(reader.body, content_type, reader.truncated), {
+            "headers": dict(response.headers),
+            "cookies": list(response.cookies.keys()),
+            "not_modified": False,
+            "bytes": reader.size,
+            "truncated": reader.truncated
+        }
+        if http_cache is not None:
+            http_cache.store(url, *page)
+        return page
     except requests.exceptions.RequestException as e:
         logger.error(f"Error fetching {url}: {e}")
+        return None, {}
+
+
+def get_domain_content(url, http_cache=None, scheduler=None):
+    """Fetch website content."""
+    return get_domain_page(url, http_cache, scheduler)[0]
+
+
+def make_scheduler():
+    """
+    Create the per-IP politeness scheduler for a run.
+
+    Returns:
+        PolitenessScheduler or None: Scheduler, None if rate limiting is disabled
+    """
+    if not POLITENESS_RATE:
         return None
+    return PolitenessScheduler(rate=POLITENESS_RATE, burst=POLITENESS_BURST)
+
+
+def make_fetcher(http_cache=None, scheduler=None):
+    """
+    Create the asyncio fetcher for a run.
+
+    Args:
+        http_cache (HttpCache, optional): Cache for conditional requests
+        scheduler (PolitenessScheduler, optional): Per-IP rate limits
+
+    Returns:
+        AsyncFetcher or None: Fetcher, None if aiohttp is not installed
+    """
+    if aiohttp is None:
+        return None
+    return AsyncFetcher(
+        concurrency=FETCH_CONCURRENCY,
+        per_host=FETCH_PER_HOST,
+        connect_timeout=HTTP_CONNECT_TIMEOUT,
+        read_timeout=HTTP_TIMEOUT,
+        total_timeout=HTTP_TOTAL_TIMEOUT,
+        headers={'User-Agent': USER_AGENT},
+        http_cache=http_cache,
+        max_bytes=MAX_DOWNLOAD_BYTES,
+        chunk_bytes=DOWNLOAD_CHUNK_BYTES,
+        scheduler=scheduler
+    )
+
+
+def archive_page(archive, url_info, html_content, response):
+    """
+    Store a fetched page in the HTML archive.
+
+    Args:
+        archive (HtmlArchive or None): Archive of the run
+        url_info (dict): Dictionary containing domain information
+        html_content (str or None): HTML content; nothing is stored without it
+        response (dict): Response signals of the page
+    """
+    if archive is None or not html_content:
+        return
+    try:
+        archive.put(url_info['domain'], url_info['url'], html_content, response)
+    except Exception as e:
+        logger.error(f"Error archiving {url_info['domain']}: {e}")
+
+
+def fetch_domains(urls, max_workers=FETCH_WORKERS, http_cache=None, archive=None, scheduler=None):
+    """
+    Fetch content for a batch of domains concurrently.
+
+    Args:
+        urls (list): List of domain information dictionaries
+        max_workers (int): Number of concurrent fetches without aiohttp
+        http_cache (HttpCache, optional): Cache for conditional requests
+        archive (HtmlArchive, optional): Archive every fetched page is stored in
+        scheduler (PolitenessScheduler, optional): Per-IP rate limits
+
+    Returns:
+        list: (HTML content or None, response signals) for each domain, in input order
+    """
+    fetcher = make_fetcher(http_cache, scheduler)
+    if fetcher is not None:
+        pages = fetcher.fetch_all([url_info['url'] for url_info in urls])
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pages = list(executor.map(lambda url_info: get_domain_page(url_info['url'], http_cache, scheduler),
+                                      urls))
+    for url_info, (html_content, response) in zip(urls, pages):
+        archive_page(archive, url_info, html_content, response)
+    return pages
+
+
+def iter_domain_pages(urls, http_cache=None, archive=None, scheduler=None):
+    """
+    Fetch domains concurrently and yield each page as soon as it arrives.
+
+    Args:
+        urls (list): List of domain information dictionaries
+        http_cache (HttpCache, optional): Cache for conditional requests
+        archive (HtmlArchive, optional): Archive every fetched page is stored in
+        scheduler (PolitenessScheduler, optional): Per-IP rate limits
+
+    Yields:
+        tuple: (index into urls, HTML content or None, response signals);
+        without aiohttp the domains are fetched one by one, in order
+    """
+    fetcher = make_fetcher(http_cache, scheduler)
+    if fetcher is not None:
+        pages = fetcher.iter_pages([url_info['url'] for url_info in urls])
+    else:
+        pages = ((index, *get_domain_page(url_info['url'], http_cache, scheduler))
+                 for index, url_info in enumerate(urls))
+    for index, html_content, response in pages:
+        archive_page(archive, urls[index], html_content, response)
+        yield index, html_content, response
 
 
 def generate_filename(self, url: str) -> str:
@@ -227,13 +477,269 @@ def load_domain_urls():
         return []
 
 
-def process_single_domain(url_info, screenshotter=None):
+def load_analyzer(cache=None):
+    """
+    Get the shared content analyzer for a run.
+
+    Without an analysis cache the analyzer is warmed up immediately, so the
+    SpaCy/theme-embedding load cost is paid once, up front. With a cache,
+    SpaCy is loaded lazily on the first cache miss.
+
+    Args:
+        cache (AnalysisCache, optional): Analysis cache used for the run
+
+    Returns:
+        AdvancedContentAnalyzer or None: Shared analyzer, None on failure
+    """
+    try:
+        start = time.perf_counter()
+        analyzer = get_analyzer(**analyzer_options())
+
+        # Let keyword statistics of changed or removed sites fade out
+        if analyzer.keyword_model is not None:
+            analyzer.keyword_model.decay(KEYWORD_MODEL_DECAY)
+
+        if cache is None:
+            analyzer.warmup()
+        logger.info(f"Content analyzer ready in {time.perf_counter() - start:.2f}s")
+        return analyzer
+    except Exception as e:
+        logger.error(f"Error loading content analyzer: {e}")
+        return None
+
+
+def open_analysis_cache():
+    """
+    Open the persistent analysis cache.
+
+    Returns:
+        AnalysisCache or None: Cache instance, None if it cannot be opened
+    """
+    try:
+        return AnalysisCache(
+            ANALYSIS_CACHE_FILE,
+            fingerprint=cache_fingerprint(**analyzer_options()),
+            max_entries=ANALYSIS_CACHE_MAX_ENTRIES,
+            max_age_days=ANALYSIS_CACHE_MAX_AGE_DAYS
+        )
+    except Exception as e:
+        logger.error(f"Error opening analysis cache: {e}")
+        return None
+
+
+def open_http_cache():
+    """
+    Open the persistent HTTP cache.
+
+    Returns:
+        HttpCache or None: Cache instance, None if disabled or it cannot be opened
+    """
+    if not HTTP_CACHE_FILE:
+        return None
+    try:
+        return HttpCache(HTTP_CACHE_FILE, max_entries=HTTP_CACHE_MAX_ENTRIES,
+                         max_age_days=HTTP_CACHE_MAX_AGE_DAYS)
+    except Exception as e:
+        logger.error(f"Error opening HTTP cache: {e}")
+        return None
+
+
+def open_archive():
+    """
+    Open the HTML archive.
+
+    Returns:
+        HtmlArchive or None: Archive, None if disabled or it cannot be opened
+    """
+    if not ARCHIVE_DIR:
+        return None
+    try:
+        return HtmlArchive(ARCHIVE_DIR, compression=ARCHIVE_COMPRESSION)
+    except Exception as e:
+        logger.error(f"Error opening HTML archive: {e}")
+        return None
+
+
+def open_mirror_index():
+    """
+    Create the near-duplicate index for a run.
+
+    Returns:
+        MirrorIndex or None: Empty index, None if mirror detection is disabled
+    """
+    if not MIRROR_THRESHOLD:
+        return None
+    return MirrorIndex(threshold=MIRROR_THRESHOLD)
+
+
+def link_mirrors(portfolio_data):
+    """
+    List the mirrors of every site in its "mirrors" field.
+
+    Args:
+        portfolio_data (list): Site records; mirrors have "mirror_of" set
+    """
+    mirrors = {}
+    for site in portfolio_data:
+        if site.get("mirror_of"):
+            mirrors.setdefault(site["mirror_of"], []).append(site["domain"])
+    for site in portfolio_data:
+        site["mirrors"] = sorted(mirrors.get(site["domain"], []))
+
+
+def load_previous_sites():
+    """
+    Site records of the current data file, i.e. of the previous run.
+
+    Returns:
+        dict: Domain to site record; empty without a data file
+    """
+    try:
+        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+            previous_data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return {site["domain"]: site for site in previous_data if site.get("domain")}
+
+
+def previous_related(previous_sites):
+    """
+    Related lists of the previous run, for incremental updates.
+
+    Args:
+        previous_sites (dict): Site records from load_previous_sites()
+
+    Returns:
+        dict: Domain to (domain, similarity) pairs
+    """
+    return {
+        domain: [(entry["domain"], entry["similarity"]) for entry in site["related"]]
+        for domain, site in previous_sites.items()
+        if isinstance(site.get("related"), list)
+    }
+
+
+def update_related_sites(portfolio_data, analyzer, previous_sites=None):
+    """
+    Fill the "related" field of every site from the stored document vectors.
+
+    Sites analyzed in this run are compared with all others; the related
+    lists of the other sites are taken from the previous data file and only
+    merged with the new sites. Mirrors share the list of their original.
+
+    Args:
+        portfolio_data (list): Site records of the run
+        analyzer (AdvancedContentAnalyzer): Analyzer whose vector store holds the vectors
+        previous_sites (dict, optional): Site records of the previous run,
+            read before the data file is replaced
+    """
+    if not RELATED_SITES or analyzer is None or analyzer.vector_store is None:
+        return
+    try:
+        start = time.perf_counter()
+        sites = {site["domain"] for site in portfolio_data}
+        domains, vectors = analyzer.vector_store.matrix()
+        rows = [row for row, domain in enumerate(domains) if domain in sites]
+
+        index = SimilarityIndex()
+        index.add([domains[row] for row in rows], vectors[rows])
+        new_domains = analyzer.vector_store.pending_domains()
+        related = index.update_related(previous_related(previous_sites or {}), new_domains, RELATED_SITES)
+
+        for site in portfolio_data:
+            pairs = related.get(site.get("mirror_of") or site["domain"], [])
+            site["related"] = [{"domain": domain, "similarity": similarity}
+                               for domain, similarity in pairs if domain != site["domain"]]
+
+        logger.info(f"Related sites for {len(index)} sites ({len(new_domains)} new or changed) "
+                    f"in {time.perf_counter() - start:.2f}s")
+    except Exception as e:
+        logger.error(f"Error computing related sites: {e}")
+
+
+def log_analysis_timings():
+    """
+    Log per-stage analysis timings collected by the analyzers during the run.
+    """
+    for analyzer in loaded_analyzers():
+        for stage, stats in analyzer.timings.summary().items():
+            logger.info(f"Analysis stage {stage}: {stats['calls']} calls, "
+                        f"{stats['total_s']:.2f}s total, {stats['mean_ms']:.1f} ms/call")
+        for language, stats in analyzer.language_timings.summary().items():
+            logger.info(f"Analysis of {language!r} pages: {stats['calls']} pages, "
+                        f"{stats['total_s']:.2f}s total, {stats['mean_ms']:.1f} ms/page")
+
+
+def finish_analysis(cache, mirrors=None, http_cache=None, archive=None, scheduler=None):
+    """
+    Log analysis statistics for the run, persist the keyword model and
+    document vectors, and evict stale cache entries.
+
+    Args:
+        cache (AnalysisCache or None): Analysis cache used for the run
+        mirrors (MirrorIndex, optional): Near-duplicate index used for the run
+        http_cache (HttpCache, optional): HTTP cache used for the run
+        archive (HtmlArchive, optional): HTML archive used for the run
+        scheduler (PolitenessScheduler, optional): Politeness scheduler of the
+            run, whose waits are logged
+    """
+    log_analysis_timings()
+    if scheduler is not None:
+        scheduler.log_stats(logger)
+    if mirrors is not None:
+        mirrors.log_stats(logger)
+
+    if http_cache is not None:
+        try:
+            http_cache.log_stats(logger)
+            evicted = http_cache.evict()
+            if evicted:
+                logger.info(f"Evicted {evicted} HTTP cache entries")
+            http_cache.close()
+        except Exception as e:
+            logger.error(f"Error maintaining HTTP cache: {e}")
+
+    if archive is not None:
+        try:
+            archive.log_stats(logger)
+            archive.close()
+        except Exception as e:
+            logger.error(f"Error closing HTML archive: {e}")
+
+    for analyzer in loaded_analyzers():
+        try:
+            analyzer.save_state()
+        except Exception as e:
+            logger.error(f"Error saving analyzer state: {e}")
+
+    if cache is None:
+        return
+    try:
+        cache.log_stats(logger)
+        evicted = cache.evict()
+        if evicted:
+            logger.info(f"Evicted {evicted} analysis cache entries")
+        cache.close()
+    except Exception as e:
+        logger.error(f"Error maintaining analysis cache: {e}")
+
+
+def process_single_domain(url_info, screenshotter=None, analyzer=None, cache=None, mirrors=None, page=None,
+                          previous_sites=None):
     """
     Process a single domain for portfolio generation.
 
     Args:
         url_info (dict): Dictionary containing domain information
         screenshotter (ScreenshotCapture, optional): Screenshot capture instance
+        analyzer (AdvancedContentAnalyzer, optional): Analyzer to use,
+            defaults to the process-wide shared analyzer
+        cache (AnalysisCache, optional): Analysis cache
+        mirrors (MirrorIndex, optional): Near-duplicate index of the run
+        page (tuple, optional): (HTML content or None, response signals)
+            already fetched; the domain is fetched if not given
+        previous_sites (dict, optional): Site records of the previous run;
+            unmodified pages keep their thumbnail
 
     Returns:
         dict or None: Site data dictionary if successful, None otherwise
@@ -246,44 +752,109 @@ def process_single_domain(url_info, screenshotter=None):
         logger.info(f"Processing {domain_name}")
 
         # Fetch website content
-        html_content = get_domain_content(url)
+        html_content, response = page if page is not None else get_domain_page(url)
         if not html_content:
             logger.warning(f"Could not fetch content for {domain_name}")
             return None
 
-        # Analyze content
+        # Analyze content with the shared analyzer, unless it is cached
         # print(html_content)
-        analysis = analyze_content(html_content)
+        analysis = analyze_content(html_content, analyzer=analyzer, cache=cache, domain=domain_name,
+                                   response=response, mirrors=mirrors)
 
-        # Capture thumbnail
-        if screenshotter:
-            thumbnail_path = screenshotter.capture(url)
-        else:
-            from screenshot.ScreenshotCapture import ScreenshotCapture
-            screenshotter = ScreenshotCapture(output_dir="media/thumbnails")
-            thumbnail_path = screenshotter.capture(url)
-
-        # Create site data
-        site_data = {
-            "domain": domain_name,
-            "url": url,
-            "thumbnail": thumbnail_path,
-            "theme": analysis["theme"],
-            "keywords": analysis["keywords"],
-            "technologies": analysis["technologies"],
-            "last_updated": datetime.now().strftime("%Y-%m-%d"),
-            "description": ""
-        }
-
-        # Generate description
-        site_data["description"] = generate_description(site_data)
-
-        return site_data
+        return build_site_data(url_info, analysis, screenshotter, mirrors,
+                               previous=unchanged_site(previous_sites, domain_name, response), response=response)
     except Exception as e:
         logger.error(f"Error processing {url_info}: {e}")
         return None
 
 
+def unchanged_site(previous_sites, domain_name, response):
+    """
+    Previous site record of a domain whose page was not modified since.
+
+    Args:
+        previous_sites (dict or None): Site records of the previous run
+        domain_name (str): Domain
+        response (dict): Response signals of the fetched page
+
+    Returns:
+        dict or None: Previous record, None if the page changed or is new
+    """
+    if not previous_sites or not response.get("not_modified"):
+        return None
+    return previous_sites.get(domain_name)
+
+
+def build_site_data(url_info, analysis, screenshotter=None, mirrors=None, previous=None, response=None):
+    """
+    Capture a thumbnail and assemble the site record for an analyzed domain.
+
+    Args:
+        url_info (dict): Dictionary containing domain information
+        analysis (dict): Result of content analysis
+        screenshotter (ScreenshotCapture, optional): Screenshot capture instance
+        mirrors (MirrorIndex, optional): Near-duplicate index of the run;
+            mirrors reuse the thumbnail of their original
+        previous (dict, optional): Previous record of the site, given when
+            its page was not modified; its thumbnail is reused
+        response (dict, optional): Response signals of the fetched page,
+            for the download size and truncation
+
+    Returns:
+        dict: Site data dictionary
+    """
+    url = url_info['url']
+    domain_name = url_info['domain']
+    budgets_exceeded = analysis.get("budgets_exceeded", [])
+    if budgets_exceeded:
+        logger.warning(f"Analysis budgets exceeded for {domain_name}: {', '.join(budgets_exceeded)}")
+
+    response = response or {}
+    mirror_of = analysis.get("mirror_of")
+    if mirror_of:
+        logger.info(f"{domain_name} mirrors {mirror_of}; reusing its analysis")
+
+    # Capture thumbnail, unless the page is unchanged or the site mirrors one that has a thumbnail
+    thumbnail_path = None
+    if previous is not None and previous.get("thumbnail") and os.path.exists(previous["thumbnail"]):
+        thumbnail_path = previous["thumbnail"]
+        logger.info(f"{domain_name} not modified; reusing its thumbnail")
+    elif mirror_of and mirrors is not None and REUSE_MIRROR_THUMBNAILS:
+        thumbnail_path = mirrors.thumbnail(mirror_of)
+    if not thumbnail_path:
+        if not screenshotter:
+            from screenshot.ScreenshotCapture import ScreenshotCapture
+            screenshotter = ScreenshotCapture(output_dir="media/thumbnails")
+        thumbnail_path = screenshotter.capture(url)
+        if mirrors is not None and not mirror_of:
+            mirrors.set_thumbnail(domain_name, thumbnail_path)
+
+    # Create site data
+    site_data = {
+        "domain": domain_name,
+        "url": url,
+        "thumbnail": thumbnail_path,
+        "theme": analysis["theme"],
+        "secondary_theme": analysis.get("secondary_theme"),
+        "theme_margin": analysis.get("theme_margin", 0.0),
+        "language": analysis.get("language"),
+        "keywords": analysis["keywords"],
+        "technologies": analysis["technologies"],
+        "budgets_exceeded": budgets_exceeded,
+        "mirror_of": mirror_of,
+        "bytes_downloaded": response.get("bytes", 0),
+        "download_truncated": response.get("truncated", False),
+        "last_updated": datetime.now().strftime("%Y-%m-%d"),
+        "description": ""
+    }
+
+    # Generate description
+    site_data["description"] = generate_description(site_data)
+
+    return site_data
+
+
 def save_portfolio_data(existing_data):
     """
     Save portfolio data to JSON file.
@@ -295,6 +866,7 @@ def save_portfolio_data(existing_data):
         bool: True if save was successful, False otherwise
     """
     try:
+        link_mirrors(existing_data)
         with open(DATA_FILE, 'w', encoding='utf-8') as f:
             json.dump(existing_data, f, indent=2)
 
@@ -315,6 +887,9 @@ def one():
         bool: True if portfolio generation was successful, False otherwise
     """
     try:
+        # Read the previous run before its data file is removed
+        previous_sites = load_previous_sites()
+
         # Prepare environment
         if not prepare_output_environment():
             return False
@@ -324,18 +899,30 @@ def one():
         if not urls:
             return False
 
-        # Process domains sequentially
-        existing_data = []
+        # Load the analyzer once for the whole run
+        cache = open_analysis_cache()
+        analyzer = load_analyzer(cache)
+        mirrors = open_mirror_index()
+        http_cache = open_http_cache()
+        archive = open_archive()
+        scheduler = make_scheduler()
+
+        # Process domains one by one as their pages arrive
+        sites = {}
 
-        for url_info in urls:
+        for index, html_content, response in iter_domain_pages(urls, http_cache, archive, scheduler):
             # Process single domain
-            site_data = process_single_domain(url_info)
+            site_data = process_single_domain(urls[index], analyzer=analyzer, cache=cache, mirrors=mirrors,
+                                              page=(html_content, response), previous_sites=previous_sites)
 
             if site_data:
-                existing_data.append(site_data)
+                sites[index] = site_data
 
-                # Minimal sleep to prevent potential rate limiting
-                time.sleep(1)
+        # Keep the domain list order
+        existing_data = [sites[index] for index in sorted(sites)]
+
+        update_related_sites(existing_data, analyzer, previous_sites)
+        finish_analysis(cache, mirrors, http_cache, archive, scheduler)
 
         # Save portfolio data
         return save_portfolio_data(existing_data)
@@ -353,6 +940,9 @@ def multi():
         bool: True if portfolio generation was successful, False otherwise
     """
     try:
+        # Read the previous run before its data file is removed
+        previous_sites = load_previous_sites()
+
         # Prepare environment
         if not prepare_output_environment():
             return False
@@ -381,10 +971,19 @@ def multi():
         # Create a mapping of URL to thumbnail path
         thumbnail_map = dict(zip(urls_to_capture, thumbnail_paths))
 
-        # Process domains
-        existing_data = []
+        # Load the analyzer once for the whole run
+        cache = open_analysis_cache()
+        analyzer = load_analyzer(cache)
+        mirrors = open_mirror_index()
+        http_cache = open_http_cache()
+        archive = open_archive()
+        scheduler = make_scheduler()
+
+        # Process domains as their pages arrive
+        sites = {}
 
-        for url_info in urls:
+        for index, html_content, response in iter_domain_pages(urls, http_cache, archive, scheduler):
+            url_info = urls[index]
             url = url_info['url']
 
             # Use multicapture result
@@ -392,13 +991,18 @@ def multi():
             screenshotter.thumbnail_path = thumbnail_map.get(url)
 
             # Process single domain
-            site_data = process_single_domain(url_info, screenshotter)
+            site_data = process_single_domain(url_info, screenshotter, analyzer=analyzer, cache=cache,
+                                              mirrors=mirrors, page=(html_content, response),
+                                              previous_sites=previous_sites)
 
             if site_data:
-                existing_data.append(site_data)
+                sites[index] = site_data
 
-                # Minimal sleep to prevent potential rate limiting
-                time.sleep(0.5)
+        # Keep the domain list order
+        existing_data = [sites[index] for index in sorted(sites)]
+
+        update_related_sites(existing_data, analyzer, previous_sites)
+        finish_analysis(cache, mirrors, http_cache, archive, scheduler)
 
         # Save portfolio data
         return save_portfolio_data(existing_data)
@@ -407,14 +1011,324 @@ def multi():
         logger.error(f"Error in main function: {e}")
         return False
 
+def batch():
+    """
+    Main function to generate the portfolio by fetching and analyzing
+    domains in batches.
+
+    Returns:
+        bool: True if portfolio generation was successful, False otherwise
+    """
+    try:
+        # Read the previous run before its data file is removed
+        previous_sites = load_previous_sites()
+
+        # Prepare environment
+        if not prepare_output_environment():
+            return False
+
+        # Load domain URLs
+        urls = load_domain_urls()
+        if not urls:
+            return False
+
+        # Load the analyzer once for the whole run
+        cache = open_analysis_cache()
+        analyzer = load_analyzer(cache)
+        mirrors = open_mirror_index()
+        http_cache = open_http_cache()
+        archive = open_archive()
+        scheduler = make_scheduler()
+
+        from screenshot.ScreenshotCapture import ScreenshotCapture
+        screenshotter = ScreenshotCapture(output_dir="media/thumbnails")
+
+        existing_data = []
+
+        for start in range(0, len(urls), ANALYSIS_BATCH_SIZE):
+            url_batch = urls[start:start + ANALYSIS_BATCH_SIZE]
+            logger.info(f"Processing domains {start + 1}-{start + len(url_batch)} of {len(urls)}")
+
+            # Fetch the whole batch, then analyze it in one pipeline pass
+            pages = fetch_domains(url_batch, http_cache=http_cache, archive=archive, scheduler=scheduler)
+            html_batch = [html_content for html_content, _ in pages]
+            analyses = analyze_content_batch(
+                html_batch,
+                analyzer=analyzer,
+                cache=cache,
+                batch_size=ANALYSIS_BATCH_SIZE,
+                n_process=ANALYSIS_PROCESSES,
+                domains=[url_info['domain'] for url_info in url_batch],
+                responses=[response for _, response in pages],
+                mirrors=mirrors
+            )
+
+            for url_info, (html_content, response), analysis in zip(url_batch, pages, analyses):
+                if not html_content:
+                    logger.warning(f"Could not fetch content for {url_info['domain']}")
+                    continue
+                try:
+                    previous = unchanged_site(previous_sites, url_info['domain'], response)
+                    existing_data.append(build_site_data(url_info, analysis, screenshotter, mirrors, previous,
+                                                         response))
+                except Exception as e:
+                    logger.error(f"Error processing {url_info}: {e}")
+
+        update_related_sites(existing_data, analyzer, previous_sites)
+        finish_analysis(cache, mirrors, http_cache, archive, scheduler)
+
+        # Save portfolio data
+        return save_portfolio_data(existing_data)
+
+    except Exception as e:
+        logger.error(f"Error in batch function: {e}")
+        return False
+
+
+def retheme():
+    """
+    Reassign themes of the sites in the existing data file from their stored
+    document vectors, with one matrix product against the current theme
+    matrix. Nothing is fetched and no page is parsed.
+
+    Returns:
+        bool: True if re-theming was successful, False otherwise
+    """
+    try:
+        with open(DATA_FILE, 'r', encoding='utf-8') as f:
+            existing_data = json.load(f)
+
+        analyzer = get_analyzer(**analyzer_options())
+        if not analyzer.uses_vectors:
+            logger.error("Themes are not scored by vector similarity (trained theme model, fast profile "
+                         "or no SpaCy vectors); nothing to re-theme from")
+            return False
+        if analyzer.vector_store is None or not len(analyzer.vector_store):
+            logger.error("No stored document vectors; run the generator first")
+            return False
+
+        domains, vectors = analyzer.vector_store.matrix()
+        with analyzer.timings.stage('retheme'):
+            theme_fields = dict(zip(domains, analyzer.theme_fields_for_vectors(vectors)))
+
+        changed = missing = 0
+        for site in existing_data:
+            fields = theme_fields.get(site.get("domain"))
+            if fields is None:
+                missing += 1
+                continue
+            if fields["theme"] != site.get("theme"):
+                changed += 1
+            site.update(fields)
+            site["description"] = generate_description(site)
+
+        log_analysis_timings()
+        logger.info(f"Re-themed {len(existing_data) - missing} sites, {changed} changed theme, "
+                    f"{missing} without a stored vector")
+
+        return save_portfolio_data(existing_data)
+
+    except Exception as e:
+        logger.error(f"Error in retheme function: {e}")
+        return False
+
+
+def reanalyze(date=None, output_file=REANALYSIS_FILE):
+    """
+    Analyze the archived pages of a date again with the current analyzer,
+    without network access, so analyzer changes can be compared on exactly
+    the same pages. The analysis cache is bypassed, pages have no wall-time
+    budget, and no state of the regular runs (keyword model, vectors, data
+    file) is written.
+
+    Args:
+        date (str, optional): YYYY-MM-DD; every domain's latest page on or
+            before it is analyzed. Defaults to the latest archived pages.
+        output_file (str): JSON file the analyses are written to
+
+    Returns:
+        bool: True if reanalysis was successful, False otherwise
+    """
+    try:
+        archive = open_archive()
+        if archive is None:
+            logger.error("The HTML archive is disabled or cannot be opened")
+            return False
+        entries = archive.snapshot(date)
+        if not entries:
+            logger.error(f"No archived pages{f' as of {date}' if date else ''}")
+            return False
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            html_documents = list(executor.map(archive.get_blob, [entry["content_hash"] for entry in entries]))
+        archive.close()
+        logger.info(f"Read {len(entries)} archived pages in {time.perf_counter() - start:.2f}s")
+
+        # Keywords are scored against the keyword model of the last run, which is not updated.
+        # Without the wall-time budget, which depends on the machine and its load, the same
+        # pages always give the same analyses; the byte and character budgets still apply
+        analyzer = get_analyzer(**dict(analyzer_options(), max_analysis_seconds=None))
+        analyzer.warmup()
+
+        start = time.perf_counter()
+        analyses = analyze_content_batch(
+            html_documents,
+            analyzer=analyzer,
+            batch_size=ANALYSIS_BATCH_SIZE,
+            n_process=REANALYSIS_PROCESSES,
+            domains=[entry["domain"] for entry in entries],
+            responses=[entry["response"] for entry in entries],
+            learn=False
+        )
+        elapsed = time.perf_counter() - start
+
+        previous_sites = load_previous_sites()
+        results = []
+        changed = 0
+        for entry, html_content, analysis in zip(entries, html_documents, analyses):
+            if not html_content:
+                logger.warning(f"Archived page of {entry['domain']} is missing or unreadable")
+                continue
+            results.append({
+                "domain": entry["domain"],
+                "url": entry["url"],
+                "archived": entry["date"],
+                "content_hash": entry["content_hash"],
+                "theme": analysis["theme"],
+                "secondary_theme": analysis.get("secondary_theme"),
+                "theme_margin": analysis.get("theme_margin", 0.0),
+                "language": analysis.get("language"),
+                "keywords": analysis["keywords"],
+                "technologies": analysis["technologies"],
+                "budgets_exceeded": analysis.get("budgets_exceeded", [])
+            })
+            previous = previous_sites.get(entry["domain"])
+            if previous is not None and previous.get("theme") != analysis["theme"]:
+                changed += 1
+
+        with open(output_file, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+
+        log_analysis_timings()
+        logger.info(f"Reanalyzed {len(results)} pages in {elapsed:.2f}s "
+                    f"({len(results) / elapsed if elapsed else 0:.1f} pages/s), {changed} themes differ "
+                    f"from {DATA_FILE}; results in {output_file}")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error in reanalyze function: {e}")
+        return False
+
+
+def archived_theme_texts():
+    """
+    Text of every domain's latest archived page, as the analyzer ranks
+    themes from it, so the theme model is trained on what it predicts from
+    rather than on the keywords in the data file.
+
+    Returns:
+        dict: Domain to page text; empty if the archive is disabled
+    """
+    archive = open_archive()
+    if archive is None:
+        return {}
+    try:
+        analyzer = get_analyzer(**analyzer_options())
+        texts = {}
+        for entry in archive.snapshot():
+            html_content = archive.get_blob(entry["content_hash"])
+            if html_content:
+                texts[entry["domain"]] = analyzer.theme_text(html_content)
+        return texts
+    finally:
+        archive.close()
+
+
+def train_themes(labels_file=DATA_FILE):
+    """
+    Train the theme model from labelled site records and store it, so later
+    runs predict themes with it. Sites are represented by the text of their
+    archived page where there is one, and by their keywords otherwise.
+
+    Args:
+        labels_file (str): JSON list of site records with themes, e.g. data.json
+
+    Returns:
+        bool: True if training was successful, False otherwise
+    """
+    try:
+        page_texts = archived_theme_texts()
+        texts, labels = load_labelled(labels_file, page_texts)
+        counts = theme_counts(labels)
+        if len(counts) < 2:
+            logger.error(f"Need examples of at least two themes in {labels_file}, found {counts}")
+            return False
+        logger.info(f"Training theme model on {len(texts)} sites "
+                    f"({len(page_texts)} archived pages available): {counts}")
+
+        # Held-out accuracy on every fifth example, before training on all of them
+        if len(texts) >= 20:
+            held_out = set(range(0, len(texts), 5))
+            train = [i for i in range(len(texts)) if i not in held_out]
+            if len({labels[i] for i in train}) >= 2:
+                model = HashedThemeModel().fit([texts[i] for i in train], [labels[i] for i in train])
+                predicted = model.rank([texts[i] for i in sorted(held_out)])
+                correct = sum(bool(ranked) and ranked[0][0] == labels[i]
+                              for i, ranked in zip(sorted(held_out), predicted))
+                logger.info(f"Theme model held-out accuracy: {correct / len(held_out):.0%}")
+
+        start = time.perf_counter()
+        model = HashedThemeModel().fit(texts, labels)
+        model.save(THEME_MODEL_FILE)
+        logger.info(f"Stored theme model in {THEME_MODEL_FILE} "
+                    f"(trained in {time.perf_counter() - start:.2f}s)")
+        return True
+
+    except Exception as e:
+        logger.error(f"Error in train_themes function: {e}")
+        return False
+
+
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description='Portfolio generator')
+    parser.add_argument('mode', nargs='?', default='one',
+                        choices=['one', 'multi', 'batch', 'retheme', 'reanalyze', 'train-themes'],
+                        help='one: sequential, multi: parallel screenshots, batch: batched fetch and analysis, '
+                             'retheme: reassign themes in the data file from stored document vectors, '
+                             'reanalyze: analyze archived pages again offline, '
+                             'train-themes: train the theme model from labelled sites')
+    parser.add_argument('--profile', default=ANALYSIS_PROFILE, choices=PROFILES,
+                        help='Analysis profile: fast (metadata only, no SpaCy), standard (trimmed SpaCy '
+                             'pipeline) or deep (full pipeline)')
+    parser.add_argument('--labels', default=DATA_FILE,
+                        help='Labelled site records for train-themes (default: the current data file)')
+    parser.add_argument('--date', help='Archive date (YYYY-MM-DD) for reanalyze (default: latest pages)')
+    parser.add_argument('--output', default=REANALYSIS_FILE,
+                        help=f'Results file for reanalyze (default: {REANALYSIS_FILE})')
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    ANALYSIS_PROFILE = args.profile
+
     # Run once
-    success = one()
-    # success = multi()
+    if args.mode == 'multi':
+        success = multi()
+    elif args.mode == 'batch':
+        success = batch()
+    elif args.mode == 'retheme':
+        success = retheme()
+    elif args.mode == 'reanalyze':
+        success = reanalyze(args.date, args.output)
+    elif args.mode == 'train-themes':
+        success = train_themes(args.labels)
+    else:
+        success = one()
 
     if success:
         logger.info("Portfolio generation completed successfully")
     else:
         logger.error("Portfolio generation failed")
-
-
@@ -0,0 +1,179 @@
+#!/bin/python
+# similarity_index.py
+"""
+Cross-portfolio similarity index for "related sites".
+
+Document vectors are L2-normalized into one float32 matrix, so the cosine
+similarity of every site to every other is a matrix product. Queries run
+in blocks of rows, keeping memory at block_size x sites no matter how
+large the portfolio is, and the top k of each row are picked with
+argpartition instead of a full sort. Newly analyzed sites are inserted
+incrementally: only their rows are compared with everything, and the
+existing related lists are merged with the new candidates.
+"""
+import numpy as np
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+DEFAULT_BLOCK_SIZE = 2048
+
+Related = List[Tuple[str, float]]
+
+
+class SimilarityIndex:
+    """
+    Growable matrix of normalized site vectors with blockwise top-k queries.
+    """
+
+    def __init__(self, block_size: int = DEFAULT_BLOCK_SIZE):
+        """
+        Create an empty index.
+
+        Args:
+            block_size (int): Query rows multiplied at once
+        """
+        self.block_size = block_size
+        self.domains: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+
+    def __len__(self) -> int:
+        return len(self.domains)
+
+    def __contains__(self, domain: str) -> bool:
+        return domain in self._rows
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """(sites x dimensions) matrix of normalized vectors, rows in domains order."""
+        return self._matrix[:len(self.domains)]
+
+    def add(self, domains: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Insert or replace site vectors.
+
+        Storage grows by doubling, so inserting sites one batch at a time
+        stays amortized linear.
+
+        Args:
+            domains (sequence): Site domains
+            vectors (np.ndarray): (len(domains) x dimensions) document vectors
+        """
+        if not len(domains):
+            return
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        vectors = vectors / norms
+
+        if not len(self.domains):
+            self._matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+        elif vectors.shape[1] != self._matrix.shape[1]:
+            raise ValueError(f"Vectors of dimension {vectors.shape[1]} do not match "
+                             f"the index dimension {self._matrix.shape[1]}")
+
+        needed = len(self.domains) + sum(1 for domain in set(domains) if domain not in self._rows)
+        if needed > len(self._matrix):
+            grown = np.zeros((max(needed, 2 * len(self._matrix)), vectors.shape[1]), dtype=np.float32)
+            grown[:len(self.domains)] = self.matrix
+            self._matrix = grown
+
+        for domain, vector in zip(domains, vectors):
+            row = self._rows.get(domain)
+            if row is None:
+                row = self._rows[domain] = len(self.domains)
+                self.domains.append(domain)
+            self._matrix[row] = vector
+
+    def _top_k(self, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Columns and scores of the k best entries of every row, best first."""
+        k = min(k, scores.shape[1])
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        return np.take_along_axis(top, order, axis=1), np.take_along_axis(top_scores, order, axis=1)
+
+    def query(self, domains: Iterable[str], k: int = 5) -> Dict[str, Related]:
+        """
+        Most similar other sites of indexed sites.
+
+        Args:
+            domains (iterable): Indexed domains to query
+            k (int): Related sites per domain
+
+        Returns:
+            Dict of domain to (domain, cosine similarity) pairs, best first
+        """
+        rows = [self._rows[domain] for domain in domains if domain in self._rows]
+        related: Dict[str, Related] = {self.domains[row]: [] for row in rows}
+        if len(self.domains) < 2 or k < 1:
+            return related
+
+        matrix = self.matrix
+        for start in range(0, len(rows), self.block_size):
+            block = np.array(rows[start:start + self.block_size])
+            scores = matrix[block] @ matrix.T
+            scores[np.arange(len(block)), block] = -np.inf
+            # Every site but the row itself
+            columns, top_scores = self._top_k(scores, min(k, len(self.domains) - 1))
+            for row, row_columns, row_scores in zip(block, columns, top_scores):
+                related[self.domains[row]] = [(self.domains[column], round(float(score), 4))
+                                              for column, score in zip(row_columns, row_scores)]
+        return related
+
+    def update_related(self, related: Dict[str, Related], new_domains: Iterable[str],
+                       k: int = 5) -> Dict[str, Related]:
+        """
+        Related sites of every indexed site, reusing earlier lists.
+
+        New (or changed) sites are queried against the whole index. Every
+        other site with an earlier list only has its list merged with its
+        similarity to the new sites - a (sites x new sites) product instead
+        of (sites x sites). Lists that referenced changed or removed sites
+        are recomputed.
+
+        Args:
+            related (dict): Earlier related lists, as returned by query()
+            new_domains (iterable): Domains inserted or replaced since
+            k (int): Related sites per domain
+
+        Returns:
+            Dict of domain to (domain, cosine similarity) pairs for every indexed site
+        """
+        if k < 1:
+            return {domain: [] for domain in self.domains}
+        new = [domain for domain in dict.fromkeys(new_domains) if domain in self._rows]
+        new_set = set(new)
+
+        # Sites an unchanged site can have in its list besides the new ones
+        unchanged_others = min(k, len(self.domains) - len(new) - 1)
+
+        kept, stale = {}, []
+        for domain in self.domains:
+            if domain in new_set:
+                continue
+            previous = related.get(domain)
+            valid = [(other, score) for other, score in previous or []
+                     if other in self._rows and other not in new_set]
+            if previous is None or len(valid) < len(previous) or len(valid) < unchanged_others:
+                stale.append(domain)
+            else:
+                kept[domain] = valid
+
+        result = self.query(new + stale, k)
+        if not new or not kept:
+            result.update({domain: valid[:k] for domain, valid in kept.items()})
+            return result
+
+        matrix = self.matrix
+        new_matrix = matrix[[self._rows[domain] for domain in new]]
+        old = list(kept)
+        for start in range(0, len(old), self.block_size):
+            block_domains = old[start:start + self.block_size]
+            scores = matrix[[self._rows[domain] for domain in block_domains]] @ new_matrix.T
+            columns, top_scores = self._top_k(scores, k)
+            for domain, row_columns, row_scores in zip(block_domains, columns, top_scores):
+                candidates = kept[domain] + [(new[column], round(float(score), 4))
+                                             for column, score in zip(row_columns, row_scores)]
+                candidates.sort(key=lambda pair: pair[1], reverse=True)
+                result[domain] = candidates[:k]
+        return result
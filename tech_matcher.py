@@ -0,0 +1,200 @@
+#!/bin/python
+# tech_matcher.py
+"""
+Single-pass multi-pattern matcher for technology detection.
+
+All patterns from tech_patterns.json are compiled once into one automaton
+and the page is scanned once, instead of running a substring search over
+the whole page for every pattern.
+
+The C Aho-Corasick automaton from pyahocorasick is used when installed;
+otherwise the patterns are compiled into one trie-shaped regular
+expression, which Python's regex engine walks character by character.
+"""
+import re
+from typing import Dict, List, Set, Tuple
+
+try:
+    import ahocorasick
+except ImportError:  # optional dependency
+    ahocorasick = None
+
+# Bump whenever the compiled matcher layout changes, so pickled matchers
+# built by older code are not reused
+MATCHER_VERSION = '1'
+
+# Short alphanumeric patterns ("ga", "jest", "less") only match as whole words
+DEFAULT_WORD_BOUNDARY_MAX_LEN = 4
+
+_WORD_RE = re.compile(r'[a-z0-9]+')
+
+
+def _is_word_char(text: str, index: int) -> bool:
+    """True if text[index] exists and is a letter or digit."""
+    return 0 <= index < len(text) and text[index].isalnum()
+
+
+class TechMatcher:
+    """
+    Compiled technology pattern matcher.
+    """
+
+    def __init__(self,
+                 tech_patterns: Dict[str, List[str]],
+                 word_boundary_max_len: int = DEFAULT_WORD_BOUNDARY_MAX_LEN,
+                 use_automaton: bool = True):
+        """
+        Compile technology patterns.
+
+        Args:
+            tech_patterns (dict): Technology names to lists of patterns
+            word_boundary_max_len (int): Alphanumeric patterns up to this
+                length must match as whole words; 0 disables the rule
+            use_automaton (bool): Use pyahocorasick if it is installed
+        """
+        self.word_boundary_max_len = word_boundary_max_len
+        self.tech_patterns = tech_patterns
+
+        # Lowercased pattern -> technologies it indicates
+        self.pattern_techs: Dict[str, Set[str]] = {}
+        for tech, patterns in tech_patterns.items():
+            for pattern in patterns:
+                pattern = pattern.lower()
+                if pattern:
+                    self.pattern_techs.setdefault(pattern, set()).add(tech)
+
+        self.bounded = {p for p in self.pattern_techs if self._needs_boundary(p)}
+
+        if use_automaton and ahocorasick is not None:
+            self.engine = 'aho-corasick'
+            self._automaton = self._build_automaton()
+        else:
+            self.engine = 'regex'
+            self._regex = re.compile('(?=(' + self._trie_regex(self._build_trie()) + '))')
+            self._contained = {p: self._contained_patterns(p) for p in self.pattern_techs}
+
+    def _needs_boundary(self, pattern: str) -> bool:
+        """Whether a pattern is short and alphanumeric enough to need word boundaries."""
+        return len(pattern) <= self.word_boundary_max_len and bool(_WORD_RE.fullmatch(pattern))
+
+    def _build_automaton(self):
+        """Build a pyahocorasick automaton over all patterns."""
+        automaton = ahocorasick.Automaton()
+        for pattern in self.pattern_techs:
+            automaton.add_word(pattern, pattern)
+        automaton.make_automaton()
+        return automaton
+
+    def _build_trie(self) -> Dict:
+        """Build a character trie of all patterns; '' marks the end of a pattern."""
+        trie = {}
+        for pattern in self.pattern_techs:
+            node = trie
+            for char in pattern:
+                node = node.setdefault(char, {})
+            node[''] = True
+        return trie
+
+    def _trie_regex(self, node: Dict) -> str:
+        """
+        Turn a trie into a regex that matches the longest pattern at a position.
+
+        Args:
+            node (dict): Trie node
+
+        Returns:
+            str: Regex source for the subtree
+        """
+        branches = [re.escape(char) + self._trie_regex(child)
+                    for char, child in sorted(node.items()) if char != '']
+        if not branches:
+            return ''
+
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        if '' in node:
+            # A pattern ends here; longer continuations are optional (greedy)
+            return '(?:' + body + ')?'
+        return body
+
+    def _contained_patterns(self, pattern: str) -> List[Tuple[str, int]]:
+        """
+        All patterns occurring inside pattern, with their offsets.
+
+        The regex reports only the longest pattern starting at each position,
+        so every shorter pattern inside it is checked from this list.
+        """
+        contained = []
+        for other in self.pattern_techs:
+            start = pattern.find(other)
+            while start != -1:
+                contained.append((other, start))
+                start = pattern.find(other, start + 1)
+        return contained
+
+    def _accept(self, text: str, pattern: str, start: int) -> bool:
+        """Check the word-boundary rule for a pattern occurrence at start."""
+        if pattern not in self.bounded:
+            return True
+        return not _is_word_char(text, start - 1) and not _is_word_char(text, start + len(pattern))
+
+    def match(self, html_content: str) -> List[str]:
+        """
+        Detect technologies in one pass over the document.
+
+        Args:
+            html_content (str): Website HTML content
+
+        Returns:
+            Sorted list of detected technologies
+        """
+        text = html_content.lower()
+        matched: Set[str] = set()
+
+        if self.engine == 'aho-corasick':
+            for end, pattern in self._automaton.iter(text):
+                if pattern not in matched and self._accept(text, pattern, end - len(pattern) + 1):
+                    matched.add(pattern)
+        else:
+            # Longest matches whose contained patterns have all been found
+            exhausted: Set[str] = set()
+            for match in self._regex.finditer(text):
+                longest = match.group(1)
+                if longest in exhausted:
+                    continue
+                start = match.start()
+                contained = self._contained[longest]
+                for pattern, offset in contained:
+                    if pattern not in matched and self._accept(text, pattern, start + offset):
+                        matched.add(pattern)
+                if all(pattern in matched for pattern, _ in contained):
+                    exhausted.add(longest)
+
+        detected: Set[str] = set()
+        for pattern in matched:
+            detected.update(self.pattern_techs[pattern])
+        return sorted(detected)
+
+
+def detect_technologies_loop(tech_patterns: Dict[str, List[str]], html_content: str) -> List[str]:
+    """
+    Reference implementation: one substring scan of the page per pattern.
+
+    Kept for benchmarking and for checking TechMatcher against it.
+
+    Args:
+        tech_patterns (dict): Technology names to lists of patterns
+        html_content (str): Website HTML content
+
+    Returns:
+        Sorted list of detected technologies
+    """
+    html_str = html_content.lower()
+    detected_techs = set()
+
+    for tech, patterns in tech_patterns.items():
+        for pattern in patterns:
+            if pattern.lower() in html_str:
+                detected_techs.add(tech)
+                break
+
+    return sorted(detected_techs)
@@ -0,0 +1,222 @@
+#!/bin/python
+# tech_registry.py
+"""
+Technology pattern registry.
+
+tech_patterns.json is the single source of technology patterns, and
+tech_signals.json adds patterns scoped to response headers and cookies.
+The registry loads them, validates and dedupes the entries, and compiles
+them into a TechMatcher or SignalTechDetector. Compiled matchers are
+pickled into artifacts keyed by a hash of the pattern files and the
+matcher settings, so later analyzers load them in milliseconds instead of
+re-parsing and re-compiling patterns.
+"""
+import os
+import json
+import pickle
+import logging
+import tempfile
+from typing import Dict, List, Optional
+
+from analysis_cache import content_hash, file_hash
+from tech_matcher import MATCHER_VERSION, TechMatcher, ahocorasick
+from tech_signals import SIGNAL_SCOPES, SignalTechDetector
+
+DEFAULT_TECH_PATTERNS_FILE = 'tech_patterns.json'
+DEFAULT_TECH_SIGNALS_FILE = 'tech_signals.json'
+
+
+def _merge_duplicate_keys(pairs: List) -> Dict:
+    """json object_pairs_hook: merge repeated technology keys instead of keeping the last one."""
+    merged: Dict = {}
+    for key, value in pairs:
+        if key in merged and isinstance(merged[key], list) and isinstance(value, list):
+            logging.warning(f"Duplicate technology {key!r} in pattern file; merging its patterns")
+            merged[key] = merged[key] + value
+        else:
+            merged[key] = value
+    return merged
+
+
+def _read_json(filename: str):
+    """Read a pattern file, merging repeated keys; None if it cannot be read."""
+    try:
+        with open(filename, 'r', encoding='utf-8') as f:
+            return json.load(f, object_pairs_hook=_merge_duplicate_keys)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.error(f"Error loading {filename}: {e}")
+        return None
+
+
+def _validate(raw, filename: str) -> Dict[str, List[str]]:
+    """
+    Validate and dedupe one technology -> patterns mapping.
+
+    Patterns are lowercased and stripped; empty and non-string patterns,
+    and technologies without a list of patterns, are dropped with a warning.
+    """
+    if not isinstance(raw, dict):
+        logging.error(f"Error loading {filename}: expected an object of technology names to patterns")
+        return {}
+
+    tech_patterns = {}
+    for tech, patterns in raw.items():
+        if not isinstance(patterns, list):
+            logging.warning(f"Technology {tech!r} in {filename} has no pattern list; skipped")
+            continue
+
+        unique = []
+        for pattern in patterns:
+            if not isinstance(pattern, str) or not pattern.strip():
+                logging.warning(f"Invalid pattern {pattern!r} for {tech!r} in {filename}; skipped")
+                continue
+            pattern = pattern.strip().lower()
+            if pattern not in unique:
+                unique.append(pattern)
+
+        if unique:
+            tech_patterns[tech] = unique
+    return tech_patterns
+
+
+def load_patterns(filename: str = DEFAULT_TECH_PATTERNS_FILE) -> Dict[str, List[str]]:
+    """
+    Load, validate and dedupe technology patterns.
+
+    Args:
+        filename (str): Technology patterns JSON
+
+    Returns:
+        Dict of technology names to unique patterns, empty if the file cannot be read
+    """
+    raw = _read_json(filename)
+    return _validate(raw, filename) if raw is not None else {}
+
+
+def load_signal_patterns(filename: str = DEFAULT_TECH_SIGNALS_FILE) -> Dict[str, Dict[str, List[str]]]:
+    """
+    Load, validate and dedupe scoped technology patterns.
+
+    Args:
+        filename (str): JSON object of signal scope to technology patterns
+
+    Returns:
+        Dict of scope name to technology patterns; unknown scopes are dropped
+    """
+    raw = _read_json(filename)
+    if not isinstance(raw, dict):
+        return {}
+
+    scoped = {}
+    for scope, patterns in raw.items():
+        if scope not in SIGNAL_SCOPES:
+            logging.warning(f"Unknown signal scope {scope!r} in {filename}; expected one of {SIGNAL_SCOPES}")
+            continue
+        scoped[scope] = _validate(patterns, filename)
+    return scoped
+
+
+def matcher_path(cache_dir: str, filenames: List[str], kind: str = 'tech_matcher', **matcher_options) -> str:
+    """
+    Location of a compiled matcher artifact.
+
+    The file name encodes the pattern file hashes, the matcher version and
+    options, and which engine is available, so any change picks a new file.
+
+    Args:
+        cache_dir (str): Artifact directory
+        filenames (list): Pattern files the matcher is compiled from
+        kind (str): Artifact name prefix
+        **matcher_options: TechMatcher keyword arguments
+
+    Returns:
+        str: Path of the .pickle artifact
+    """
+    engine = 'aho-corasick' if ahocorasick is not None and matcher_options.get('use_automaton', True) else 'regex'
+    parts = [file_hash(filename) for filename in filenames]
+    parts.extend([MATCHER_VERSION, engine, repr(sorted(matcher_options.items()))])
+    return os.path.join(cache_dir, f"{kind}-{content_hash(chr(0).join(parts))[:16]}.pickle")
+
+
+def _load_artifact(artifact: Optional[str], expected_type):
+    """Unpickle a compiled matcher; None if missing, unreadable or of another type."""
+    if not artifact or not os.path.exists(artifact):
+        return None
+    try:
+        with open(artifact, 'rb') as f:
+            matcher = pickle.load(f)
+        if isinstance(matcher, expected_type):
+            return matcher
+    except Exception as e:
+        logging.error(f"Error loading technology matcher {artifact}: {e}")
+    return None
+
+
+def _store_artifact(artifact: str, matcher) -> None:
+    """Atomically pickle a compiled matcher."""
+    cache_dir = os.path.dirname(artifact) or '.'
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix='.pickle.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(matcher, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, artifact)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        logging.info(f"Stored technology matcher in {artifact}")
+    except Exception as e:
+        logging.error(f"Error storing technology matcher {artifact}: {e}")
+
+
+def load_matcher(filename: str = DEFAULT_TECH_PATTERNS_FILE,
+                 cache_dir: Optional[str] = None,
+                 **matcher_options) -> TechMatcher:
+    """
+    Compiled matcher for a pattern file, from the artifact cache if possible.
+
+    Args:
+        filename (str): Technology patterns JSON
+        cache_dir (str, optional): Artifact directory; without it the
+            matcher is compiled every time
+        **matcher_options: TechMatcher keyword arguments
+
+    Returns:
+        TechMatcher: Compiled matcher
+    """
+    artifact = matcher_path(cache_dir, [filename], **matcher_options) if cache_dir else None
+    matcher = _load_artifact(artifact, TechMatcher)
+    if matcher is None:
+        matcher = TechMatcher(load_patterns(filename), **matcher_options)
+        if artifact:
+            _store_artifact(artifact, matcher)
+    return matcher
+
+
+def load_signal_detector(filename: str = DEFAULT_TECH_PATTERNS_FILE,
+                         signals_file: str = DEFAULT_TECH_SIGNALS_FILE,
+                         cache_dir: Optional[str] = None,
+                         **matcher_options) -> SignalTechDetector:
+    """
+    Compiled signal detector, from the artifact cache if possible.
+
+    Args:
+        filename (str): Technology patterns JSON, for scopes without their own patterns
+        signals_file (str): Scoped patterns JSON
+        cache_dir (str, optional): Artifact directory; without it the
+            detector is compiled every time
+        **matcher_options: TechMatcher keyword arguments
+
+    Returns:
+        SignalTechDetector: Compiled detector
+    """
+    artifact = (matcher_path(cache_dir, [filename, signals_file], kind='tech_signals', **matcher_options)
+                if cache_dir else None)
+    detector = _load_artifact(artifact, SignalTechDetector)
+    if detector is None:
+        detector = SignalTechDetector(load_patterns(filename), load_signal_patterns(signals_file),
+                                      **matcher_options)
+        if artifact:
+            _store_artifact(artifact, detector)
+    return detector
@@ -0,0 +1,167 @@
+#!/bin/python
+# tech_signals.py
+"""
+Technology detection from structured page signals.
+
+Instead of searching the whole page, only the places where technologies
+actually show up are scanned:
+
+    asset    - attributes of <script> and <link> tags (src, href, rel, type)
+    meta     - <meta> names/properties and the generator content
+    inline   - bodies of inline <script> elements (globals, init calls)
+    header   - response headers, as "name: value" lines
+    cookie   - names of cookies set by the response, as "name=" lines, so
+               a pattern ending in "=" matches a whole name rather than
+               every name starting with it
+
+Body text is never looked at, so a page mentioning "python" or "express"
+in prose is not reported as using them, and far less text is matched.
+Every scope has its own patterns; scopes without their own patterns use
+the flat technology patterns.
+"""
+import re
+from typing import Dict, Iterable, List, Mapping, Optional
+
+from tech_matcher import TechMatcher
+
+SIGNAL_SCOPES = ('asset', 'meta', 'inline', 'header', 'cookie')
+
+# Characters of a single inline script scanned at most; framework globals
+# and init calls sit at the start, bundled code after them is not useful
+MAX_INLINE_SCRIPT_CHARS = 20000
+
+_TAG_RE = re.compile(r'<(script|link|meta)\b([^>]*)>', re.IGNORECASE)
+_SCRIPT_END_RE = re.compile(r'</script\s*>', re.IGNORECASE)
+_ATTR_RE = re.compile(r'''([^\s=/>"']+)(?:\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+)))?''')
+
+
+def _attributes(source: str) -> Dict[str, str]:
+    """Parse the attribute part of a tag into a lowercased-name dict."""
+    attributes = {}
+    for match in _ATTR_RE.finditer(source):
+        value = match.group(2)
+        if value is None:
+            value = match.group(3) if match.group(3) is not None else (match.group(4) or '')
+        attributes.setdefault(match.group(1).lower(), value)
+    return attributes
+
+
+def collect_signals(html_content: str,
+                    headers: Optional[Mapping[str, str]] = None,
+                    cookies: Optional[Iterable[str]] = None) -> Dict[str, str]:
+    """
+    Collect the text of every signal scope in one pass over the tags.
+
+    Args:
+        html_content (str): Website HTML content
+        headers (mapping, optional): Response headers
+        cookies (iterable, optional): Names of cookies set by the response
+
+    Returns:
+        Dict of scope name to the newline-joined signal text of that scope
+    """
+    signals: Dict[str, List[str]] = {scope: [] for scope in SIGNAL_SCOPES}
+
+    position = 0
+    while True:
+        match = _TAG_RE.search(html_content, position)
+        if match is None:
+            break
+        tag = match.group(1).lower()
+        position = match.end()
+
+        if tag == 'meta':
+            attributes = _attributes(match.group(2))
+            name = attributes.get('name') or attributes.get('property') or attributes.get('http-equiv')
+            if name:
+                signals['meta'].append(name)
+                if name.lower() == 'generator':
+                    signals['meta'].append(attributes.get('content', ''))
+            continue
+
+        # Raw attribute text of <script>/<link>: src, href, rel, type, ...
+        signals['asset'].append(match.group(2))
+
+        if tag == 'script':
+            end = _SCRIPT_END_RE.search(html_content, position)
+            body_end = end.start() if end else len(html_content)
+            if body_end > position and 'src' not in _attributes(match.group(2)):
+                signals['inline'].append(html_content[position:min(body_end, position + MAX_INLINE_SCRIPT_CHARS)])
+            # Tags inside script bodies are not tags
+            position = end.end() if end else len(html_content)
+
+    if headers:
+        signals['header'].extend(f"{name}: {value}" for name, value in headers.items())
+    if cookies:
+        signals['cookie'].extend(f"{name}=" for name in cookies)
+
+    return {scope: '\n'.join(parts) for scope, parts in signals.items()}
+
+
+class SignalTechDetector:
+    """
+    Technology detector matching scoped patterns against page signals.
+    """
+
+    def __init__(self,
+                 tech_patterns: Dict[str, List[str]],
+                 scoped_patterns: Optional[Dict[str, Dict[str, List[str]]]] = None,
+                 **matcher_options):
+        """
+        Compile one matcher per scope.
+
+        Args:
+            tech_patterns (dict): Flat technology patterns, used by scopes
+                without their own patterns
+            scoped_patterns (dict, optional): Scope name to technology patterns
+            **matcher_options: TechMatcher keyword arguments
+        """
+        scoped_patterns = scoped_patterns or {}
+        self.tech_patterns = tech_patterns
+        self.scoped_patterns = scoped_patterns
+
+        # Scopes on the flat patterns share one compiled matcher
+        flat = TechMatcher(tech_patterns, **matcher_options)
+        self.matchers: Dict[str, TechMatcher] = {
+            scope: TechMatcher(scoped_patterns[scope], **matcher_options) if scope in scoped_patterns else flat
+            for scope in SIGNAL_SCOPES
+        }
+
+    def match_signals(self,
+                      html_content: str,
+                      headers: Optional[Mapping[str, str]] = None,
+                      cookies: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """
+        Technologies detected in each signal scope.
+
+        Args:
+            html_content (str): Website HTML content
+            headers (mapping, optional): Response headers
+            cookies (iterable, optional): Names of cookies set by the response
+
+        Returns:
+            Dict of scope name to sorted detected technologies
+        """
+        signals = collect_signals(html_content, headers, cookies)
+        return {scope: self.matchers[scope].match(text) if text else []
+                for scope, text in signals.items()}
+
+    def match(self,
+              html_content: str,
+              headers: Optional[Mapping[str, str]] = None,
+              cookies: Optional[Iterable[str]] = None) -> List[str]:
+        """
+        Detect technologies from the signals of a page.
+
+        Args:
+            html_content (str): Website HTML content
+            headers (mapping, optional): Response headers
+            cookies (iterable, optional): Names of cookies set by the response
+
+        Returns:
+            Sorted list of detected technologies
+        """
+        detected = set()
+        for techs in self.match_signals(html_content, headers, cookies).values():
+            detected.update(techs)
+        return sorted(detected)
@@ -0,0 +1,6 @@
+import os
+import sys
+
+# The modules live in the repository root, next to their pattern files
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
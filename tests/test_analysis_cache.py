@@ -0,0 +1,49 @@
+import os
+
+import pytest
+
+from conftest import ROOT
+
+pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+pytest.importorskip("spacy")
+pytest.importorskip("en_core_web_sm")
+
+from AdvancedContentAnalyzer import AdvancedContentAnalyzer, analyze_content, analyze_content_batch  # noqa: E402
+from analysis_cache import AnalysisCache  # noqa: E402
+
+HTML = ("<html><head><title>Software development</title>"
+        "<meta name=\"description\" content=\"Custom software development and tech innovation\"></head>"
+        "<body><p>Custom software development for small businesses.</p></body></html>")
+PHP = {"headers": {"X-Powered-By": "PHP/8.2"}, "cookies": []}
+EXPRESS = {"headers": {"X-Powered-By": "Express"}, "cookies": []}
+
+
+def analyzer():
+    return AdvancedContentAnalyzer(tech_patterns_file=os.path.join(ROOT, 'tech_patterns.json'),
+                                   tech_signals_file=os.path.join(ROOT, 'tech_signals.json'),
+                                   themes_file=os.path.join(ROOT, 'common_themes.json'),
+                                   profile='fast', languages_file=None)
+
+
+def test_cache_hit_detects_technologies_from_its_response(tmp_path):
+    cache = AnalysisCache(str(tmp_path / 'analysis.sqlite'), fingerprint='test')
+    shared = analyzer()
+
+    first = analyze_content(HTML, analyzer=shared, cache=cache, response=PHP)
+    second = analyze_content(HTML, analyzer=shared, cache=cache, response=EXPRESS)
+
+    assert cache.stats()['hits'] == 1
+    assert "PHP" in first['technologies'] and "Express" not in first['technologies']
+    assert "Express" in second['technologies'] and "PHP" not in second['technologies']
+
+
+def test_batch_cache_hit_detects_technologies_from_its_response(tmp_path):
+    cache = AnalysisCache(str(tmp_path / 'analysis.sqlite'), fingerprint='test')
+    shared = analyzer()
+
+    analyze_content_batch([HTML], analyzer=shared, cache=cache, responses=[PHP])
+    [result] = analyze_content_batch([HTML], analyzer=shared, cache=cache, responses=[EXPRESS])
+
+    assert cache.stats()['hits'] == 1
+    assert "Express" in result['technologies'] and "PHP" not in result['technologies']
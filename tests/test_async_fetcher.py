@@ -0,0 +1,22 @@
+import pytest
+
+pytest.importorskip("aiohttp")
+
+from async_fetcher import AsyncFetcher  # noqa: E402
+
+
+class FailingFetcher(AsyncFetcher):
+    """Fails one URL with an error fetch() does not handle itself."""
+
+    async def fetch(self, session, url, slots=None):
+        if url == "https://broken.example":
+            raise RuntimeError("unexpected")
+        return f"<html>{url}</html>", {"headers": {}, "cookies": []}
+
+
+def test_failed_url_does_not_end_the_run():
+    pages = FailingFetcher().fetch_all(["https://a.example", "https://broken.example", "https://b.example"])
+
+    assert pages[0][0] == "<html>https://a.example</html>"
+    assert pages[1] == (None, {})
+    assert pages[2][0] == "<html>https://b.example</html>"
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from conftest import ROOT
+
+pytest.importorskip("numpy")
+pytest.importorskip("sklearn")
+pytest.importorskip("spacy")
+pytest.importorskip("en_core_web_sm")
+
+from AdvancedContentAnalyzer import AdvancedContentAnalyzer  # noqa: E402
+
+PAGE = ("<html><head><title>Software development</title></head>"
+        "<body><p>Custom software development and web design for small businesses.</p></body></html>")
+STOP_WORDS_PAGE = "<html><head><title>The</title></head><body><p>and of the</p></body></html>"
+
+
+def analyzer():
+    return AdvancedContentAnalyzer(tech_patterns_file=os.path.join(ROOT, 'tech_patterns.json'),
+                                   tech_signals_file=os.path.join(ROOT, 'tech_signals.json'),
+                                   themes_file=os.path.join(ROOT, 'common_themes.json'),
+                                   profile='standard', languages_file=None)
+
+
+def test_blank_texts_do_not_empty_the_batch():
+    scores = analyzer()._score_keywords(["", "custom software development services", "   ", "and of the"])
+
+    assert scores[0] == [] and scores[2] == [] and scores[3] == []
+    assert "software" in [keyword for keyword, _ in scores[1]]
+
+
+def test_page_without_keywords_does_not_empty_the_batch():
+    results = analyzer().analyze_many([PAGE, STOP_WORDS_PAGE, PAGE])
+
+    assert results[0]["keywords"] and results[2]["keywords"]
+    assert results[1]["keywords"] == []
@@ -0,0 +1,25 @@
+import os
+
+from conftest import ROOT
+from tech_registry import load_patterns, load_signal_patterns
+from tech_signals import SignalTechDetector
+
+HTML = "<html><head><title>Example</title></head><body><p>Hello</p></body></html>"
+
+
+def detector():
+    return SignalTechDetector(load_patterns(os.path.join(ROOT, 'tech_patterns.json')),
+                              load_signal_patterns(os.path.join(ROOT, 'tech_signals.json')))
+
+
+def test_google_analytics_cookies():
+    assert "Google Analytics" in detector().match(HTML, cookies=["_ga"])
+    assert "Google Analytics" in detector().match(HTML, cookies=["_ga_ABC123"])
+
+
+def test_adsense_cookies_are_not_google_analytics():
+    assert "Google Analytics" not in detector().match(HTML, cookies=["_gads", "_gac_UA-1234"])
+
+
+def test_cookie_prefix_patterns_still_match():
+    assert "WordPress" in detector().match(HTML, cookies=["wordpress_logged_in_abc"])
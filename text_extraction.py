@@ -0,0 +1,433 @@
+#!/bin/python
+# text_extraction.py
+"""
+HTML-to-text extraction engines.
+
+The analyzer only needs the visible text of a page, so the default engines
+are event-based: they stream through the document without building a tree
+and drop the contents of non-visible elements (<script>, <style>, ...),
+which would otherwise pollute keywords and inflate the text sent to SpaCy.
+
+Engines:
+    streaming      - stdlib html.parser, event-based
+    lxml           - lxml parser target interface (C speed), if installed
+    beautifulsoup  - previous behavior: full tree, then get_text()
+
+The event-based engines can also strip boilerplate (navigation, cookie
+banners, footers, link lists) and keep the main content of the page, and
+cap the amount of text handed on to NLP.
+"""
+import re
+from abc import ABC, abstractmethod
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple
+
+try:
+    from lxml import etree
+except ImportError:  # optional dependency
+    etree = None
+
+# Elements whose contents are never rendered as text. Only elements that
+# always have an end tag belong here; a void element would never be closed.
+SKIP_TAGS = frozenset([
+    'script', 'style', 'noscript', 'template', 'svg', 'math',
+    'iframe', 'object', 'canvas'
+])
+
+# Elements without an end tag
+VOID_TAGS = frozenset([
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+])
+
+# Elements that are boilerplate by definition
+BOILERPLATE_TAGS = frozenset(['nav', 'footer', 'aside', 'form', 'dialog', 'button', 'select'])
+BOILERPLATE_ROLES = frozenset(['navigation', 'contentinfo', 'complementary', 'dialog', 'alertdialog'])
+BOILERPLATE_HINT = re.compile(
+    r'cookie|consent|gdpr|navbar|menu|breadcrumb|footer|sidebar|social|share|'
+    r'popup|modal|newsletter|subscribe', re.IGNORECASE
+)
+
+# Elements holding the main content of a page
+PRIMARY_TAGS = frozenset(['title', 'h1', 'header', 'main', 'article'])
+
+# Blocks checked for link density, and elements closed implicitly by a sibling
+BLOCK_TAGS = frozenset(['div', 'section', 'ul', 'ol', 'li', 'p', 'table', 'tr', 'td', 'dl'])
+IMPLICITLY_CLOSED_TAGS = frozenset(['li', 'p', 'td', 'th', 'tr', 'dt', 'dd', 'option'])
+
+# Blocks whose text is mostly link text are menus or link lists
+LINK_DENSITY_THRESHOLD = 0.6
+
+# Main content shorter than this is not trusted; the whole page is used
+MIN_PRIMARY_CHARS = 200
+
+# Size of the chunks fed to incremental parsers
+CHUNK_SIZE = 64 * 1024
+
+
+def truncate_text(text: str, max_chars: Optional[int]) -> str:
+    """Cut text to at most max_chars characters, at a word boundary."""
+    if not max_chars or len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(' ')
+    return cut[:space] if space > 0 else cut
+
+
+class TextCollector:
+    """
+    Parser event sink collecting visible text.
+
+    The start/end/data/close methods follow the lxml parser target
+    interface, so the collector can be used by any event-based parser.
+    """
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self._skip_depth = 0
+
+    def start(self, tag: str, attrib: Optional[Dict[str, str]] = None) -> None:
+        """Handle an opening tag."""
+        if tag.lower() in SKIP_TAGS:
+            self._skip_depth += 1
+
+    def end(self, tag: str) -> None:
+        """Handle a closing tag."""
+        if tag.lower() in SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+
+    def data(self, data: str) -> None:
+        """Handle a run of character data."""
+        if self._skip_depth:
+            return
+        data = data.strip()
+        if data:
+            self.parts.append(data)
+
+    def close(self) -> str:
+        """Return the collected text."""
+        return ' '.join(self.parts)
+
+
+class MainContentCollector:
+    """
+    Parser event sink that keeps the main content of a page.
+
+    Boilerplate is dropped as the document streams past: semantic
+    boilerplate elements (<nav>, <footer>, <aside>, ...), elements whose
+    id/class/role hints at menus, cookie banners and the like, and blocks
+    whose text is mostly link text. If the page has enough text inside
+    <main>, <article>, <header> and <h1> (plus the <title>), only that is
+    returned; otherwise all remaining text is. If stripping removes
+    everything, the whole page text is used. The result is capped at
+    max_chars characters.
+    """
+
+    def __init__(self, max_chars: Optional[int] = None):
+        self.max_chars = max_chars
+
+        # (text, inside a link, inside main content)
+        self.parts: List[Tuple[str, bool, bool]] = []
+
+        # Every visible piece of text, for pages where stripping removes too much
+        self.all_parts: List[str] = []
+
+        # Open elements: [tag, index into parts, is boilerplate]
+        self._stack: List[list] = []
+        self._skip_depth = 0
+        self._boilerplate_depth = 0
+        self._primary_depth = 0
+        self._link_depth = 0
+
+    @staticmethod
+    def _is_boilerplate(tag: str, attrib: Optional[Dict[str, str]]) -> bool:
+        """Decide from the tag and its attributes whether an element is boilerplate."""
+        if tag in BOILERPLATE_TAGS:
+            return True
+        if not attrib:
+            return False
+        if (attrib.get('role') or '').lower() in BOILERPLATE_ROLES:
+            return True
+        hints = ' '.join(attrib.get(name) or '' for name in ('id', 'class'))
+        return bool(hints and BOILERPLATE_HINT.search(hints))
+
+    def start(self, tag: str, attrib: Optional[Dict[str, str]] = None) -> None:
+        """Handle an opening tag."""
+        tag = tag.lower()
+        if tag in VOID_TAGS:
+            return
+
+        # <li>, <p>, ... are often left unclosed before the next sibling
+        if tag in IMPLICITLY_CLOSED_TAGS and self._stack and self._stack[-1][0] == tag:
+            self.end(tag)
+
+        boilerplate = self._is_boilerplate(tag, attrib)
+        self._stack.append([tag, len(self.parts), boilerplate])
+        self._skip_depth += tag in SKIP_TAGS
+        self._boilerplate_depth += boilerplate
+        self._primary_depth += tag in PRIMARY_TAGS
+        self._link_depth += tag == 'a'
+
+    def end(self, tag: str) -> None:
+        """Handle a closing tag, closing any elements left open inside it."""
+        tag = tag.lower()
+        if tag in VOID_TAGS:
+            return
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                while len(self._stack) > depth:
+                    self._close_element(self._stack.pop())
+                return
+
+    def _close_element(self, element: list) -> None:
+        """Update state for a closed element and drop it if it is a link list."""
+        tag, start, boilerplate = element
+        self._skip_depth -= tag in SKIP_TAGS
+        self._boilerplate_depth -= boilerplate
+        self._primary_depth -= tag in PRIMARY_TAGS
+        self._link_depth -= tag == 'a'
+
+        if tag in BLOCK_TAGS and len(self.parts) > start:
+            block = self.parts[start:]
+            total = sum(len(text) for text, _, _ in block)
+            links = sum(len(text) for text, in_link, _ in block if in_link)
+            if links > total * LINK_DENSITY_THRESHOLD:
+                del self.parts[start:]
+
+    def data(self, data: str) -> None:
+        """Handle a run of character data."""
+        if self._skip_depth:
+            return
+        data = data.strip()
+        if not data:
+            return
+        self.all_parts.append(data)
+        if not self._boilerplate_depth:
+            self.parts.append((data, self._link_depth > 0, self._primary_depth > 0))
+
+    def close(self) -> str:
+        """Return the main content text, capped at max_chars."""
+        while self._stack:
+            self._close_element(self._stack.pop())
+
+        primary = ' '.join(text for text, _, in_primary in self.parts if in_primary)
+        if len(primary) >= MIN_PRIMARY_CHARS:
+            text = primary
+        else:
+            text = ' '.join(text for text, _, _ in self.parts)
+
+        if not text:
+            # Stripping left nothing to work with; keep the whole page
+            text = ' '.join(self.all_parts)
+
+        return truncate_text(text, self.max_chars)
+
+
+class MetadataCollector:
+    """
+    Parser event sink collecting page metadata from the document head:
+    the <title>, meta description/keywords and Open Graph (og:*) tags.
+    """
+
+    META_NAMES = frozenset(['description', 'keywords'])
+
+    def __init__(self):
+        self.metadata: Dict[str, str] = {}
+        self.done = False
+        self._title_parts: List[str] = []
+        self._in_title = False
+
+    def start(self, tag: str, attrib: Optional[Dict[str, str]] = None) -> None:
+        """Handle an opening tag."""
+        tag = tag.lower()
+        attrib = attrib or {}
+        if tag == 'title':
+            self._in_title = True
+        elif tag == 'meta':
+            name = (attrib.get('name') or attrib.get('property') or '').lower()
+            content = (attrib.get('content') or '').strip()
+            if content and (name in self.META_NAMES or name.startswith('og:')):
+                self.metadata.setdefault(name, content)
+        elif tag == 'body':
+            self.done = True
+
+    def end(self, tag: str) -> None:
+        """Handle a closing tag."""
+        tag = tag.lower()
+        if tag == 'title':
+            self._in_title = False
+        elif tag == 'head':
+            self.done = True
+
+    def data(self, data: str) -> None:
+        """Handle a run of character data."""
+        if self._in_title and data.strip():
+            self._title_parts.append(data.strip())
+
+    def close(self) -> Dict[str, str]:
+        """Return the collected metadata."""
+        if self._title_parts:
+            self.metadata.setdefault('title', ' '.join(self._title_parts))
+        return self.metadata
+
+
+def extract_metadata(html_content: str) -> Dict[str, str]:
+    """
+    Extract title, meta description/keywords and og:* tags of a page.
+
+    Parsing stops at the end of the document head, so the cost does not
+    grow with the size of the page body.
+
+    Args:
+        html_content (str): Website HTML content
+
+    Returns:
+        Dict of metadata names ('title', 'description', 'og:title', ...) to values
+    """
+    collector = MetadataCollector()
+    parser = _CollectingHTMLParser(collector)
+    for start in range(0, len(html_content), CHUNK_SIZE):
+        parser.feed(html_content[start:start + CHUNK_SIZE])
+        if collector.done:
+            break
+    else:
+        parser.close()
+    return collector.close()
+
+
+class TextExtractor(ABC):
+    """
+    Base class of HTML-to-text engines.
+    """
+
+    name = 'base'
+
+    def __init__(self, strip_boilerplate: bool = False, max_chars: Optional[int] = None):
+        """
+        Args:
+            strip_boilerplate (bool): Keep only the main content of the page
+            max_chars (int, optional): Cap on the length of the extracted text
+        """
+        self.strip_boilerplate = strip_boilerplate
+        self.max_chars = max_chars
+
+    def _new_collector(self):
+        """Create the parser event sink for one document."""
+        if self.strip_boilerplate:
+            return MainContentCollector(self.max_chars)
+        return TextCollector()
+
+    @abstractmethod
+    def extract(self, html_content: str) -> str:
+        """
+        Extract visible text from HTML.
+
+        Args:
+            html_content (str): Website HTML content
+
+        Returns:
+            str: Text content of the page
+        """
+
+
+class _CollectingHTMLParser(HTMLParser):
+    """html.parser front end forwarding events to a TextCollector."""
+
+    def __init__(self, collector: TextCollector):
+        super().__init__(convert_charrefs=True)
+        self.collector = collector
+
+    def handle_starttag(self, tag, attrs):
+        self.collector.start(tag, dict(attrs))
+
+    def handle_endtag(self, tag):
+        self.collector.end(tag)
+
+    def handle_data(self, data):
+        self.collector.data(data)
+
+
+class StreamingTextExtractor(TextExtractor):
+    """
+    Event-based extractor on the standard library html.parser.
+    """
+
+    name = 'streaming'
+
+    def extract(self, html_content: str) -> str:
+        collector = self._new_collector()
+        parser = _CollectingHTMLParser(collector)
+        for start in range(0, len(html_content), CHUNK_SIZE):
+            parser.feed(html_content[start:start + CHUNK_SIZE])
+        parser.close()
+        return truncate_text(collector.close(), self.max_chars)
+
+
+class LxmlTextExtractor(TextExtractor):
+    """
+    Event-based extractor on lxml's HTML parser target interface.
+    """
+
+    name = 'lxml'
+
+    def __init__(self, strip_boilerplate: bool = False, max_chars: Optional[int] = None):
+        if etree is None:
+            raise ImportError("lxml is not installed")
+        super().__init__(strip_boilerplate, max_chars)
+
+    def extract(self, html_content: str) -> str:
+        collector = self._new_collector()
+        parser = etree.HTMLParser(target=collector)
+        for start in range(0, len(html_content), CHUNK_SIZE):
+            parser.feed(html_content[start:start + CHUNK_SIZE])
+        return truncate_text(parser.close(), self.max_chars)
+
+
+class BeautifulSoupTextExtractor(TextExtractor):
+    """
+    Previous behavior: build a full html.parser tree, then call get_text().
+
+    Boilerplate stripping is not supported; only max_chars applies.
+    """
+
+    name = 'beautifulsoup'
+
+    def __init__(self, strip_boilerplate: bool = False, max_chars: Optional[int] = None):
+        from bs4 import BeautifulSoup
+        self._soup_class = BeautifulSoup
+        super().__init__(False, max_chars)
+
+    def extract(self, html_content: str) -> str:
+        soup = self._soup_class(html_content, 'html.parser')
+        return truncate_text(soup.get_text(separator=' ', strip=True), self.max_chars)
+
+
+EXTRACTORS = {
+    StreamingTextExtractor.name: StreamingTextExtractor,
+    LxmlTextExtractor.name: LxmlTextExtractor,
+    BeautifulSoupTextExtractor.name: BeautifulSoupTextExtractor,
+}
+
+
+def get_text_extractor(name: str = 'auto',
+                       strip_boilerplate: bool = False,
+                       max_chars: Optional[int] = None) -> TextExtractor:
+    """
+    Create a text extractor by name.
+
+    Args:
+        name (str): One of EXTRACTORS, or 'auto' for lxml when it is
+            installed and the streaming extractor otherwise
+        strip_boilerplate (bool): Keep only the main content of the page
+        max_chars (int, optional): Cap on the length of the extracted text
+
+    Returns:
+        TextExtractor: Extractor instance
+    """
+    if name == 'auto':
+        name = LxmlTextExtractor.name if etree is not None else StreamingTextExtractor.name
+    try:
+        extractor_class = EXTRACTORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown text extractor: {name}. Expected 'auto' or one of {sorted(EXTRACTORS)}")
+    return extractor_class(strip_boilerplate=strip_boilerplate, max_chars=max_chars)
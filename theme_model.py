@@ -0,0 +1,207 @@
+#!/bin/python
+# theme_model.py
+"""
+Trainable theme classifier over hashed text features.
+
+Page text is turned into word uni-/bigram features with a stateless
+HashingVectorizer, so no vocabulary has to be stored or fitted, and a
+linear model trained on labelled pages maps them to themes. Only the
+model weights are persisted (.npz); prediction for a batch of pages is
+one sparse matrix product.
+"""
+import os
+import json
+import logging
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+
+DEFAULT_N_FEATURES = 2 ** 18
+
+# Characters of page text classified at most; the start of the main
+# content is representative and keeps prediction well under a millisecond
+DEFAULT_MAX_CHARS = 3000
+
+
+class HashedThemeModel:
+    """
+    Linear theme classifier over hashed word n-grams.
+    """
+
+    def __init__(self,
+                 n_features: int = DEFAULT_N_FEATURES,
+                 ngram_range: Tuple[int, int] = (1, 2),
+                 max_chars: Optional[int] = DEFAULT_MAX_CHARS):
+        """
+        Create an untrained model.
+
+        Args:
+            n_features (int): Number of hash buckets
+            ngram_range (tuple): Word n-gram range of the features
+            max_chars (int, optional): Characters of each text used; None for all
+        """
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.max_chars = max_chars
+        self.theme_names: List[str] = []
+        self.coef = np.zeros((0, n_features), dtype=np.float32)
+        self.intercept = np.zeros(0, dtype=np.float32)
+        self._vectorizer = HashingVectorizer(n_features=n_features, ngram_range=self.ngram_range,
+                                             alternate_sign=False, norm='l2')
+
+    def _features(self, texts: Sequence[str]):
+        """Hashed, L2-normalized (texts x n_features) CSR feature matrix."""
+        if self.max_chars is not None:
+            texts = [text[:self.max_chars] for text in texts]
+        return self._vectorizer.transform(texts)
+
+    def fit(self, texts: Sequence[str], labels: Sequence[str]) -> 'HashedThemeModel':
+        """
+        Train the model.
+
+        Args:
+            texts (sequence): Page texts
+            labels (sequence): Theme of every text; at least two distinct themes
+
+        Returns:
+            HashedThemeModel: self
+        """
+        classifier = SGDClassifier(loss='modified_huber', alpha=1e-4, max_iter=50,
+                                   tol=1e-4, class_weight='balanced', random_state=0)
+        classifier.fit(self._features(texts), list(labels))
+
+        coef = classifier.coef_.astype(np.float32)
+        intercept = classifier.intercept_.astype(np.float32)
+        if len(classifier.classes_) == 2:
+            # Binary models have one weight row, for the second class
+            coef = np.vstack([-coef, coef])
+            intercept = np.concatenate([-intercept, intercept])
+
+        self.theme_names = [str(theme) for theme in classifier.classes_]
+        self.coef = np.ascontiguousarray(coef)
+        self.intercept = intercept
+        return self
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """
+        Decision scores of every theme for a batch of texts.
+
+        Args:
+            texts (sequence): Page texts
+
+        Returns:
+            np.ndarray: (texts x themes) float32 score matrix, columns in theme_names order
+        """
+        if not len(texts) or not self.theme_names:
+            return np.zeros((len(texts), len(self.theme_names)), dtype=np.float32)
+        scores = self._features(texts) @ self.coef.T
+        return np.asarray(scores, dtype=np.float32) + self.intercept
+
+    def rank(self, texts: Sequence[str]) -> List[List[Tuple[str, float]]]:
+        """
+        Rank themes for a batch of texts.
+
+        Args:
+            texts (sequence): Page texts
+
+        Returns:
+            For every text, (theme, score) pairs best first; empty for empty texts
+        """
+        ranked = []
+        for text, row in zip(texts, self.score(texts)):
+            if not text or not text.strip():
+                ranked.append([])
+                continue
+            order = np.argsort(-row, kind='stable')
+            ranked.append([(self.theme_names[j], float(row[j])) for j in order])
+        return ranked
+
+    def save(self, path: str) -> None:
+        """
+        Persist the model.
+
+        Args:
+            path (str): Target .npz file
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(
+            path,
+            coef=self.coef,
+            intercept=self.intercept,
+            theme_names=np.array(self.theme_names),
+            ngram_range=np.array(self.ngram_range),
+            max_chars=np.array(-1 if self.max_chars is None else self.max_chars)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> Optional['HashedThemeModel']:
+        """
+        Load a persisted model.
+
+        Args:
+            path (str): .npz file written by save()
+
+        Returns:
+            HashedThemeModel or None: Loaded model, None if it does not exist
+        """
+        try:
+            with np.load(path) as data:
+                max_chars = int(data['max_chars'])
+                model = cls(n_features=data['coef'].shape[1],
+                            ngram_range=tuple(int(n) for n in data['ngram_range']),
+                            max_chars=None if max_chars < 0 else max_chars)
+                model.coef = data['coef'].astype(np.float32)
+                model.intercept = data['intercept'].astype(np.float32)
+                model.theme_names = [str(theme) for theme in data['theme_names']]
+            return model
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"Error loading theme model {path}: {e}")
+            return None
+
+
+def load_labelled(path: str, page_texts: Optional[Dict[str, str]] = None) -> Tuple[List[str], List[str]]:
+    """
+    Read training examples from a labelled JSON file.
+
+    The file is a list of site records with "domain", "theme" and either
+    "text" or "keywords" - the data.json format, so a portfolio with
+    corrected themes can be used as training data directly. Themes are
+    predicted from page text, so the text of a site's page is preferred
+    when it is known.
+
+    Args:
+        path (str): Labelled JSON file
+        page_texts (dict, optional): Domain to the text themes of its page
+            are predicted from; records of other domains fall back to
+            their own text or keywords
+
+    Returns:
+        Tuple of texts and themes; records without text or theme are skipped
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        records = json.load(f)
+
+    page_texts = page_texts or {}
+    texts, labels = [], []
+    for record in records:
+        theme = record.get('theme')
+        text = (page_texts.get(record.get('domain')) or record.get('text')
+                or ' '.join(record.get('keywords') or []))
+        if not theme or theme in ('Unknown', 'General') or not text.strip():
+            continue
+        texts.append(text)
+        labels.append(theme)
+    return texts, labels
+
+
+def theme_counts(labels: Sequence[str]) -> Dict[str, int]:
+    """Number of training examples per theme."""
+    counts: Dict[str, int] = {}
+    for label in labels:
+        counts[label] = counts.get(label, 0) + 1
+    return counts
@@ -0,0 +1,230 @@
+#!/bin/python
+# vector_store.py
+"""
+On-disk vector artifacts shared between runs and worker processes.
+
+Arrays are written as plain .npy files and opened with np.load(mmap_mode='r'),
+so loading is a file map and every process reading the same artifact shares
+the same read-only pages.
+"""
+import os
+import json
+import logging
+import tempfile
+import threading
+import numpy as np
+from typing import Dict, List, Optional, Tuple
+
+from analysis_cache import content_hash, file_hash, model_version
+
+
+def save_array(path: str, array: np.ndarray) -> None:
+    """
+    Atomically write an array to a .npy file.
+
+    Args:
+        path (str): Target .npy file
+        array (np.ndarray): Array to store
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npy.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_array(path: str) -> Optional[np.ndarray]:
+    """
+    Memory-map a .npy file read-only.
+
+    Args:
+        path (str): .npy file
+
+    Returns:
+        np.ndarray or None: Memory-mapped array, None if it does not exist
+    """
+    try:
+        return np.load(path, mmap_mode='r')
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.error(f"Error loading {path}: {e}")
+        return None
+
+
+def theme_matrix_path(cache_dir: str, themes_file: str, spacy_model: str) -> str:
+    """
+    Location of the theme matrix artifact for a themes file and SpaCy model.
+
+    The file name encodes the themes file hash and the model name and
+    version, so editing the themes or upgrading the model picks a new file.
+
+    Args:
+        cache_dir (str): Artifact directory
+        themes_file (str): Path to themes JSON
+        spacy_model (str): SpaCy model name
+
+    Returns:
+        str: Path of the .npy artifact
+    """
+    key = content_hash('\0'.join([file_hash(themes_file), spacy_model, model_version(spacy_model)]))
+    return os.path.join(cache_dir, f"theme_matrix-{spacy_model}-{key[:16]}.npy")
+
+
+class DocumentVectorStore:
+    """
+    Per-site document vectors: a memory-mapped float32 matrix plus a JSON
+    index of domain -> (row, content hash).
+
+    New vectors are kept in memory until save(), which rewrites the matrix
+    atomically. Sites whose page has no vector (other languages, pages
+    analyzed from their metadata) are indexed without a row, so their
+    content hash is still known. Vectors of a different model are never mixed: if the index
+    was written for another model, the store starts empty.
+    """
+
+    def __init__(self, directory: str, model_name: str):
+        """
+        Open the store.
+
+        Args:
+            directory (str): Directory holding doc_vectors.npy/.json
+            model_name (str): Name of the model producing the vectors
+        """
+        self.matrix_path = os.path.join(directory, 'doc_vectors.npy')
+        self.index_path = os.path.join(directory, 'doc_vectors.json')
+        self.model_name = model_name
+        self._lock = threading.Lock()
+
+        # domain -> {"row": int or None, "content_hash": str}
+        self._rows: Dict[str, Dict] = {}
+        self._matrix = None
+        self._pending: Dict[str, Tuple[str, Optional[np.ndarray]]] = {}
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            index = None
+        except (OSError, ValueError) as e:
+            logging.error(f"Error loading {self.index_path}: {e}")
+            index = None
+
+        if index and index.get('model') == model_name:
+            self._matrix = load_array(self.matrix_path)
+            stored = sum(1 for entry in index['rows'].values() if entry['row'] is not None)
+            if stored and (self._matrix is None or len(self._matrix) != stored):
+                self._matrix = None
+            else:
+                self._rows = index['rows']
+        elif index:
+            logging.info(f"Document vectors in {self.index_path} belong to "
+                         f"{index.get('model')}, not {model_name}; starting empty")
+
+    def __len__(self) -> int:
+        """Number of sites with a vector."""
+        with self._lock:
+            domains = {domain for domain, entry in self._rows.items() if entry['row'] is not None}
+            for domain, (_, vector) in self._pending.items():
+                if vector is None:
+                    domains.discard(domain)
+                else:
+                    domains.add(domain)
+            return len(domains)
+
+    def content_hash(self, domain: str) -> Optional[str]:
+        """Content hash the stored vector of a domain (or the record that it has none) was computed from."""
+        with self._lock:
+            if domain in self._pending:
+                return self._pending[domain][0]
+            entry = self._rows.get(domain)
+            return entry['content_hash'] if entry else None
+
+    def pending_domains(self) -> List[str]:
+        """Domains put since the last save(), with or without a vector."""
+        with self._lock:
+            return list(self._pending)
+
+    def put(self, domain: str, content_hash: str, vector: Optional[np.ndarray]) -> None:
+        """
+        Record the document vector of a site.
+
+        Args:
+            domain (str): Site domain
+            content_hash (str): Hash of the page the vector was computed from
+            vector (np.ndarray, optional): Document vector; None (or an
+                empty vector) records that the page has none, and drops
+                an earlier vector of the site
+        """
+        if vector is not None:
+            vector = np.asarray(vector, dtype=np.float32)
+            if not vector.size:
+                vector = None
+        with self._lock:
+            self._pending[domain] = (content_hash, vector)
+
+    def matrix(self) -> Tuple[List[str], np.ndarray]:
+        """
+        All stored vectors, including unsaved ones.
+
+        Returns:
+            Tuple of domains and the (sites x dimensions) float32 matrix,
+            rows in domain order
+        """
+        with self._lock:
+            domains = sorted((domain for domain, entry in self._rows.items() if entry['row'] is not None),
+                             key=lambda domain: self._rows[domain]['row'])
+            matrix = self._matrix
+            vectors = {domain: vector for domain, (_, vector) in self._pending.items() if vector is not None}
+            dropped = {domain for domain, (_, vector) in self._pending.items() if vector is None}
+            if not vectors and dropped.isdisjoint(domains):
+                if matrix is None:
+                    return [], np.zeros((0, 0), dtype=np.float32)
+                return domains, matrix
+
+            dim = len(next(iter(vectors.values()))) if vectors else matrix.shape[1]
+            if matrix is None or matrix.shape[1] != dim:
+                # Different dimensionality: the old vectors cannot be compared
+                domains, matrix = [], np.zeros((0, dim), dtype=np.float32)
+
+            kept = [row for row, domain in enumerate(domains) if domain not in dropped]
+            domains = [domains[row] for row in kept]
+            rows = {domain: i for i, domain in enumerate(domains)}
+            new_domains = [domain for domain in vectors if domain not in rows]
+            merged = np.empty((len(domains) + len(new_domains), dim), dtype=np.float32)
+            merged[:len(domains)] = matrix[kept]
+            for domain in new_domains:
+                rows[domain] = len(domains)
+                domains.append(domain)
+            for domain, vector in vectors.items():
+                merged[rows[domain]] = vector
+            return domains, merged
+
+    def save(self) -> None:
+        """Write pending vectors to disk and re-map the matrix."""
+        domains, matrix = self.matrix()
+        with self._lock:
+            if not self._pending:
+                return
+            hashes = {domain: entry['content_hash'] for domain, entry in self._rows.items()}
+            hashes.update({domain: content_hash for domain, (content_hash, _) in self._pending.items()})
+            rows = {domain: {"row": i, "content_hash": hashes[domain]} for i, domain in enumerate(domains)}
+            vectorless = {domain for domain, entry in self._rows.items() if entry['row'] is None}
+            vectorless.update(domain for domain, (_, vector) in self._pending.items() if vector is None)
+            rows.update({domain: {"row": None, "content_hash": hashes[domain]}
+                         for domain in vectorless if domain not in rows})
+
+            save_array(self.matrix_path, matrix)
+            tmp_path = self.index_path + '.tmp'
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({"model": self.model_name, "dim": int(matrix.shape[1]), "rows": rows}, f)
+            os.replace(tmp_path, self.index_path)
+
+            self._rows = rows
+            self._matrix = load_array(self.matrix_path)
+            self._pending = {}